@@ -1,5 +1,6 @@
 """Interface defining how a project class looks like."""
 
+from l2tscaffolder.definitions import project_detector
 from l2tscaffolder.lib import definitions
 
 
@@ -8,13 +9,39 @@ class ScaffolderDefinition:
 
     NAME = definitions.DEFINITION_UNDEFINED
 
+    # Paths of the directories and files that identify the root of a project,
+    # relative to the root with "/" as separator.
+    MARKER_DIRECTORIES = []
+    MARKER_FILES = []
+
+    @classmethod
+    def HasMarkers(cls) -> bool:
+        """Determines if the definition declares marker directories or files.
+
+        Returns:
+          bool: True if the project root can be detected by its markers.
+        """
+        return bool(cls.MARKER_DIRECTORIES or cls.MARKER_FILES)
+
     def ValidatePath(self, root_path: str) -> bool:
         """Validates the path to the root directory of the project.
 
+        The path is valid if it contains all marker directories and files of
+        the definition. Definitions without markers need to override this
+        method.
+
         Args:
           root_path (str): the path to the root of the project directory.
 
         Returns:
           bool: whether the given path is the correct root path of the project.
+
+        Raises:
+          NotImplementedError: if the definition does not declare markers.
         """
-        raise NotImplementedError
+        if not self.HasMarkers():
+            raise NotImplementedError
+
+        return project_detector.ProjectDetector.HasMarkers(
+            root_path, self.MARKER_DIRECTORIES, self.MARKER_FILES
+        )
@@ -1,9 +1,11 @@
 """The definition manager."""
 
 from typing import Iterator
+from typing import Optional
 from typing import Type
 
 from l2tscaffolder.definitions import interface
+from l2tscaffolder.definitions import project_detector
 
 
 class DefinitionManager:
@@ -48,6 +50,36 @@ class DefinitionManager:
         """
         return cls._definition_classes.get(name, None)
 
+    @classmethod
+    def GetDefinitionNameByPath(cls, root_path: str) -> Optional[str]:
+        """Detects the definition of a project by the path of its root.
+
+        Definitions that declare markers are matched against the cached
+        listings of the project directories, without creating definition
+        objects.
+
+        Args:
+          root_path (str): path of the root of the project.
+
+        Returns:
+          str: name of the first definition that matches the project or None
+              if no definition matches.
+        """
+        for definition_name, definition_class in cls._definition_classes.items():
+            if definition_class.HasMarkers():
+                is_valid = project_detector.ProjectDetector.HasMarkers(
+                    root_path,
+                    definition_class.MARKER_DIRECTORIES,
+                    definition_class.MARKER_FILES,
+                )
+            else:
+                is_valid = definition_class().ValidatePath(root_path)
+
+            if is_valid:
+                return definition_name
+
+        return None
+
     @classmethod
     def GetDefinitionNames(cls) -> Iterator[str]:
         """Yields all names of registered definition classes.
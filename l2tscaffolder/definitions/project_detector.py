@@ -0,0 +1,140 @@
+"""Detects projects by the marker files and directories in their root."""
+
+import os
+import threading
+
+from typing import Dict
+from typing import List
+from typing import Optional
+
+
+class ProjectDetector:
+    """Matches project roots against marker files and directories.
+
+    Every directory that contains a marker is listed with a single
+    os.scandir() call. The listings are cached per directory and modification
+    time, which changes whenever an entry is added to, removed from or renamed
+    in the directory, so that all definitions are matched against the same
+    listings and repeated detection only needs to stat the directories.
+    """
+
+    # Maximum number of directory listings to keep in the cache.
+    MAXIMUM_NUMBER_OF_LISTINGS = 256
+
+    _listings = {}
+    _lock = threading.Lock()
+
+    _number_of_scanned_directories = 0
+
+    @classmethod
+    def _GetListing(cls, path: str) -> Optional[Dict[str, bool]]:
+        """Retrieves the listing of a directory.
+
+        Args:
+          path (str): path of the directory.
+
+        Returns:
+          dict[str, bool]: whether the entry is a directory per name of the
+              entries in the directory or None if the path is not a directory.
+        """
+        try:
+            modification_time = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        with cls._lock:
+            cached_modification_time, listing = cls._listings.get(path, (None, None))
+            if cached_modification_time == modification_time:
+                return listing
+
+        listing = {}
+        try:
+            with os.scandir(path) as directory_entries:
+                for directory_entry in directory_entries:
+                    try:
+                        listing[directory_entry.name] = directory_entry.is_dir()
+                    except OSError:
+                        listing[directory_entry.name] = False
+
+        except OSError:
+            return None
+
+        with cls._lock:
+            cls._number_of_scanned_directories += 1
+            if len(cls._listings) >= cls.MAXIMUM_NUMBER_OF_LISTINGS:
+                cls._listings = {}
+            cls._listings[path] = (modification_time, listing)
+
+        return listing
+
+    @classmethod
+    def _HasMarker(cls, root_path: str, marker: str, is_directory: bool) -> bool:
+        """Determines if a marker file or directory exists.
+
+        Args:
+          root_path (str): path of the root of the project.
+          marker (str): path of the marker relative to the root, with "/" as
+              separator.
+          is_directory (bool): True if the marker is a directory.
+
+        Returns:
+          bool: True if the marker exists and is of the expected type.
+        """
+        parent_path, _, name = marker.rpartition("/")
+        if parent_path:
+            parent_path = os.path.join(root_path, *parent_path.split("/"))
+        else:
+            parent_path = root_path
+
+        listing = cls._GetListing(parent_path)
+        if listing is None or name not in listing:
+            return False
+
+        return listing[name] == is_directory
+
+    @classmethod
+    def Clear(cls):
+        """Clears the cached listings and statistics."""
+        with cls._lock:
+            cls._listings = {}
+            cls._number_of_scanned_directories = 0
+
+    @classmethod
+    def GetNumberOfScannedDirectories(cls) -> int:
+        """Retrieves the number of directories that were scanned.
+
+        Returns:
+          int: number of directories that were listed instead of retrieved from
+              the cache.
+        """
+        with cls._lock:
+            return cls._number_of_scanned_directories
+
+    @classmethod
+    def HasMarkers(
+        cls, root_path: str, marker_directories: List[str], marker_files: List[str]
+    ) -> bool:
+        """Determines if all marker files and directories of a project exist.
+
+        Args:
+          root_path (str): path of the root of the project.
+          marker_directories (list[str]): paths of directories that must exist,
+              relative to the root with "/" as separator.
+          marker_files (list[str]): paths of files that must exist, relative to
+              the root with "/" as separator.
+
+        Returns:
+          bool: True if the root is a directory and contains all markers.
+        """
+        if cls._GetListing(root_path) is None:
+            return False
+
+        for marker in marker_directories:
+            if not cls._HasMarker(root_path, marker, True):
+                return False
+
+        for marker in marker_files:
+            if not cls._HasMarker(root_path, marker, False):
+                return False
+
+        return True
@@ -0,0 +1,439 @@
+"""The batch frontend, generates modules described by a manifest file."""
+
+import json
+import os
+
+from typing import Dict
+from typing import List
+
+from l2tscaffolder.frontend import output_handler as handler
+from l2tscaffolder.helpers import git
+from l2tscaffolder.lib import engine
+from l2tscaffolder.lib import errors
+from l2tscaffolder.lib import file_handler
+
+from l2tscaffolder.definitions import manager as definition_manager
+from l2tscaffolder.scaffolders import interface as scaffolder_interface
+from l2tscaffolder.scaffolders import manager as scaffolder_manager
+
+
+class ManifestEntry:
+    """Module described by a manifest file.
+
+    Attributes:
+      answers (dict[str, object]): answers to the scaffolder questions, per
+          question attribute.
+      definition (str): name of the definition.
+      module_name (str): name of the module to generate.
+      project_path (str): path to the project root.
+      scaffolder (str): name of the scaffolder.
+    """
+
+    def __init__(
+        self,
+        definition: str = "",
+        project_path: str = "",
+        scaffolder: str = "",
+        module_name: str = "",
+        answers: Dict[str, object] = None,
+    ):
+        """Initializes a manifest entry.
+
+        Args:
+          definition (Optional[str]): name of the definition.
+          project_path (Optional[str]): path to the project root.
+          scaffolder (Optional[str]): name of the scaffolder.
+          module_name (Optional[str]): name of the module to generate.
+          answers (Optional[dict[str, object]]): answers to the scaffolder
+              questions, per question attribute.
+        """
+        super().__init__()
+        self.answers = answers or {}
+        self.definition = definition
+        self.module_name = module_name
+        self.project_path = project_path
+        self.scaffolder = scaffolder
+
+
+class BatchFrontend:
+    """Frontend that generates modules without prompting the user.
+
+    All entries of the manifest are validated before any file is generated,
+    after which all modules are generated in a single process. Generated files
+    are added to the git repository of their project, no feature branches are
+    created.
+    """
+
+    _MANIFEST_KEYS = frozenset(
+        ["answers", "definition", "module_name", "project_path", "scaffolder"]
+    )
+
+    _YAML_EXTENSIONS = frozenset([".yaml", ".yml"])
+
+    def __init__(
+        self,
+        output_handler: handler.BaseOutputHandler,
+        number_of_workers: int = 1,
+        dry_run: bool = False,
+        incremental: bool = False,
+    ):
+        """Initializes the batch frontend.
+
+        Args:
+          output_handler (handler.BaseOutputHandler): the output handler used
+              for the frontend.
+          number_of_workers (Optional[int]): number of threads used to render
+              modules.
+          dry_run (Optional[bool]): True if the changes should only be shown
+              instead of written to disk.
+          incremental (Optional[bool]): True if modules of which none of the
+              inputs changed since they were last generated should be skipped.
+        """
+        super().__init__()
+        self._dry_run = dry_run
+        self._git_helpers = {}
+        self._incremental = incremental
+        self._number_of_workers = number_of_workers
+        self._output_handler = output_handler
+
+    def _ConfigureScaffolder(
+        self, entry: ManifestEntry
+    ) -> scaffolder_interface.Scaffolder:
+        """Creates a scaffolder and configures it with the answers of an entry.
+
+        Answers that do not belong to a question are only used to set optional
+        attributes of the scaffolder.
+
+        Args:
+          entry (ManifestEntry): manifest entry.
+
+        Returns:
+          scaffolder_interface.Scaffolder: configured scaffolder.
+
+        Raises:
+          errors.UnableToConfigure: if the scaffolder does not exist or an
+              answer is missing or invalid.
+        """
+        scaffolder = scaffolder_manager.ScaffolderManager.GetScaffolderObjectByName(
+            entry.scaffolder
+        )
+        if not scaffolder or scaffolder.PROJECT != entry.definition:
+            raise errors.UnableToConfigure(
+                "Scaffolder {0:s} does not exist for definition {1:s}.".format(
+                    entry.scaffolder, entry.definition
+                )
+            )
+
+        attributes = []
+        for question in scaffolder.GetQuestions():
+            if question.attribute not in entry.answers:
+                raise errors.UnableToConfigure(
+                    "Missing answer for: {0:s}.".format(question.attribute)
+                )
+
+            question.ValidateAnswer(entry.answers[question.attribute])
+            attributes.append((question.attribute, question.TYPE))
+
+        for attribute, attribute_type in sorted(scaffolder.OPTIONAL_ATTRIBUTES.items()):
+            if attribute in entry.answers:
+                attributes.append((attribute, attribute_type))
+
+        for attribute, attribute_type in attributes:
+            try:
+                scaffolder.SetAttribute(
+                    attribute, entry.answers[attribute], attribute_type
+                )
+            except (KeyError, ValueError) as exception:
+                raise errors.UnableToConfigure(
+                    "Unable to set answer for: {0:s} with error: {1!s}".format(
+                        attribute, exception
+                    )
+                )
+
+        return scaffolder
+
+    def _CloseGitHelpers(self):
+        """Closes the git helpers, which stops the git processes they started."""
+        for git_helper in self._git_helpers.values():
+            git_helper.Close()
+        self._git_helpers = {}
+
+    def _GetGitHelper(self, project_path: str) -> git.GitHelper:
+        """Retrieves the git helper of a project.
+
+        Args:
+          project_path (str): path to the project root.
+
+        Returns:
+          git.GitHelper: git helper of the project.
+        """
+        git_helper = self._git_helpers.get(project_path, None)
+        if not git_helper:
+            git_helper = git.GitHelper(project_path)
+            self._git_helpers[project_path] = git_helper
+
+        return git_helper
+
+    def _ValidatePath(
+        self, entry: ManifestEntry, validated_paths: Dict[tuple, bool]
+    ) -> bool:
+        """Validates the project path of an entry against its definition.
+
+        Args:
+          entry (ManifestEntry): manifest entry.
+          validated_paths (dict[tuple[str, str], bool]): results of previous
+              validations per definition name and project path.
+
+        Returns:
+          bool: True if the project path is valid for the definition.
+
+        Raises:
+          errors.UnableToConfigure: if the definition does not exist.
+        """
+        lookup_key = (entry.definition, entry.project_path)
+        if lookup_key not in validated_paths:
+            definition_class = definition_manager.DefinitionManager.GetDefinitionByName(
+                entry.definition
+            )
+            if not definition_class:
+                raise errors.UnableToConfigure(
+                    "Definition {0:s} does not exist.".format(entry.definition)
+                )
+
+            validated_paths[lookup_key] = definition_class().ValidatePath(
+                entry.project_path
+            )
+
+        return validated_paths[lookup_key]
+
+    def GenerateModules(self, entries: List[ManifestEntry]) -> bool:
+        """Validates all manifest entries and generates their modules.
+
+        Nothing is generated if any of the entries is invalid. The modules of
+        a project are rendered concurrently.
+
+        Args:
+          entries (list[ManifestEntry]): manifest entries.
+
+        Returns:
+          bool: True if all modules were generated.
+        """
+        scaffolders = []
+        validated_paths = {}
+        has_errors = False
+        for entry_index, entry in enumerate(entries):
+            try:
+                if not entry.module_name:
+                    raise errors.UnableToConfigure("Missing module name.")
+
+                if not self._ValidatePath(entry, validated_paths):
+                    raise errors.UnableToConfigure(
+                        (
+                            "Path [{0:s}] does not lead to a valid project for "
+                            "{1:s}."
+                        ).format(entry.project_path, entry.definition)
+                    )
+
+                scaffolders.append(self._ConfigureScaffolder(entry))
+
+            except errors.UnableToConfigure as exception:
+                self._output_handler.PrintError(
+                    "Manifest entry #{0:d}: {1!s}".format(entry_index, exception)
+                )
+                has_errors = True
+
+        if has_errors:
+            self._output_handler.PrintError(
+                "Aborting. Unable to validate the manifest, no files generated."
+            )
+            return False
+
+        # Engines are shared per project, so that the project root is only
+        # validated once.
+        engines = {}
+        for entry, scaffolder in zip(entries, scaffolders):
+            scaffolder_engine = engines.get(entry.project_path, None)
+            if not scaffolder_engine:
+                scaffolder_engine = engine.ScaffolderEngine()
+                scaffolder_engine.SetIncremental(self._incremental)
+                scaffolder_engine.SetProjectRootPath(entry.project_path)
+                engines[entry.project_path] = scaffolder_engine
+
+            scaffolder_engine.AddModule(entry.module_name, scaffolder)
+
+        result = True
+        for project_path, scaffolder_engine in engines.items():
+            file_paths_inside_project = []
+            memory_file_handler = None
+            if self._dry_run:
+                memory_file_handler = file_handler.MemoryFileHandler()
+                scaffolder_engine.SetFileHandler(memory_file_handler)
+
+            for report in scaffolder_engine.GenerateModules(self._number_of_workers):
+                if report.error:
+                    self._output_handler.PrintError(
+                        "Unable to generate module: {0:s} with error: {1:s}".format(
+                            report.module_name, report.error
+                        )
+                    )
+                    result = False
+                    continue
+
+                if report.file_paths:
+                    self._output_handler.PrintInfo(
+                        "Generated module: {0:s}".format(report.module_name)
+                    )
+                else:
+                    self._output_handler.PrintInfo(
+                        "Module: {0:s} is unchanged.".format(report.module_name)
+                    )
+
+                for file_path in report.skipped_file_paths:
+                    self._output_handler.PrintOutput(
+                        "File: {0:s} unchanged, skipped.".format(file_path)
+                    )
+
+                if memory_file_handler:
+                    for file_path in report.file_paths:
+                        self._output_handler.PrintOutput(
+                            "File: {0:s} would be written to disk.".format(file_path)
+                        )
+                    continue
+
+                for file_path in report.file_paths:
+                    self._output_handler.PrintOutput(
+                        "File: {0:s} written to disk.".format(file_path)
+                    )
+                    file_path_inside_project = os.path.relpath(file_path, project_path)
+                    if file_path_inside_project not in file_paths_inside_project:
+                        file_paths_inside_project.append(file_path_inside_project)
+
+            if memory_file_handler:
+                self._output_handler.PrintNewLine()
+                self._output_handler.PrintOutput(
+                    memory_file_handler.GetDiff(root_path=project_path)
+                )
+
+            elif file_paths_inside_project:
+                # The files of all modules of the project are added at once,
+                # which only runs git once per project.
+                git_helper = self._GetGitHelper(project_path)
+                try:
+                    git_helper.AddFilesToTrack(file_paths_inside_project)
+                except errors.UnableToConfigure as exception:
+                    self._output_handler.PrintError("{0!s}".format(exception))
+                    result = False
+
+        return result
+
+    def ReadManifest(self, path: str) -> List[ManifestEntry]:
+        """Reads a manifest file.
+
+        The manifest is a JSON or YAML file, which contains a list of entries,
+        or a mapping with a "modules" key that contains the list of entries.
+        Each entry is a mapping with the keys: "definition", "project_path",
+        "scaffolder", "module_name" and "answers". Relative project paths are
+        relative to the directory containing the manifest.
+
+        Args:
+          path (str): path of the manifest file.
+
+        Returns:
+          list[ManifestEntry]: manifest entries.
+
+        Raises:
+          errors.WrongCliInput: if the manifest cannot be read or is invalid.
+        """
+        _, extension = os.path.splitext(path)
+        is_yaml = extension.lower() in self._YAML_EXTENSIONS
+
+        # PyYAML is optional and only imported to read a YAML manifest.
+        yaml = None
+        if is_yaml:
+            try:
+                import yaml  # pylint: disable=import-outside-toplevel
+            except ImportError:
+                pass
+
+        if is_yaml and not yaml:
+            raise errors.WrongCliInput(
+                "Unable to read YAML manifest: {0:s}, PyYAML is not installed.".format(
+                    path
+                )
+            )
+
+        try:
+            with open(path, encoding="utf-8") as file_object:
+                if is_yaml:
+                    manifest = yaml.safe_load(file_object)
+                else:
+                    manifest = json.load(file_object)
+
+        except (OSError, ValueError) as exception:
+            raise errors.WrongCliInput(
+                "Unable to read manifest: {0:s} with error: {1!s}".format(
+                    path, exception
+                )
+            )
+
+        if isinstance(manifest, dict):
+            manifest = manifest.get("modules", None)
+
+        if not isinstance(manifest, list):
+            raise errors.WrongCliInput(
+                "Manifest: {0:s} does not contain a list of modules.".format(path)
+            )
+
+        manifest_path = os.path.dirname(os.path.abspath(path))
+
+        entries = []
+        for entry_index, entry_dict in enumerate(manifest):
+            if not isinstance(entry_dict, dict):
+                raise errors.WrongCliInput(
+                    "Manifest entry #{0:d} is not a mapping.".format(entry_index)
+                )
+
+            unsupported_keys = set(entry_dict) - self._MANIFEST_KEYS
+            if unsupported_keys:
+                raise errors.WrongCliInput(
+                    "Manifest entry #{0:d} has unsupported keys: {1:s}.".format(
+                        entry_index, ", ".join(sorted(unsupported_keys))
+                    )
+                )
+
+            entry = ManifestEntry(**entry_dict)
+            if not isinstance(entry.answers, dict):
+                raise errors.WrongCliInput(
+                    "Answers of manifest entry #{0:d} are not a mapping.".format(
+                        entry_index
+                    )
+                )
+
+            if entry.project_path:
+                entry.project_path = os.path.join(manifest_path, entry.project_path)
+
+            entries.append(entry)
+
+        return entries
+
+    def Start(self, manifest_path: str):
+        """Start generating the modules described by a manifest file.
+
+        Args:
+          manifest_path (str): path of the manifest file.
+        """
+        self._output_handler.PrintInfo("   == Starting the scaffolder in batch ==")
+        try:
+            entries = self.ReadManifest(manifest_path)
+        except errors.WrongCliInput as exception:
+            self._output_handler.PrintError("{0!s}".format(exception))
+            return
+
+        try:
+            if self.GenerateModules(entries):
+                self._output_handler.PrintInfo(
+                    "Generated {0:d} modules.".format(len(entries))
+                )
+
+        finally:
+            self._CloseGitHelpers()
@@ -8,6 +8,7 @@ from l2tscaffolder.frontend import output_handler as handler
 from l2tscaffolder.helpers import git
 from l2tscaffolder.lib import engine
 from l2tscaffolder.lib import errors
+from l2tscaffolder.lib import file_handler
 
 from l2tscaffolder.definitions import interface as definition_interface
 from l2tscaffolder.definitions import manager as definition_manager
@@ -18,14 +19,25 @@ from l2tscaffolder.scaffolders import manager as scaffolder_manager
 class ScaffolderFrontend:
     """A frontend implementation for the scaffolder project."""
 
-    def __init__(self, output_handler: handler.BaseOutputHandler):
+    def __init__(
+        self,
+        output_handler: handler.BaseOutputHandler,
+        dry_run=False,
+        incremental=False,
+    ):
         """Initializes the frontend.
 
         Args:
           output_handler (handler.BaseOutputHandler): the output handler used
               for the frontend.
+          dry_run (Optional[bool]): True if the changes should only be shown
+              instead of written to disk.
+          incremental (Optional[bool]): True if the module should be skipped
+              when none of its inputs changed since it was last generated.
         """
+        self._dry_run = dry_run
         self._git_helper = None
+        self._incremental = incremental
         self._output_handler = output_handler
 
     def _AskDictQuestion(
@@ -143,6 +155,12 @@ class ScaffolderFrontend:
         question.ValidateAnswer(value)
         return value
 
+    def _CloseGitHelper(self):
+        """Closes the git helper, which stops the git processes it started."""
+        if self._git_helper:
+            self._git_helper.Close()
+            self._git_helper = None
+
     def _GetSelection(self, items: list, item_text: str) -> str:
         """Presents a list of strings to user and return back user choice.
 
@@ -324,11 +342,8 @@ class ScaffolderFrontend:
         Returns:
           scaffolder_interface.ScaffolderCli: the chosen scaffolder object.
         """
-        scaffolders = {}
         manager = scaffolder_manager.ScaffolderManager
-        for scaffolder_name, scaffolder in manager.GetScaffolders():
-            if scaffolder.PROJECT == definition.NAME:
-                scaffolders[scaffolder_name] = scaffolder
+        scaffolder_names = list(manager.GetScaffolderNamesByProject(definition.NAME))
 
         self._output_handler.PrintNewLine()
         self._output_handler.PrintInfo(
@@ -338,11 +353,11 @@ class ScaffolderFrontend:
         scaffolder = ""
         while not scaffolder:
             try:
-                scaffolder = self._GetSelection(list(scaffolders.keys()), "Scaffolder")
+                scaffolder = self._GetSelection(scaffolder_names, "Scaffolder")
             except KeyError as exception:
                 self._output_handler.PrintError("{0!s}".format(exception))
-        if scaffolder in scaffolders:
-            return scaffolders[scaffolder]()
+        if scaffolder in scaffolder_names:
+            return manager.GetScaffolderObjectByName(scaffolder)
 
         self._output_handler.PrintError(
             "Scaffolder: {0:s} does not exist.".format(scaffolder)
@@ -355,50 +370,80 @@ class ScaffolderFrontend:
         Args:
           definition_value (str): the definition string chosen by UI.
         """
-        self._output_handler.PrintInfo("   == Starting the scaffolder ==")
-        self._output_handler.PrintInfo("Gathering required information.")
-        scaffolder_engine = engine.ScaffolderEngine()
-
-        definition = self.GetDefinition(definition_value)
-
-        project_path = self.GetProjectPath(definition)
-        scaffolder_engine.SetProjectRootPath(project_path)
-
-        module_name = self.GetModuleName()
-        scaffolder_engine.SetModuleName(module_name)
-        self._output_handler.PrintInfo(
-            "About to create a new feature branch to store newly generated code."
-        )
         try:
-            self.CreateGitFeatureBranch(project_path, scaffolder_engine.module_name)
-        except errors.UnableToConfigure as exception:
-            self._output_handler.PrintError(
-                f"Unable to create feature branch with error: {exception!s}. Does "
-                f"{project_path:s} contain a git repository?"
-            )
-            self._output_handler.PrintError("Due to fatal error, not proceeding.")
-            return
+            self._output_handler.PrintInfo("   == Starting the scaffolder ==")
+            self._output_handler.PrintInfo("Gathering required information.")
+            scaffolder_engine = engine.ScaffolderEngine()
+            scaffolder_engine.SetIncremental(self._incremental)
+
+            memory_file_handler = None
+            if self._dry_run:
+                memory_file_handler = file_handler.MemoryFileHandler()
+                scaffolder_engine.SetFileHandler(memory_file_handler)
+
+            definition = self.GetDefinition(definition_value)
+
+            project_path = self.GetProjectPath(definition)
+            scaffolder_engine.SetProjectRootPath(project_path)
+
+            module_name = self.GetModuleName()
+            scaffolder_engine.SetModuleName(module_name)
+            if not self._dry_run:
+                self._output_handler.PrintInfo(
+                    "About to create a new feature branch to store newly generated "
+                    "code."
+                )
+                try:
+                    self.CreateGitFeatureBranch(
+                        project_path, scaffolder_engine.module_name
+                    )
+                except errors.UnableToConfigure as exception:
+                    self._output_handler.PrintError(
+                        f"Unable to create feature branch with error: {exception!s}. "
+                        f"Does {project_path:s} contain a git repository?"
+                    )
+                    self._output_handler.PrintError(
+                        "Due to fatal error, not proceeding."
+                    )
+                    return
 
-        scaffolder = self.GetScaffolder(definition)
-        scaffolder_engine.SetScaffolder(scaffolder)
-        try:
-            self.GatherScaffolderAnswers(scaffolder, scaffolder_engine)
-        except errors.UnableToConfigure as exception:
-            self._output_handler.PrintError(
-                (
-                    "Aborting. Unable to properly configure scaffolder "
-                    "with error {0!s}."
-                ).format(exception)
-            )
-            return
+            scaffolder = self.GetScaffolder(definition)
+            scaffolder_engine.SetScaffolder(scaffolder)
+            try:
+                self.GatherScaffolderAnswers(scaffolder, scaffolder_engine)
+            except errors.UnableToConfigure as exception:
+                self._output_handler.PrintError(
+                    (
+                        "Aborting. Unable to properly configure scaffolder "
+                        "with error {0!s}."
+                    ).format(exception)
+                )
+                return
 
-        ready = self._output_handler.Confirm("Ready to generate files?")
-        if ready:
-            for file_path in scaffolder_engine.GenerateFiles():
+            ready = self._output_handler.Confirm("Ready to generate files?")
+            if ready and memory_file_handler:
+                for file_path in scaffolder_engine.GenerateFiles():
+                    self._output_handler.PrintOutput(
+                        "File: {0:s} would be written to disk.".format(file_path)
+                    )
+                self._output_handler.PrintNewLine()
                 self._output_handler.PrintOutput(
-                    "File: {0:s} written to disk.".format(file_path)
+                    memory_file_handler.GetDiff(root_path=project_path)
                 )
-                _, _, file_path_inside_project = file_path.partition(project_path)
-                if file_path_inside_project.startswith(os.sep):
-                    file_path_inside_project = file_path_inside_project[1:]
-                self._git_helper.AddFileToTrack(file_path_inside_project)
+
+            elif ready:
+                file_paths_inside_project = []
+                for file_path in scaffolder_engine.GenerateFiles():
+                    self._output_handler.PrintOutput(
+                        "File: {0:s} written to disk.".format(file_path)
+                    )
+                    _, _, file_path_inside_project = file_path.partition(project_path)
+                    if file_path_inside_project.startswith(os.sep):
+                        file_path_inside_project = file_path_inside_project[1:]
+                    file_paths_inside_project.append(file_path_inside_project)
+
+                # All files are added at once, which only runs git once.
+                self._git_helper.AddFilesToTrack(file_paths_inside_project)
+
+        finally:
+            self._CloseGitHelper()
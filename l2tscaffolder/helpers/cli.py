@@ -10,6 +10,8 @@ import logging
 import shlex
 import subprocess
 
+from typing import Optional
+
 
 class CLIHelper:
     """Command line interface (CLI) helper.
@@ -30,11 +32,16 @@ class CLIHelper:
         self.mock_responses = mock_responses
         self.preferred_encoding = locale.getpreferredencoding()
 
-    def RunCommand(self, command: str):
+    def RunCommand(self, command: str, cwd: Optional[str] = None):
         """Runs a command.
 
+        The working directory of the process is not changed, which allows
+        commands to be run from multiple threads.
+
         Args:
           command (str): command to run.
+          cwd (Optional[str]): working directory of the command, where None
+              represents the working directory of the process.
 
         Returns:
           tuple[int, str, str]: exit code, output that was written to stdout
@@ -54,7 +61,7 @@ class CLIHelper:
         try:
             # pylint: disable=consider-using-with
             process = subprocess.Popen(
-                arguments, stderr=subprocess.PIPE, stdout=subprocess.PIPE
+                arguments, cwd=cwd, stderr=subprocess.PIPE, stdout=subprocess.PIPE
             )
         except OSError as exception:
             logging.error(
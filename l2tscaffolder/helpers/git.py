@@ -3,12 +3,18 @@
 This file provides a class to assist with git operations.
 """
 
+import logging
 import os
 import re
+import shlex
+import tempfile
 
+from typing import List
+from typing import Optional
 from typing import Tuple
 
 from l2tscaffolder.helpers import cli
+from l2tscaffolder.helpers import git_session
 from l2tscaffolder.lib import errors
 
 
@@ -19,6 +25,10 @@ class GitHelper(cli.CLIHelper):
       project_path: path to the git project folder.
     """
 
+    # Maximum number of paths passed as arguments to "git add", more paths are
+    # passed in a pathspec file.
+    _MAXIMUM_NUMBER_OF_PATH_ARGUMENTS = 100
+
     def __init__(self, project_path: str):
         """Initializes the git helper.
 
@@ -26,8 +36,18 @@ class GitHelper(cli.CLIHelper):
           project_path (str): the path to the git project folder.
         """
         super().__init__()
+        self._session = None
         self.project_path = project_path
-        self._cwd = os.getcwd()
+
+    def _GetSession(self) -> git_session.GitSession:
+        """Retrieves the git session used to look up references.
+
+        Returns:
+          git_session.GitSession: git session of the project.
+        """
+        if not self._session:
+            self._session = git_session.GitSession(self.project_path)
+        return self._session
 
     def AddFileToTrack(self, file_path: str):
         """Add a file to those that are tracked by the git repo.
@@ -35,18 +55,61 @@ class GitHelper(cli.CLIHelper):
         Args:
           file_path (str): path to the file to be added to tracked
               files by this git repo.
+        """
+        self.AddFilesToTrack([file_path])
+
+    def AddFilesToTrack(self, file_paths: List[str]):
+        """Add files to those that are tracked by the git repo.
+
+        All files are added by a single "git add" command. Files that do not
+        exist are skipped, since a single missing file would prevent all other
+        files from being added.
+
+        Args:
+          file_paths (list[str]): paths to the files to be added to tracked
+              files by this git repo, relative to the project path.
 
         Raises:
           errors.UnableToConfigure: when the tool is not able to add
               newly added files to the git repo.
         """
-        command = "git add {0:s}".format(file_path)
-        exit_code, output, error = self.RunCommand(command)
+        existing_file_paths = []
+        for file_path in file_paths:
+            if os.path.exists(os.path.join(self.project_path, file_path)):
+                existing_file_paths.append(file_path)
+            else:
+                logging.warning(
+                    "Unable to add missing file: {0:s} to git.".format(file_path)
+                )
+
+        file_paths = existing_file_paths
+        if not file_paths:
+            return
+
+        if len(file_paths) <= self._MAXIMUM_NUMBER_OF_PATH_ARGUMENTS:
+            command = "git add -- {0:s}".format(
+                " ".join(shlex.quote(file_path) for file_path in file_paths)
+            )
+            exit_code, output, error = self.RunCommand(command)
+
+        else:
+            with tempfile.TemporaryDirectory() as temporary_directory:
+                pathspec_path = os.path.join(temporary_directory, "pathspec")
+                with open(pathspec_path, "w", encoding="utf-8") as file_object:
+                    file_object.write("\0".join(file_paths))
+
+                command = (
+                    "git add --pathspec-from-file={0:s} --pathspec-file-nul".format(
+                        shlex.quote(pathspec_path)
+                    )
+                )
+                exit_code, output, error = self.RunCommand(command)
+
         if exit_code != 0:
             raise errors.UnableToConfigure(
                 (
                     'Unable to add files to git branch, output of "git add" '
-                    "command is [{0:s}] with the error: {1:s}".format(output, error)
+                    "command is [{0!s}] with the error: {1!s}".format(output, error)
                 )
             )
 
@@ -59,12 +122,13 @@ class GitHelper(cli.CLIHelper):
         Returns:
           bool: True if the branch exists.
         """
-        command = 'git show-ref --verify --quiet refs/heads/"{0:s}"'.format(branch_name)
-        exit_code, _, _ = self.RunCommand(command)
-        if exit_code == 0:
-            return True
+        return self._GetSession().HasBranch(branch_name)
 
-        return False
+    def Close(self):
+        """Closes the git session, if one was opened."""
+        if self._session:
+            self._session.Close()
+            self._session = None
 
     def GenerateBranchName(self, module_name: str) -> str:
         """Generates a git branch name.
@@ -89,6 +153,11 @@ class GitHelper(cli.CLIHelper):
           errors.UnableToConfigure: when the tool is not able to get
               the active branch of the git project.
         """
+        branch_name = self._GetSession().GetActiveBranch()
+        if branch_name:
+            return branch_name
+
+        # HEAD does not point to a branch, for example when it is detached.
         command = "git branch --list --no-color"
         exit_code, output, error = self.RunCommand(command)
 
@@ -105,20 +174,21 @@ class GitHelper(cli.CLIHelper):
                 return line_string.strip()
         raise errors.UnableToConfigure("Unable to determine the active git branch")
 
-    def RunCommand(self, command: str) -> Tuple[int, str, str]:
-        """Runs a command.
+    def RunCommand(
+        self, command: str, cwd: Optional[str] = None
+    ) -> Tuple[int, str, str]:
+        """Runs a command in the git project folder.
 
         Args:
           command (str): command to run.
+          cwd (Optional[str]): working directory of the command, where None
+              represents the git project folder.
 
         Returns:
           tuple[int, str, str]: exit code, output that was written to stdout
               and stderr.
         """
-        os.chdir(self.project_path)
-        exit_code, output, error = super().RunCommand(command)
-        os.chdir(self._cwd)
-        return exit_code, output, error
+        return super().RunCommand(command, cwd=cwd or self.project_path)
 
     def SwitchToBranch(self, branch: str) -> int:
         """Switches the git branch and returns the exit code of the command.
@@ -129,6 +199,9 @@ class GitHelper(cli.CLIHelper):
         Returns:
           int: the exit code from the git command.
         """
+        if self._GetSession().GetActiveBranch() == branch:
+            return 0
+
         command = "git checkout {0:s}".format(branch)
         exit_code, _, _ = self.RunCommand(command)
 
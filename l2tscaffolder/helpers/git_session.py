@@ -0,0 +1,309 @@
+"""Git session for looking up references without running a git command each time.
+
+References are read from the git directory, loose references from the files
+in "refs" and packed references from "packed-refs". References that cannot be
+read directly, for example when the repository does not store its references
+as files, are looked up by a single long-lived "git cat-file --batch-check"
+process.
+"""
+
+import logging
+import os
+import subprocess
+import threading
+import weakref
+
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+
+class GitSession:
+    """Looks up the references of a git project.
+
+    Attributes:
+      project_path (str): path to the git project folder.
+    """
+
+    _BRANCH_PREFIX = "refs/heads/"
+
+    _SYMBOLIC_REFERENCE_PREFIX = "ref: "
+
+    def __init__(self, project_path: str):
+        """Initializes a git session.
+
+        Args:
+          project_path (str): path to the git project folder.
+        """
+        super().__init__()
+        self._common_directory = None
+        self._file_cache = {}
+        self._git_directory = None
+        self._lock = threading.Lock()
+        self._packed_references = {}
+        self._packed_references_key = None
+        self._process = None
+        self._process_finalizer = None
+        self.project_path = project_path
+
+        self._OpenGitDirectory()
+
+    def _GetFileKey(self, path: str) -> Optional[Tuple[int, int, int]]:
+        """Determines the key used to cache the content of a file.
+
+        The inode is part of the key, since git replaces references by renaming
+        a new file over them. A reference that is replaced with content of the
+        same size within the timestamp granularity of the file system would
+        otherwise be read from the cache.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          tuple[int, int, int]: inode number, modification time in nanoseconds
+              and size of the file or None if the file does not exist.
+        """
+        try:
+            stat_object = os.stat(path)
+        except OSError:
+            return None
+
+        return stat_object.st_ino, stat_object.st_mtime_ns, stat_object.st_size
+
+    def _LookupReferenceWithProcess(self, reference: str) -> Optional[str]:
+        """Looks up a reference with the "git cat-file --batch-check" process.
+
+        The process is started on first use and kept running until the session
+        is closed.
+
+        Args:
+          reference (str): name of the reference, such as "refs/heads/main".
+
+        Returns:
+          str: object identifier the reference points to or None if the
+              reference does not exist.
+        """
+        if "\n" in reference:
+            return None
+
+        with self._lock:
+            if not self._process or self._process.poll() is not None:
+                try:
+                    self._StartProcess()
+                except OSError as exception:
+                    logging.error(
+                        "Unable to start git cat-file with error: {0!s}".format(
+                            exception
+                        )
+                    )
+                    return None
+
+            try:
+                self._process.stdin.write("{0:s}\n".format(reference))
+                self._process.stdin.flush()
+                line = self._process.stdout.readline()
+            except OSError as exception:
+                logging.error(
+                    "Unable to look up reference: {0:s} with error: {1!s}".format(
+                        reference, exception
+                    )
+                )
+                return None
+
+        object_identifier, _, object_type = line.strip().partition(" ")
+        if not object_type or object_type == "missing":
+            return None
+
+        return object_identifier
+
+    def _OpenGitDirectory(self):
+        """Determines the git directory and common directory of the project.
+
+        The git directory of a worktree or submodule is referenced by a ".git"
+        file instead of a directory. The git directory of a worktree contains
+        its own HEAD, but shares its references with the common directory.
+        """
+        git_path = os.path.join(self.project_path, ".git")
+        if os.path.isfile(git_path):
+            content = self._ReadFile(git_path) or ""
+            _, _, git_path = content.strip().partition("gitdir: ")
+            if git_path:
+                git_path = os.path.join(self.project_path, git_path)
+
+        if not git_path or not os.path.isdir(git_path):
+            return
+
+        common_directory = git_path
+        content = self._ReadFile(os.path.join(git_path, "commondir"))
+        if content:
+            common_directory = os.path.join(git_path, content.strip())
+
+        # Repositories that store their references in a reftable do not have
+        # references that can be read from files.
+        if os.path.isdir(os.path.join(common_directory, "reftable")):
+            return
+
+        self._common_directory = os.path.normpath(common_directory)
+        self._git_directory = os.path.normpath(git_path)
+
+    def _ReadFile(self, path: str) -> Optional[str]:
+        """Reads a file, using the cached content if the file did not change.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          str: content of the file or None if the file does not exist.
+        """
+        file_key = self._GetFileKey(path)
+        if not file_key:
+            return None
+
+        cached_key, content = self._file_cache.get(path, (None, None))
+        if cached_key == file_key:
+            return content
+
+        try:
+            with open(path, encoding="utf-8") as file_object:
+                content = file_object.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        self._file_cache[path] = (file_key, content)
+        return content
+
+    def _ReadPackedReferences(self) -> Dict[str, str]:
+        """Reads the packed references, if "packed-refs" changed.
+
+        Returns:
+          dict[str, str]: object identifiers per reference name.
+        """
+        path = os.path.join(self._common_directory, "packed-refs")
+        file_key = self._GetFileKey(path)
+        if file_key == self._packed_references_key:
+            return self._packed_references
+
+        packed_references = {}
+        content = self._ReadFile(path) or ""
+        for line in content.split("\n"):
+            # Comments start with "#" and peeled tags with "^".
+            if not line or line[0] in ("#", "^"):
+                continue
+
+            object_identifier, _, reference = line.partition(" ")
+            if reference:
+                packed_references[reference] = object_identifier
+
+        self._packed_references = packed_references
+        self._packed_references_key = file_key
+        return packed_references
+
+    def _ResolveReference(self, reference: str) -> Optional[str]:
+        """Resolves a reference to an object identifier.
+
+        Args:
+          reference (str): name of the reference, such as "refs/heads/main".
+
+        Returns:
+          str: object identifier the reference points to or None if the
+              reference does not exist.
+        """
+        if not self._common_directory:
+            return self._LookupReferenceWithProcess(reference)
+
+        segments = reference.split("/")
+        if any(segment in ("", ".", "..") for segment in segments):
+            return None
+
+        path = os.path.join(self._common_directory, *segments)
+        if os.path.isdir(path):
+            return None
+
+        content = self._ReadFile(path)
+        if content is not None:
+            content = content.strip()
+            # Symbolic references are resolved by git.
+            if content.startswith(self._SYMBOLIC_REFERENCE_PREFIX):
+                return self._LookupReferenceWithProcess(reference)
+            return content or None
+
+        return self._ReadPackedReferences().get(reference, None)
+
+    def _StartProcess(self):
+        """Starts the "git cat-file --batch-check" process.
+
+        Raises:
+          OSError: if the process cannot be started.
+        """
+        if self._process_finalizer:
+            self._process_finalizer()
+
+        self._process = subprocess.Popen(  # pylint: disable=consider-using-with
+            ["git", "cat-file", "--batch-check"],
+            cwd=self.project_path,
+            encoding="utf-8",
+            stderr=subprocess.DEVNULL,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self._process_finalizer = weakref.finalize(self, _StopProcess, self._process)
+
+    def Close(self):
+        """Stops the "git cat-file --batch-check" process, if it was started."""
+        with self._lock:
+            if self._process_finalizer:
+                self._process_finalizer()
+            self._process = None
+            self._process_finalizer = None
+
+    def GetActiveBranch(self) -> Optional[str]:
+        """Determines the active branch by reading HEAD.
+
+        Returns:
+          str: name of the active branch or None if HEAD does not point to a
+              branch or cannot be read.
+        """
+        if not self._git_directory:
+            return None
+
+        content = self._ReadFile(os.path.join(self._git_directory, "HEAD")) or ""
+        prefix = "{0:s}{1:s}".format(
+            self._SYMBOLIC_REFERENCE_PREFIX, self._BRANCH_PREFIX
+        )
+        content = content.strip()
+        if not content.startswith(prefix):
+            return None
+
+        return content[len(prefix) :]
+
+    def HasBranch(self, branch_name: str) -> bool:
+        """Determines if a branch exists.
+
+        Args:
+          branch_name (str): name of the branch.
+
+        Returns:
+          bool: True if the branch exists.
+        """
+        reference = "{0:s}{1:s}".format(self._BRANCH_PREFIX, branch_name)
+        return self._ResolveReference(reference) is not None
+
+
+def _StopProcess(process: subprocess.Popen):
+    """Stops a "git cat-file --batch-check" process.
+
+    Args:
+      process (subprocess.Popen): process.
+    """
+    try:
+        process.stdin.close()
+    except OSError:
+        pass
+
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+    process.stdout.close()
@@ -1,10 +1,166 @@
 """Formatter for generated code."""
 
-from yapf.yapflib import yapf_api
+import atexit
+import logging
+import multiprocessing
+import os
+import shlex
+import subprocess
+import tempfile
+import threading
 
+from concurrent import futures
+from types import ModuleType
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Type
 
-class CodeFormatter:
-    """Formats code in files."""
+from l2tscaffolder.lib import errors
+from l2tscaffolder.lib import format_cache
+
+# yapf is imported when code is first formatted, since importing it takes a
+# significant part of the start-up time of the tool. The import is serialized,
+# since a thread that imports yapf while another thread is importing it can
+# see partially initialized yapf modules.
+_yapf_import_lock = threading.Lock()
+
+
+def _GetYapfVersion() -> str:
+    """Retrieves the version of yapf.
+
+    Returns:
+      str: version of yapf.
+    """
+    yapf, _, _ = _ImportYapf()
+    return yapf.__version__
+
+
+def _ImportYapf() -> Tuple[ModuleType, ModuleType, ModuleType]:
+    """Imports yapf, which is safe to call from multiple threads.
+
+    Returns:
+      tuple[module, module, module]: the yapf, yapf style and yapf API modules.
+    """
+    with _yapf_import_lock:
+        # pylint: disable=import-outside-toplevel
+        import yapf
+        from yapf.yapflib import style
+        from yapf.yapflib import yapf_api
+
+    return yapf, style, yapf_api
+
+
+def _InitializeWorker(yapf_path: str):
+    """Initializes a formatter worker process by preloading the yapf style.
+
+    Args:
+      yapf_path (str): path to the yapf style file.
+    """
+    from yapf.yapflib import style  # pylint: disable=import-outside-toplevel
+
+    style.SetGlobalStyle(style.CreateStyleFromConfig(yapf_path))
+
+
+def _FormatInWorker(code: str) -> Tuple[str, bool]:
+    """Formats code in a formatter worker process with the preloaded style.
+
+    Args:
+      code (str): code to format.
+
+    Returns:
+      tuple[str, bool]: the formatted code and whether the code was changed
+          by formatting.
+    """
+    from yapf.yapflib import yapf_api  # pylint: disable=import-outside-toplevel
+
+    return yapf_api.FormatCode(code, style_config=None)
+
+
+class BaseFormatter:
+    """Interface of a code formatter backend.
+
+    Attributes:
+      style_path (str): path to the style file of the formatter.
+    """
+
+    # The name of the formatter backend.
+    NAME = "base"
+
+    # Whether the formatter leaves code unchanged, which allows rendered
+    # templates to be streamed to their destination.
+    SUPPORTS_STREAMING = False
+
+    def __init__(self, style_path: str):
+        """Initializes the code formatter.
+
+        Args:
+          style_path (str): path to the style file of the formatter.
+        """
+        super().__init__()
+        self.style_path = style_path
+
+    def Format(self, code: str) -> Tuple[str, bool]:
+        """Formats the code.
+
+        Args:
+          code (str): code to format
+
+        Returns:
+          tuple[str, bool]: the formatted code and whether the code was changed
+              by formatting.
+        """
+        raise NotImplementedError
+
+    def FormatMany(self, codes: List[str]) -> List[Tuple[str, bool]]:
+        """Formats multiple pieces of code.
+
+        If not overwritten the code is formatted sequentially.
+
+        Args:
+          codes (list[str]): code to format.
+
+        Returns:
+          list[tuple[str, bool]]: the formatted code and whether the code was
+              changed by formatting, in the same order as the code to format.
+        """
+        return [self.Format(code) for code in codes]
+
+    def GetFingerprint(self) -> str:
+        """Retrieves a fingerprint of the formatter configuration.
+
+        The fingerprint changes whenever the formatter could format the same
+        code differently, for example when its style file was changed.
+
+        Returns:
+          str: fingerprint of the formatter.
+        """
+        return self.NAME
+
+
+class CodeFormatter(BaseFormatter):
+    """Formats code with yapf."""
+
+    NAME = "yapf"
+
+    # Number of worker processes used to format multiple pieces of code.
+    _number_of_workers = 1
+
+    # Worker process pools per style file path and modification time.
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    # Whether the worker processes are shut down when the interpreter exits.
+    _shutdown_registered = False
+
+    # Parsed yapf styles per style file path, shared by all formatters.
+    _styles = {}
+    _styles_lock = threading.Lock()
+
+    # yapf stores the style it formats with globally, hence formatting is
+    # serialized.
+    _format_lock = threading.Lock()
 
     def __init__(self, yapf_path: str):
         """Initializes the code formatter.
@@ -12,16 +168,432 @@ class CodeFormatter:
         Args:
           yapf_path (str): path to the yapf style file.
         """
-        super().__init__()
+        super().__init__(yapf_path)
         self.yapf_path = yapf_path
+        # Parse the style up front so that it is shared by all format calls.
+        self._GetStyle()
+
+    def _GetPool(self, modification_time: int) -> "futures.ProcessPoolExecutor":
+        """Retrieves the worker process pool for the style file.
+
+        Worker processes are started with the style preloaded. A pool that was
+        started with an older version of the style file is shut down, all
+        pools are shut down when the interpreter exits.
 
-    def Format(self, code: str) -> str:
+        The worker processes are spawned instead of forked, since the pool can
+        be started by a render thread, while forking a process that runs
+        multiple threads can deadlock the child process.
+
+        Args:
+          modification_time (int): modification time of the style file.
+
+        Returns:
+          concurrent.futures.ProcessPoolExecutor: the worker process pool.
+        """
+        with self._pools_lock:
+            pool_modification_time, pool = self._pools.get(self.yapf_path, (None, None))
+            if pool and pool_modification_time != modification_time:
+                pool.shutdown(wait=False)
+                pool = None
+
+            if not pool:
+                if not CodeFormatter._shutdown_registered:
+                    atexit.register(CodeFormatter.ShutdownWorkers)
+                    CodeFormatter._shutdown_registered = True
+
+                pool = futures.ProcessPoolExecutor(
+                    max_workers=self._number_of_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_InitializeWorker,
+                    initargs=(self.yapf_path,),
+                )
+                self._pools[self.yapf_path] = (modification_time, pool)
+
+        return pool
+
+    def _GetStyle(self) -> Tuple[bytes, Dict[str, object], int]:
+        """Retrieves the contents and parsed yapf style of the style file.
+
+        The style file is only read and parsed again when it was modified.
+
+        Returns:
+          tuple[bytes, dict[str, object], int]: contents of the style file,
+              the parsed yapf style and the modification time of the style file.
+        """
+        try:
+            modification_time = os.stat(self.yapf_path).st_mtime_ns
+        except OSError:
+            modification_time = None
+
+        with self._styles_lock:
+            cached_style = self._styles.get(self.yapf_path, None)
+            if cached_style and cached_style[0] == modification_time:
+                return cached_style[1], cached_style[2], modification_time
+
+        style_data = b""
+        if modification_time is not None:
+            with open(self.yapf_path, "rb") as file_object:
+                style_data = file_object.read()
+
+        _, style, _ = _ImportYapf()
+        parsed_style = style.CreateStyleFromConfig(self.yapf_path)
+
+        with self._styles_lock:
+            self._styles[self.yapf_path] = (
+                modification_time,
+                style_data,
+                parsed_style,
+            )
+
+        return style_data, parsed_style, modification_time
+
+    def Format(self, code: str) -> Tuple[str, bool]:
         """Formats the code.
 
+        Results are cached by the contents of the code, the style file and the
+        version of yapf, formatting unchanged code is therefore only a lookup.
+
         Args:
           code (str): code to format
 
         Returns:
-          str: the formatted code
+          tuple[str, bool]: the formatted code and whether the code was changed
+              by formatting.
         """
-        return yapf_api.FormatCode(code, style_config=self.yapf_path)
+        style_data, parsed_style, _ = self._GetStyle()
+
+        digest = format_cache.FormatCache.CalculateDigest(
+            code, style_data, _GetYapfVersion()
+        )
+        result = format_cache.FormatCache.GetResult(digest)
+        if not result:
+            _, style, yapf_api = _ImportYapf()
+            with self._format_lock:
+                # Without a style configuration yapf formats with the global
+                # style, which prevents yapf from reading and parsing the style
+                # file again.
+                style.SetGlobalStyle(parsed_style)
+                result = yapf_api.FormatCode(code, style_config=None)
+
+            format_cache.FormatCache.StoreResult(digest, result)
+
+        return result
+
+    def FormatMany(self, codes: List[str]) -> List[Tuple[str, bool]]:
+        """Formats multiple pieces of code.
+
+        Code that is not cached is formatted by a pool of worker processes when
+        more than one worker is configured and more than one piece of code needs
+        formatting, otherwise it is formatted sequentially.
+
+        Args:
+          codes (list[str]): code to format.
+
+        Returns:
+          list[tuple[str, bool]]: the formatted code and whether the code was
+              changed by formatting, in the same order as the code to format.
+        """
+        style_data, _, modification_time = self._GetStyle()
+
+        results = []
+        uncached = {}
+        for index, code in enumerate(codes):
+            digest = format_cache.FormatCache.CalculateDigest(
+                code, style_data, _GetYapfVersion()
+            )
+            result = format_cache.FormatCache.GetResult(digest)
+            if not result:
+                uncached[index] = digest
+            results.append(result)
+
+        if self._number_of_workers <= 1 or len(uncached) <= 1:
+            for index in uncached:
+                results[index] = self.Format(codes[index])
+            return results
+
+        pool = self._GetPool(modification_time)
+        pending = {
+            index: pool.submit(_FormatInWorker, codes[index]) for index in uncached
+        }
+        for index, future in pending.items():
+            results[index] = future.result()
+            format_cache.FormatCache.StoreResult(uncached[index], results[index])
+
+        return results
+
+    def GetFingerprint(self) -> str:
+        """Retrieves a fingerprint of the formatter configuration.
+
+        Returns:
+          str: digest of the contents of the style file and the version of
+              yapf.
+        """
+        style_data, _, _ = self._GetStyle()
+        return format_cache.FormatCache.CalculateDigest(
+            self.NAME, style_data, _GetYapfVersion()
+        )
+
+    @classmethod
+    def SetNumberOfWorkers(cls, number_of_workers: int):
+        """Sets the number of worker processes used to format multiple pieces of code.
+
+        Args:
+          number_of_workers (int): number of worker processes, where 1 or less
+              means code is formatted sequentially in the current process.
+        """
+        cls.ShutdownWorkers()
+        cls._number_of_workers = number_of_workers
+
+    @classmethod
+    def ShutdownWorkers(cls):
+        """Shuts down all worker processes."""
+        with cls._pools_lock:
+            for _, pool in cls._pools.values():
+                pool.shutdown()
+            cls._pools = {}
+
+
+class ExternalCommandFormatter(BaseFormatter):
+    """Formats code with an external formatter command.
+
+    The command is run once per batch of code, with the paths of temporary
+    files that contain the code appended to the command. The command is
+    expected to format the files in place. The placeholder {style_path} in the
+    command is replaced with the path of the style file.
+
+    A new process of the command is started for every call to Format or
+    FormatMany, no process is kept alive between calls. Rendering a module
+    formats all its files with a single call to FormatMany, hence the command
+    is run once per module.
+    """
+
+    NAME = "external"
+
+    _command = "yapf --in-place --style={style_path}"
+
+    def Format(self, code: str) -> Tuple[str, bool]:
+        """Formats the code with a separate run of the command.
+
+        Args:
+          code (str): code to format
+
+        Returns:
+          tuple[str, bool]: the formatted code and whether the code was changed
+              by formatting.
+        """
+        return self.FormatMany([code])[0]
+
+    def FormatMany(self, codes: List[str]) -> List[Tuple[str, bool]]:
+        """Formats multiple pieces of code with a single run of the command.
+
+        The command is started for this batch of code and has exited when the
+        results are returned.
+
+        Args:
+          codes (list[str]): code to format.
+
+        Returns:
+          list[tuple[str, bool]]: the formatted code and whether the code was
+              changed by formatting, in the same order as the code to format.
+
+        Raises:
+          errors.FormatterError: when the formatter command fails.
+        """
+        if not codes:
+            return []
+
+        command = shlex.split(self._command.format(style_path=self.style_path))
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            file_paths = []
+            for index, code in enumerate(codes):
+                file_path = os.path.join(
+                    temporary_directory, "generated_{0:d}.py".format(index)
+                )
+                with open(file_path, "w", encoding="utf-8") as file_object:
+                    file_object.write(code)
+                file_paths.append(file_path)
+
+            try:
+                process = subprocess.run(
+                    command + file_paths,
+                    check=False,
+                    stderr=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                )
+            except OSError as exception:
+                raise errors.FormatterError(
+                    "Unable to run formatter: {0:s} with error: {1!s}".format(
+                        self._command, exception
+                    )
+                )
+
+            if process.returncode != 0:
+                error = process.stderr.decode("utf-8", errors="replace")
+                logging.error(
+                    'Running: "{0:s}" failed with error: {1:s}'.format(
+                        self._command, error
+                    )
+                )
+                raise errors.FormatterError(
+                    "Formatter failed with exit code: {0:d}".format(process.returncode)
+                )
+
+            results = []
+            for code, file_path in zip(codes, file_paths):
+                with open(file_path, encoding="utf-8") as file_object:
+                    formatted = file_object.read()
+                results.append((formatted, formatted != code))
+
+        return results
+
+    def GetFingerprint(self) -> str:
+        """Retrieves a fingerprint of the formatter configuration.
+
+        Returns:
+          str: digest of the contents of the style file and the formatter
+              command.
+        """
+        try:
+            with open(self.style_path, "rb") as file_object:
+                style_data = file_object.read()
+        except OSError:
+            style_data = b""
+
+        return format_cache.FormatCache.CalculateDigest(
+            self._command, style_data, self.NAME
+        )
+
+    @classmethod
+    def SetCommand(cls, command: str):
+        """Sets the external formatter command.
+
+        Args:
+          command (str): the formatter command.
+        """
+        cls._command = command
+
+
+class PassthroughFormatter(BaseFormatter):
+    """Leaves code unformatted.
+
+    This is useful when generating many modules, with the whole tree being
+    formatted once afterwards.
+    """
+
+    NAME = "passthrough"
+
+    SUPPORTS_STREAMING = True
+
+    def Format(self, code: str) -> Tuple[str, bool]:
+        """Returns the code unformatted.
+
+        Args:
+          code (str): code to format
+
+        Returns:
+          tuple[str, bool]: the unchanged code and False.
+        """
+        return code, False
+
+
+class FormatterManager:
+    """The code formatter manager."""
+
+    _default_formatter_name = CodeFormatter.NAME
+    _formatter_classes = {}
+
+    @classmethod
+    def DeregisterFormatter(cls, formatter_class: Type[BaseFormatter]):
+        """Deregisters a formatter class.
+
+        Args:
+          formatter_class (type): formatter class (subclass of BaseFormatter).
+
+        Raises:
+          KeyError: if formatter class is not set for the corresponding name.
+        """
+        formatter_name = formatter_class.NAME.lower()
+        if formatter_name not in cls._formatter_classes:
+            raise KeyError(
+                "Formatter class not set for name: {0:s}.".format(formatter_class.NAME)
+            )
+
+        del cls._formatter_classes[formatter_name]
+
+    @classmethod
+    def GetDefaultFormatterName(cls) -> str:
+        """Retrieves the name of the default formatter.
+
+        Returns:
+          str: name of the default formatter.
+        """
+        return cls._default_formatter_name
+
+    @classmethod
+    def GetFormatterByName(cls, name: str) -> Type[BaseFormatter]:
+        """Retrieves a formatter class by its name.
+
+        Args:
+          name (str): name of the formatter, or an empty string for the default
+              formatter.
+
+        Returns:
+          type: formatter class (subclass of BaseFormatter).
+
+        Raises:
+          KeyError: if no formatter class is set for the name.
+        """
+        formatter_name = (name or cls._default_formatter_name).lower()
+        formatter_class = cls._formatter_classes.get(formatter_name, None)
+        if not formatter_class:
+            raise KeyError("No formatter registered for name: {0:s}.".format(name))
+
+        return formatter_class
+
+    @classmethod
+    def GetFormatterNames(cls) -> Iterator[str]:
+        """Retrieves the names of the registered formatters.
+
+        Yields:
+          str: formatter names.
+        """
+        yield from cls._formatter_classes
+
+    @classmethod
+    def RegisterFormatter(cls, formatter_class: Type[BaseFormatter]):
+        """Registers a formatter class.
+
+        Args:
+          formatter_class (type): formatter class (subclass of BaseFormatter).
+
+        Raises:
+          KeyError: if formatter class is already set for the corresponding name.
+        """
+        formatter_name = formatter_class.NAME.lower()
+        if formatter_name in cls._formatter_classes:
+            raise KeyError(
+                "Formatter class already set for name: {0:s}.".format(
+                    formatter_class.NAME
+                )
+            )
+
+        cls._formatter_classes[formatter_name] = formatter_class
+
+    @classmethod
+    def SetDefaultFormatter(cls, name: str):
+        """Sets the formatter used when no formatter is explicitly chosen.
+
+        Args:
+          name (str): name of the formatter.
+
+        Raises:
+          KeyError: if no formatter class is set for the name.
+        """
+        formatter_class = cls.GetFormatterByName(name)
+        cls._default_formatter_name = formatter_class.NAME.lower()
+
+
+FormatterManager.RegisterFormatter(CodeFormatter)
+FormatterManager.RegisterFormatter(ExternalCommandFormatter)
+FormatterManager.RegisterFormatter(PassthroughFormatter)
@@ -1,31 +1,318 @@
 """The scaffolder engine."""
 
+import hashlib
 import logging
 import os
 
+from concurrent import futures
+from typing import Dict
+from typing import Iterable
 from typing import Iterator
+from typing import List
+from typing import Set
+from typing import Tuple
 from typing import Type
 
 from l2tscaffolder.definitions import manager
 from l2tscaffolder.lib import errors
 from l2tscaffolder.lib import file_handler
+from l2tscaffolder.lib import generation_manifest
+from l2tscaffolder.lib import transaction
 from l2tscaffolder.scaffolders import interface as scaffolder_interface
 
 
+class ModuleReport:
+    """Report of generating a module.
+
+    Attributes:
+      error (str): error that prevented the module from being generated or an
+          empty string if the module was generated.
+      file_paths (list[str]): full paths of the files that were written to disk.
+      module_name (str): name of the module.
+      skipped_file_paths (list[str]): full paths of the files that were not
+          generated again, because none of their inputs changed.
+    """
+
+    def __init__(self, module_name: str):
+        """Initializes a module report.
+
+        Args:
+          module_name (str): name of the module.
+        """
+        super().__init__()
+        self.error = ""
+        self.file_paths = []
+        self.module_name = module_name
+        self.skipped_file_paths = []
+
+
+class _RenderedModule:
+    """Files of a module that are rendered but not yet written.
+
+    Attributes:
+      files_to_copy (list[tuple[str, str]]): file name of source and
+          destination of the files to copy.
+      generated_files (list[tuple[str, str|Iterable[str]]]): file name and
+          content of the generated files.
+      init_file_changes (list[tuple[str, str]]): path to the init file and the
+          entry to add to it.
+      input_digest (str): digest of the inputs of the module or an empty
+          string if the module is always generated.
+      is_up_to_date (bool): True if the files of the module did not change
+          since they were last generated, in which case nothing is rendered.
+      module_key (str): key that identifies the module in the generation
+          manifest.
+    """
+
+    def __init__(self, module_key: str):
+        """Initializes a rendered module.
+
+        Args:
+          module_key (str): key that identifies the module in the generation
+              manifest.
+        """
+        super().__init__()
+        self.files_to_copy = []
+        self.generated_files = []
+        self.init_file_changes = []
+        self.input_digest = ""
+        self.is_up_to_date = False
+        self.module_key = module_key
+
+
 class ScaffolderEngine:
     """The engine, responsible for file handling and setting up scaffolders."""
 
     def __init__(self):
         """Initializes the engine."""
         super().__init__()
-        self._attributes = {}
         self._definition = ""
         self._definition_root_path = ""
         self._file_handler = file_handler.FileHandler()
         self._file_name_prefix = ""
+        self._incremental = False
+        self._modules = []
         self._scaffolder = None
         self.module_name = ""
 
+    def _AddChangedInitFiles(
+        self,
+        report: ModuleReport,
+        init_file_changes: List[Tuple[str, str]],
+        changed_init_file_paths: Set[str],
+    ):
+        """Adds the init files that were changed for a module to its report.
+
+        Init files are only added to the report of a module of which files
+        were written, since the imports of modules that were not generated
+        again are already present.
+
+        Args:
+          report (ModuleReport): report of the module.
+          init_file_changes (list[tuple[str, str]]): path to the init file and
+              the entry to add to it, of the module.
+          changed_init_file_paths (set[str]): full paths of the init files that
+              were changed.
+        """
+        if not report.file_paths:
+            return
+
+        for full_path in self._GroupInitFileChanges(init_file_changes):
+            if full_path in changed_init_file_paths:
+                report.file_paths.append(full_path)
+
+    def _BeginTransaction(self) -> transaction.FileTransaction:
+        """Begins a transaction that stages all file changes.
+
+        Returns:
+          transaction.FileTransaction: the transaction.
+        """
+        file_transaction = transaction.FileTransaction(self._definition_root_path)
+        self._file_handler.SetTransaction(file_transaction)
+        return file_transaction
+
+    def _CalculateInputDigest(
+        self,
+        scaffolder: scaffolder_interface.Scaffolder,
+        files_to_copy: List[Tuple[str, str]],
+    ) -> str:
+        """Calculates a digest of all inputs of a module.
+
+        Args:
+          scaffolder (scaffolder_interface.Scaffolder): configured scaffolder.
+          files_to_copy (list[tuple[str, str]]): file name of source and
+              destination of the files to copy.
+
+        Returns:
+          str: hexadecimal SHA-256 digest of the inputs or an empty string if
+              the module should always be generated.
+        """
+        scaffolder_digest = scaffolder.GetInputDigest()
+        if not scaffolder_digest:
+            return ""
+
+        inputs = [scaffolder.__class__.__name__, scaffolder_digest]
+        for file_source, file_destination in files_to_copy:
+            # Files to copy are identified by their size and modification time,
+            # which avoids reading them.
+            try:
+                stat_object = os.stat(file_source)
+            except OSError:
+                return ""
+
+            inputs.extend(
+                [
+                    file_source,
+                    file_destination,
+                    "{0:d}".format(stat_object.st_size),
+                    "{0:d}".format(stat_object.st_mtime_ns),
+                ]
+            )
+
+        hasher = hashlib.sha256()
+        for data in inputs:
+            data = data.encode("utf-8")
+            # The length prefix prevents different inputs from producing the
+            # same concatenation.
+            hasher.update("{0:d}:".format(len(data)).encode("ascii"))
+            hasher.update(data)
+
+        return hasher.hexdigest()
+
+    def _ChangeInitFiles(
+        self, init_file_changes: List[Tuple[str, str]]
+    ) -> Iterator[str]:
+        """Adds imports to init files.
+
+        Each init file is only rewritten once, regardless of the number of
+        imports added to it. Init files that do not exist or that already
+        contain all imports are not changed.
+
+        Args:
+          init_file_changes (list[tuple[str, str]]): path to the init file and
+              the entry to add to it.
+
+        Yields:
+          str: the full path to an init file that was changed.
+        """
+        entries_per_path = self._GroupInitFileChanges(init_file_changes)
+        for full_path, entries in entries_per_path.items():
+            if self._file_handler.AddImportsToInit(full_path, entries):
+                yield full_path
+
+    def _CopyFiles(self, files_to_copy: List[Tuple[str, str]]) -> Iterator[str]:
+        """Copies files into the project.
+
+        Args:
+          files_to_copy (list[tuple[str, str]]): file name of source and
+              destination.
+
+        Yields:
+          str: the full path to a file that was copied.
+        """
+        for file_source, file_destination in files_to_copy:
+            if os.path.isfile(file_source):
+                full_path = os.path.join(self._definition_root_path, file_destination)
+                try:
+                    written_file = self._file_handler.CopyFile(file_source, full_path)
+                    yield written_file
+                except errors.FileHandlingError as exception:
+                    logging.error(
+                        "Unable to copy file: {0:s} to {1:s} with error: {2!s}".format(
+                            file_source, full_path, exception
+                        )
+                    )
+
+    def _EndTransaction(self, file_transaction: transaction.FileTransaction):
+        """Ends a transaction, file changes that were not committed are discarded.
+
+        Args:
+          file_transaction (transaction.FileTransaction): the transaction.
+        """
+        self._file_handler.SetTransaction(None)
+        file_transaction.Rollback()
+
+    def _GetNames(self, module_name: str) -> Tuple[str, str]:
+        """Determines the file name prefix and class name of a module.
+
+        Args:
+          module_name (str): name of the module as chosen by the user.
+
+        Returns:
+          tuple[str, str]: file name prefix and module name in CamelCase.
+        """
+        file_name_prefix = module_name.replace(" ", "_")
+        file_name_prefix = file_name_prefix.lower()
+        module_name = file_name_prefix.replace("_", " ")
+        module_name = module_name.title()
+        module_name = module_name.replace(" ", "")
+        return file_name_prefix, module_name
+
+    def _GroupInitFileChanges(
+        self, init_file_changes: List[Tuple[str, str]]
+    ) -> Dict[str, List[str]]:
+        """Groups init file changes by init file.
+
+        Args:
+          init_file_changes (list[tuple[str, str]]): path to the init file and
+              the entry to add to it.
+
+        Returns:
+          dict[str, list[str]]: entries to add per full path of the init file,
+              in the order the init files were first encountered.
+        """
+        entries_per_path = {}
+        for file_path, entry in init_file_changes:
+            full_path = os.path.join(self._definition_root_path, file_path)
+            entries_per_path.setdefault(full_path, []).append(entry)
+
+        return entries_per_path
+
+    def _IsUpToDate(
+        self,
+        manifest: generation_manifest.GenerationManifest,
+        module_key: str,
+        input_digest: str,
+    ) -> bool:
+        """Determines if the files of a module need to be generated again.
+
+        Args:
+          manifest (generation_manifest.GenerationManifest): generation manifest.
+          module_key (str): key that identifies the module in the manifest.
+          input_digest (str): digest of the inputs of the module.
+
+        Returns:
+          bool: True if the inputs of the module did not change and none of the
+              files of the module were changed or removed since they were last
+              generated.
+        """
+        if not input_digest:
+            return False
+
+        recorded_input_digest, file_digests = manifest.GetModule(module_key)
+        if input_digest != recorded_input_digest or not file_digests:
+            return False
+
+        for file_path, digest in file_digests.items():
+            if self._file_handler.CalculateDigest(file_path) != digest:
+                return False
+
+        return True
+
+    def _ReadManifest(self) -> generation_manifest.GenerationManifest:
+        """Reads the generation manifest of the project, if incremental.
+
+        Returns:
+          generation_manifest.GenerationManifest: generation manifest or None
+              if every module is always generated.
+        """
+        if not self._incremental:
+            return None
+
+        manifest = generation_manifest.GenerationManifest(self._definition_root_path)
+        manifest.Read()
+        return manifest
+
     def _RaiseIfNotReady(self):
         """Checks to see if all attributes are set to start generating files.
 
@@ -48,40 +335,342 @@ class ScaffolderEngine:
         except errors.ScaffolderNotConfigured as exception:
             raise errors.EngineNotConfigured(exception)
 
+    def _RenderModule(
+        self,
+        scaffolder: scaffolder_interface.Scaffolder,
+        file_name_prefix: str,
+        manifest: generation_manifest.GenerationManifest,
+        join_content: bool = False,
+    ) -> _RenderedModule:
+        """Renders the files of a module without writing them to disk.
+
+        Args:
+          scaffolder (scaffolder_interface.Scaffolder): configured scaffolder.
+          file_name_prefix (str): file name prefix of the module.
+          manifest (generation_manifest.GenerationManifest): generation manifest
+              or None if the module is always rendered.
+          join_content (Optional[bool]): True if the content of generated files
+              should be joined into strings, which renders them immediately.
+
+        Returns:
+          _RenderedModule: rendered module.
+
+        Raises:
+          errors.EngineNotConfigured: when the scaffolder is not fully
+              configured.
+        """
+        try:
+            scaffolder.RaiseIfNotReady()
+        except errors.ScaffolderNotConfigured as exception:
+            raise errors.EngineNotConfigured(exception)
+
+        scaffolder.SetOutputName(file_name_prefix)
+
+        rendered_module = _RenderedModule(
+            "{0:s}:{1:s}".format(scaffolder.NAME, file_name_prefix)
+        )
+        # The files to copy are determined first, since scaffolders can derive
+        # the context of their templates from them.
+        rendered_module.files_to_copy = list(scaffolder.GetFilesToCopy())
+        rendered_module.init_file_changes = list(scaffolder.GetInitFileChanges())
+
+        if manifest:
+            rendered_module.input_digest = self._CalculateInputDigest(
+                scaffolder, rendered_module.files_to_copy
+            )
+            rendered_module.is_up_to_date = self._IsUpToDate(
+                manifest, rendered_module.module_key, rendered_module.input_digest
+            )
+            if rendered_module.is_up_to_date:
+                return rendered_module
+
+        for file_path, content in scaffolder.GenerateFiles():
+            if join_content and not isinstance(content, str):
+                content = "".join(content)
+            rendered_module.generated_files.append((file_path, content))
+
+        return rendered_module
+
+    def _WriteFiles(
+        self,
+        generated_files: Iterable[Tuple[str, str]],
+        replace_paths: Iterable[str] = None,
+    ) -> Iterator[str]:
+        """Writes generated files into the project.
+
+        Args:
+          generated_files (Iterable[tuple[str, str]]): file name and content of
+              the generated files.
+          replace_paths (Optional[Iterable[str]]): full paths of the files of
+              which the content is replaced, content is appended to other
+              files.
+
+        Yields:
+          str: the full path to a file that was written to disk.
+        """
+        replace_paths = frozenset(replace_paths or [])
+        for file_path, content in generated_files:
+            full_path = os.path.join(self._definition_root_path, file_path)
+            if full_path in replace_paths:
+                yield self._file_handler.ReplaceContent(full_path, content)
+            else:
+                yield self._file_handler.AddContent(full_path, content)
+
+    def _WriteModule(
+        self,
+        rendered_module: _RenderedModule,
+        report: ModuleReport,
+        manifest: generation_manifest.GenerationManifest,
+    ):
+        """Writes the files of a rendered module into the project.
+
+        Init files are not changed.
+
+        Args:
+          rendered_module (_RenderedModule): rendered module.
+          report (ModuleReport): report of the module, which is updated with
+              the paths of the written and skipped files.
+          manifest (generation_manifest.GenerationManifest): generation manifest
+              or None if the module is always generated.
+        """
+        recorded_file_paths = []
+        if manifest:
+            _, file_digests = manifest.GetModule(rendered_module.module_key)
+            recorded_file_paths = sorted(file_digests.keys())
+
+        if rendered_module.is_up_to_date:
+            for file_path in recorded_file_paths:
+                logging.info("Skipping unchanged file: {0:s}".format(file_path))
+            report.skipped_file_paths.extend(recorded_file_paths)
+            return
+
+        file_paths = list(self._CopyFiles(rendered_module.files_to_copy))
+        file_paths.extend(
+            self._WriteFiles(
+                rendered_module.generated_files, replace_paths=recorded_file_paths
+            )
+        )
+        report.file_paths.extend(file_paths)
+
+        if manifest and rendered_module.input_digest:
+            # Files are written in a transaction, hence the digests are
+            # calculated from the staged files.
+            file_digests = {
+                file_path: self._file_handler.CalculateDigest(file_path)
+                for file_path in file_paths
+            }
+            manifest.SetModule(
+                rendered_module.module_key, rendered_module.input_digest, file_digests
+            )
+
+    def _WriteModules(
+        self,
+        modules: List[Tuple[str, scaffolder_interface.Scaffolder]],
+        number_of_workers: int,
+        manifest: generation_manifest.GenerationManifest,
+    ) -> Tuple[List[ModuleReport], List[List[Tuple[str, str]]]]:
+        """Renders modules concurrently and writes their files.
+
+        The scaffolders are prepared by the calling thread before their modules
+        are rendered, a module of which the scaffolder cannot be prepared is
+        reported as failed.
+
+        Args:
+          modules (list[tuple[str, scaffolder_interface.Scaffolder]]): module
+              names and configured scaffolders.
+          number_of_workers (int): number of threads used to render modules.
+          manifest (generation_manifest.GenerationManifest): generation manifest
+              or None if every module is always generated.
+
+        Returns:
+          tuple: containing:
+
+          * list[ModuleReport]: reports of the modules.
+          * list[list[tuple[str, str]]]: path to the init file and the entry to
+                add to it, per module in the order of the reports.
+        """
+        init_file_changes_per_module = []
+        reports = []
+        with futures.ThreadPoolExecutor(max_workers=number_of_workers) as executor:
+            render_futures = []
+            for module_name, scaffolder in modules:
+                file_name_prefix, module_name = self._GetNames(module_name)
+                reports.append(ModuleReport(module_name))
+
+                # The state that scaffolders create on first use, such as
+                # their mapping helper and code formatter, is created by the
+                # calling thread before any module is rendered.
+                try:
+                    scaffolder.PrepareGeneration()
+                except Exception as exception:  # pylint: disable=broad-except
+                    render_future = futures.Future()
+                    render_future.set_exception(exception)
+                    render_futures.append(render_future)
+                    continue
+
+                render_futures.append(
+                    executor.submit(
+                        self._RenderModule,
+                        scaffolder,
+                        file_name_prefix,
+                        manifest,
+                        join_content=True,
+                    )
+                )
+
+            for report, render_future in zip(reports, render_futures):
+                # Any error of a scaffolder, such as a test file that cannot be
+                # read, is reported per module so that other modules are still
+                # generated.
+                try:
+                    rendered_module = render_future.result()
+                except Exception as exception:  # pylint: disable=broad-except
+                    logging.error(
+                        "Unable to generate module: {0:s} with error: {1!s}".format(
+                            report.module_name, exception
+                        )
+                    )
+                    report.error = "{0!s}".format(exception)
+                    init_file_changes_per_module.append([])
+                    continue
+
+                self._WriteModule(rendered_module, report, manifest)
+                init_file_changes_per_module.append(rendered_module.init_file_changes)
+
+        return reports, init_file_changes_per_module
+
+    def AddModule(self, module_name: str, scaffolder: scaffolder_interface.Scaffolder):
+        """Adds a module to be generated by GenerateModules.
+
+        Args:
+          module_name (str): name of the module to be generated by the scaffolder.
+          scaffolder (scaffolder_interface.Scaffolder): configured scaffolder,
+              which must not be shared with other modules.
+        """
+        self._modules.append((module_name, scaffolder))
+
     def GenerateFiles(self) -> Iterator[str]:
         """Generates needed files.
 
+        All files are changed in a single transaction, which is rolled back if
+        any of the files cannot be generated. When incremental, the files are
+        not generated again if none of their inputs changed.
+
         Raises:
           errors.EngineNotConfigured: when not all attributes have been configured.
+          errors.FileHandlingError: when the file changes cannot be committed.
 
         Yields:
           str: the full path to a file that was generated and written to disk.
         """
         self._RaiseIfNotReady()
 
-        self._scaffolder.SetOutputName(self._file_name_prefix)
+        manifest = self._ReadManifest()
+        report = ModuleReport(self.module_name)
 
-        for file_source, file_destination in self._scaffolder.GetFilesToCopy():
-            if os.path.isfile(file_source):
-                full_path = os.path.join(self._definition_root_path, file_destination)
-                try:
-                    written_file = self._file_handler.CopyFile(file_source, full_path)
-                    yield written_file
-                except errors.FileHandlingError as exception:
-                    logging.error(
-                        "Unable to copy file: {0:s} to {1:s} with error: {2!s}".format(
-                            file_source, full_path, exception
-                        )
-                    )
+        file_transaction = self._BeginTransaction()
+        try:
+            rendered_module = self._RenderModule(
+                self._scaffolder, self._file_name_prefix, manifest
+            )
+            self._WriteModule(rendered_module, report, manifest)
+            changed_init_file_paths = set(
+                self._ChangeInitFiles(rendered_module.init_file_changes)
+            )
+            self._AddChangedInitFiles(
+                report, rendered_module.init_file_changes, changed_init_file_paths
+            )
+            if manifest:
+                manifest.Write(self._file_handler)
+            file_transaction.Commit()
 
-        for file_path, content in self._scaffolder.GenerateFiles():
-            full_path = os.path.join(self._definition_root_path, file_path)
-            yield self._file_handler.AddContent(full_path, content)
+        finally:
+            self._EndTransaction(file_transaction)
 
-        for file_path, content in self._scaffolder.GetInitFileChanges():
-            full_path = os.path.join(self._definition_root_path, file_path)
-            self._file_handler.AddImportToInit(full_path, content)
-            yield full_path
+        yield from report.file_paths
+
+    def GenerateModules(self, number_of_workers: int = 1) -> List[ModuleReport]:
+        """Generates the files of all modules added with AddModule.
+
+        The modules are rendered concurrently by a pool of threads, formatting
+        is parallelized by the code formatter. The rendered files are written
+        to disk by the calling thread, one module at a time in the order the
+        modules were added, so that writes never interleave. The imports of
+        all modules are added to the init files after all modules were
+        written. A module that cannot be rendered is not generated and its
+        error is recorded in its report. All files are changed in a single
+        transaction, which is rolled back if any of the files cannot be
+        written. When incremental, modules
+        of which none of the inputs changed are not rendered again.
+
+        Args:
+          number_of_workers (Optional[int]): number of threads used to render
+              modules.
+
+        Returns:
+          list[ModuleReport]: reports of the generated modules, in the order
+              the modules were added.
+
+        Raises:
+          errors.EngineNotConfigured: when the path to the project root is not
+              configured.
+          errors.FileHandlingError: when the file changes cannot be committed.
+        """
+        if not self._definition_root_path:
+            raise errors.EngineNotConfigured(
+                "The path to the project root is not properly configured."
+            )
+
+        modules, self._modules = self._modules, []
+        manifest = self._ReadManifest()
+
+        file_transaction = self._BeginTransaction()
+        try:
+            reports, init_file_changes_per_module = self._WriteModules(
+                modules, number_of_workers, manifest
+            )
+
+            # The imports of all modules are added at once, so that init files
+            # that are shared between modules are only rewritten once.
+            init_file_changes = [
+                init_file_change
+                for init_file_changes in init_file_changes_per_module
+                for init_file_change in init_file_changes
+            ]
+            changed_init_file_paths = set(self._ChangeInitFiles(init_file_changes))
+            for report, init_file_changes in zip(reports, init_file_changes_per_module):
+                self._AddChangedInitFiles(
+                    report, init_file_changes, changed_init_file_paths
+                )
+            if manifest:
+                manifest.Write(self._file_handler)
+            file_transaction.Commit()
+
+        finally:
+            self._EndTransaction(file_transaction)
+
+        return reports
+
+    def SetFileHandler(self, handler: file_handler.FileHandler):
+        """Sets the file handler used to write files.
+
+        Args:
+          handler (file_handler.FileHandler): file handler, such as
+              a file_handler.MemoryFileHandler to keep all changes in memory.
+        """
+        self._file_handler = handler
+
+    def SetIncremental(self, incremental: bool):
+        """Sets whether modules are only generated when their inputs changed.
+
+        The inputs and outputs of generated modules are recorded in
+        a generation manifest in the project root.
+
+        Args:
+          incremental (bool): True if modules of which none of the inputs
+              changed since they were last generated should be skipped.
+        """
+        self._incremental = incremental
 
     def SetModuleName(self, module_name: str):
         """Sets the module name as chosen by the user.
@@ -89,13 +678,7 @@ class ScaffolderEngine:
         Args:
           module_name (str): name of the module to be generated by the scaffolder.
         """
-        file_name_prefix = module_name.replace(" ", "_")
-        file_name_prefix = file_name_prefix.lower()
-        module_name = file_name_prefix.replace("_", " ")
-        module_name = module_name.title()
-        module_name = module_name.replace(" ", "")
-        self._file_name_prefix = file_name_prefix
-        self.module_name = module_name
+        self._file_name_prefix, self.module_name = self._GetNames(module_name)
 
     def SetScaffolder(self, scaffolder: scaffolder_interface.Scaffolder):
         """Stores and initializes the scaffolder object in the engine.
@@ -113,13 +696,12 @@ class ScaffolderEngine:
           errors.NoValidDefinition: when root path is not identified as a valid
               definition path.
         """
-        for definition in manager.DefinitionManager.GetDefinitionObjects():
-            if definition.ValidatePath(root_path):
-                self._definition = definition.NAME
-                self._definition_root_path = root_path
-                return
+        definition_name = manager.DefinitionManager.GetDefinitionNameByPath(root_path)
+        if not definition_name:
+            raise errors.NoValidDefinition("No valid definition has been identified.")
 
-        raise errors.NoValidDefinition("No valid definition has been identified.")
+        self._definition = definition_name
+        self._definition_root_path = root_path
 
     def StoreScaffolderAttribute(self, name: str, value: object, value_type: Type):
         """Stores an attribute read from the CLI.
@@ -13,6 +13,10 @@ class FileHandlingError(Error):
     """Raised when the file handler is unable to do file operation."""
 
 
+class FormatterError(Error):
+    """Raised when the code formatter is unable to format code."""
+
+
 class NoValidDefinition(Error):
     """Raised when no valid project definition has been identified."""
 
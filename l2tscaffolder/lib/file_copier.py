@@ -0,0 +1,299 @@
+"""Copies files with the most efficient method the platform supports."""
+
+import collections
+import os
+import shutil
+import threading
+
+from typing import Dict
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class FileCopier:
+    """Copies files, such as large test files, without reading them if possible.
+
+    The copy methods are tried in order:
+
+    * a hard link, if hard links are allowed and the destination does not
+      exist;
+    * a reflink, which shares the data of the source on copy-on-write file
+      systems, such as Btrfs and XFS;
+    * an in-kernel copy with os.copy_file_range() or os.sendfile();
+    * a buffered copy.
+
+    Hard links are not allowed by default. A hard link shares its inode with
+    the source, hence changing either file in place changes both, which must be
+    avoided for evidence files. Hard links are tried first when allowed, since
+    reflinks or in-kernel copies are supported by most Linux file systems and
+    the hard link would otherwise never be used.
+    """
+
+    # Size of the chunks of the buffered copy and file comparison.
+    _BUFFER_SIZE = 1024 * 1024
+
+    # ioctl request code of FICLONE on Linux.
+    _FICLONE = 0x40049409
+
+    # Maximum number of bytes copied by a single in-kernel copy call.
+    _MAXIMUM_COPY_SIZE = 1024 * 1024 * 1024
+
+    METHOD_BUFFERED = "buffered"
+    METHOD_COPY_FILE_RANGE = "copy_file_range"
+    METHOD_HARD_LINK = "hard_link"
+    METHOD_REFLINK = "reflink"
+    METHOD_SENDFILE = "sendfile"
+
+    _allow_hard_links = False
+    _lock = threading.Lock()
+    _statistics = collections.Counter()
+
+    @classmethod
+    def _CopyWithCopyFileRange(
+        cls, source_descriptor: int, destination_descriptor: int, size: int
+    ) -> bool:
+        """Copies the data of a file with os.copy_file_range().
+
+        Args:
+          source_descriptor (int): file descriptor of the source.
+          destination_descriptor (int): file descriptor of the destination.
+          size (int): size of the source.
+
+        Returns:
+          bool: True if the data was copied.
+        """
+        if not hasattr(os, "copy_file_range"):
+            return False
+
+        offset = 0
+        while offset < size:
+            try:
+                copied = os.copy_file_range(
+                    source_descriptor,
+                    destination_descriptor,
+                    min(size - offset, cls._MAXIMUM_COPY_SIZE),
+                    offset_src=offset,
+                    offset_dst=offset,
+                )
+            except OSError:
+                return False
+
+            if not copied:
+                return False
+            offset += copied
+
+        return True
+
+    @classmethod
+    def _CopyWithHardLink(cls, source: str, destination: str) -> bool:
+        """Hard links a file.
+
+        Args:
+          source (str): path of the file to copy.
+          destination (str): path to copy the file to, which must not exist.
+
+        Returns:
+          bool: True if the file was hard linked.
+        """
+        try:
+            os.link(source, destination)
+        except OSError:
+            return False
+
+        return True
+
+    @classmethod
+    def _CopyWithReflink(
+        cls, source_descriptor: int, destination_descriptor: int
+    ) -> bool:
+        """Creates a reflink of a file with the FICLONE ioctl.
+
+        Args:
+          source_descriptor (int): file descriptor of the source.
+          destination_descriptor (int): file descriptor of the destination.
+
+        Returns:
+          bool: True if the reflink was created.
+        """
+        if not fcntl or os.uname().sysname != "Linux":
+            return False
+
+        try:
+            fcntl.ioctl(destination_descriptor, cls._FICLONE, source_descriptor)
+        except OSError:
+            return False
+
+        return True
+
+    @classmethod
+    def _CopyWithSendfile(
+        cls, source_descriptor: int, destination_descriptor: int, size: int
+    ) -> bool:
+        """Copies the data of a file with os.sendfile().
+
+        Args:
+          source_descriptor (int): file descriptor of the source.
+          destination_descriptor (int): file descriptor of the destination.
+          size (int): size of the source.
+
+        Returns:
+          bool: True if the data was copied.
+        """
+        if not hasattr(os, "sendfile"):
+            return False
+
+        offset = 0
+        while offset < size:
+            try:
+                copied = os.sendfile(
+                    destination_descriptor,
+                    source_descriptor,
+                    offset,
+                    min(size - offset, cls._MAXIMUM_COPY_SIZE),
+                )
+            except OSError:
+                return False
+
+            if not copied:
+                return False
+            offset += copied
+
+        return True
+
+    @classmethod
+    def _ResetDestination(cls, destination_descriptor: int):
+        """Removes the data of a partial copy from the destination.
+
+        Args:
+          destination_descriptor (int): file descriptor of the destination.
+        """
+        os.ftruncate(destination_descriptor, 0)
+        os.lseek(destination_descriptor, 0, os.SEEK_SET)
+
+    @classmethod
+    def _UpdateStatistics(cls, method: str):
+        """Updates the number of files copied per method.
+
+        Args:
+          method (str): copy method.
+        """
+        with cls._lock:
+            cls._statistics[method] += 1
+
+    @classmethod
+    def CopyFile(cls, source: str, destination: str) -> str:
+        """Copies a file.
+
+        Args:
+          source (str): path of the file to copy.
+          destination (str): path to copy the file to.
+
+        Returns:
+          str: copy method that was used.
+
+        Raises:
+          OSError: when the file cannot be copied.
+          shutil.SameFileError: when the source and destination are the same
+              file.
+        """
+        if os.path.exists(destination) and os.path.samefile(source, destination):
+            raise shutil.SameFileError(
+                "{0:s} and {1:s} are the same file".format(source, destination)
+            )
+
+        if (
+            cls._allow_hard_links
+            and not os.path.exists(destination)
+            and cls._CopyWithHardLink(source, destination)
+        ):
+            cls._UpdateStatistics(cls.METHOD_HARD_LINK)
+            return cls.METHOD_HARD_LINK
+
+        with open(source, "rb") as source_file:
+            source_descriptor = source_file.fileno()
+            size = os.fstat(source_descriptor).st_size
+
+            with open(destination, "wb") as destination_file:
+                destination_descriptor = destination_file.fileno()
+
+                method = cls.METHOD_BUFFERED
+                if cls._CopyWithReflink(source_descriptor, destination_descriptor):
+                    method = cls.METHOD_REFLINK
+                elif cls._CopyWithCopyFileRange(
+                    source_descriptor, destination_descriptor, size
+                ):
+                    method = cls.METHOD_COPY_FILE_RANGE
+                else:
+                    cls._ResetDestination(destination_descriptor)
+                    if cls._CopyWithSendfile(
+                        source_descriptor, destination_descriptor, size
+                    ):
+                        method = cls.METHOD_SENDFILE
+                    else:
+                        cls._ResetDestination(destination_descriptor)
+
+                if method == cls.METHOD_BUFFERED:
+                    source_file.seek(0, os.SEEK_SET)
+                    shutil.copyfileobj(source_file, destination_file, cls._BUFFER_SIZE)
+
+        cls._UpdateStatistics(method)
+        return method
+
+    @classmethod
+    def GetStatistics(cls) -> Dict[str, int]:
+        """Retrieves the number of files copied per copy method.
+
+        Returns:
+          dict[str, int]: number of files per copy method.
+        """
+        with cls._lock:
+            return dict(cls._statistics)
+
+    @classmethod
+    def IsIdentical(cls, source: str, destination: str) -> bool:
+        """Determines if a file has the same content as its copy.
+
+        The content is only compared when the sizes of the files are the same.
+
+        Args:
+          source (str): path of the file to copy.
+          destination (str): path of the copy.
+
+        Returns:
+          bool: True if the destination exists and has the same content as the
+              source.
+        """
+        try:
+            if os.path.getsize(source) != os.path.getsize(destination):
+                return False
+
+            with open(source, "rb") as source_file:
+                with open(destination, "rb") as destination_file:
+                    while True:
+                        source_data = source_file.read(cls._BUFFER_SIZE)
+                        if source_data != destination_file.read(cls._BUFFER_SIZE):
+                            return False
+                        if not source_data:
+                            return True
+
+        except OSError:
+            return False
+
+    @classmethod
+    def ResetStatistics(cls):
+        """Resets the number of files copied per copy method."""
+        with cls._lock:
+            cls._statistics = collections.Counter()
+
+    @classmethod
+    def SetAllowHardLinks(cls, allow_hard_links: bool):
+        """Sets whether files can be copied by hard linking them.
+
+        Args:
+          allow_hard_links (bool): True if files can be hard linked, changes to
+              a hard linked copy change the original file as well.
+        """
+        cls._allow_hard_links = allow_hard_links
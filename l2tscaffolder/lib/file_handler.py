@@ -1,44 +1,224 @@
 """The file handler."""
 
+import difflib
+import hashlib
+import io
+import logging
 import os
 import pathlib
 import shutil
 
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Union
+
 from l2tscaffolder.lib import errors
+from l2tscaffolder.lib import file_copier
+from l2tscaffolder.lib import transaction
 
 
 class FileHandler:
     """Handles the creation of files."""
 
-    def AddImportToInit(self, path: str, entry: str):
+    def __init__(self):
+        """Initializes the file handler."""
+        super().__init__()
+        self._transaction = None
+
+    def _AppendFile(self, path: str, content: Union[str, Iterable[str]]):
+        """Appends content to a file, the file is created if it does not exist.
+
+        Args:
+          path (str): path of the file.
+          content (str|Iterable[str]): content to append to the file, either as
+              a string or as chunks that are written as they are generated.
+        """
+        with open(self._GetWritablePath(path), "a", encoding="utf-8") as file_object:
+            if isinstance(content, str):
+                file_object.write(content)
+            else:
+                for chunk in content:
+                    file_object.write(chunk)
+
+    def _CopyFile(self, source: str, destination: str):
+        """Copies a file.
+
+        The file is not copied if the destination already has the same
+        content.
+
+        Args:
+          source (str): path of the file to copy.
+          destination (str): path to copy the file to.
+
+        Raises:
+          OSError: when the file cannot be copied.
+          shutil.SameFileError: when the source and destination are the same
+              file.
+        """
+        if os.path.abspath(source) == os.path.abspath(destination):
+            raise shutil.SameFileError(
+                "{0:s} and {1:s} are the same file".format(source, destination)
+            )
+
+        if file_copier.FileCopier.IsIdentical(
+            source, self._GetReadablePath(destination)
+        ):
+            logging.debug("Skipping copy of unchanged file: {0:s}".format(destination))
+            return
+
+        file_copier.FileCopier.CopyFile(
+            source, self._GetWritablePath(destination, keep_content=False)
+        )
+
+    def _GetReadablePath(self, path: str) -> str:
+        """Retrieves the path to read the current content of a file from.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          str: path of the staged file if the file is staged by the active
+              transaction, otherwise the path of the file.
+        """
+        if self._transaction:
+            return self._transaction.GetStagedPath(path) or path
+
+        return path
+
+    def _GetWritablePath(self, path: str, keep_content: bool = True) -> str:
+        """Retrieves the path to write the content of a file to.
+
+        Args:
+          path (str): path of the file.
+          keep_content (Optional[bool]): True if the current content of the
+              file should be kept.
+
+        Returns:
+          str: path of the staged file if a transaction is active, otherwise
+              the path of the file.
+        """
+        if self._transaction:
+            return self._transaction.StageFile(path, keep_content=keep_content)
+
+        _ = self.CreateFolderForFilePathIfNotExist(path)
+        return path
+
+    def _IsFile(self, path: str) -> bool:
+        """Determines if a file exists.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          bool: True if the file exists.
+        """
+        return os.path.isfile(self._GetReadablePath(path))
+
+    def _ReadFile(self, path: str) -> str:
+        """Reads the content of a file.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          str: content of the file.
+        """
+        with open(self._GetReadablePath(path), encoding="utf-8") as file_object:
+            return file_object.read()
+
+    def _TouchFile(self, path: str):
+        """Creates an empty file if the file does not exist.
+
+        Args:
+          path (str): path of the file.
+        """
+        pathlib.Path(self._GetWritablePath(path)).touch()
+
+    def _WriteFile(self, path: str, content: str):
+        """Writes content to a file, replacing its current content.
+
+        Args:
+          path (str): path of the file.
+          content (str): content to write to the file.
+        """
+        with open(self._GetWritablePath(path), "w", encoding="utf-8") as file_object:
+            file_object.write(content)
+
+    def AddImportToInit(self, path: str, entry: str) -> bool:
         """Adds an import into an init file in the correct order.
 
         Args:
           path (str): path to the __init__ file.
           entry (str): the import statement.
+
+        Returns:
+          bool: True if the init file was changed.
         """
-        if not os.path.isfile(path):
-            return
+        return self.AddImportsToInit(path, [entry])
 
-        with open(path, encoding="utf-8") as file_object:
-            lines = file_object.readlines()
+    def AddImportsToInit(self, path: str, entries: Iterable[str]) -> bool:
+        """Adds imports into an init file in the correct order.
 
-        line_index = 0
-        for index, line in enumerate(lines):
-            if not line.startswith("from "):
-                continue
-            if line > entry:
-                line_index = index
-                break
+        The init file is read and written once, regardless of the number of
+        imports. Each import is inserted before the first import that sorts
+        after it, or appended to the end of the file. Imports that are already
+        present in the init file are not added again.
+
+        Args:
+          path (str): path to the __init__ file.
+          entries (Iterable[str]): the import statements.
+
+        Returns:
+          bool: True if the init file was changed, False if the init file does
+              not exist or already contains all imports.
+        """
+        if not self._IsFile(path):
+            return False
+
+        lines = io.StringIO(self._ReadFile(path)).readlines()
+
+        existing_lines = set(lines)
+        entries = sorted(set(entries).difference(existing_lines))
+        if not entries:
+            return False
+
+        # Since the entries are sorted a single pass over the lines suffices to
+        # merge them into the imports.
+        merged_lines = []
+        entry_index = 0
+        for line in lines:
+            if line.startswith("from "):
+                while entry_index < len(entries) and line > entries[entry_index]:
+                    merged_lines.append(entries[entry_index])
+                    entry_index += 1
+
+            merged_lines.append(line)
+
+        merged_lines.extend(entries[entry_index:])
+
+        self._WriteFile(path, "".join(merged_lines))
+        return True
+
+    def CalculateDigest(self, path: str) -> str:
+        """Calculates the SHA-256 digest of the content of a file.
+
+        Args:
+          path (str): path of the file.
 
-        if line_index:
-            lines.insert(line_index, entry)
-        else:
-            lines.append(entry)
+        Returns:
+          str: hexadecimal SHA-256 digest or an empty string if the file does
+              not exist.
+        """
+        hasher = hashlib.sha256()
+        try:
+            with open(self._GetReadablePath(path), "rb") as file_object:
+                for data in iter(lambda: file_object.read(65536), b""):
+                    hasher.update(data)
+        except OSError:
+            return ""
 
-        with open(path, "w", encoding="utf-8") as file_object:
-            for line in lines:
-                file_object.write(line)
+        return hasher.hexdigest()
 
     @classmethod
     def CreateFilePath(cls, path: str, name: str, extension: str) -> str:
@@ -81,11 +261,7 @@ class FileHandler:
           str: path of the created file
         """
         file_path = self.CreateFilePath(directory_path, file_name, filename_extension)
-
-        if not os.path.exists(directory_path):
-            self._CreateFolder(directory_path)
-
-        pathlib.Path(file_path).touch()
+        self._TouchFile(file_path)
         return file_path
 
     def CreateFileFromPath(self, file_path: str) -> str:
@@ -97,8 +273,7 @@ class FileHandler:
         Returns:
           str: the path of the created file
         """
-        _ = self.CreateFolderForFilePathIfNotExist(file_path)
-        pathlib.Path(file_path).touch()
+        self._TouchFile(file_path)
         return file_path
 
     def CopyFile(self, source: str, destination: str) -> str:
@@ -114,52 +289,74 @@ class FileHandler:
         Raises:
           errors.FileHandlingError: when file copy operation fails.
         """
-        _ = self.CreateFolderForFilePathIfNotExist(destination)
         try:
-            shutil.copyfile(source, destination)
+            self._CopyFile(source, destination)
         except shutil.SameFileError as exception:
             raise errors.FileHandlingError(
                 (
                     "Unable to copy file source and dest are the same files. "
-                    "Original error message: {0:s}"
+                    "Original error message: {0!s}"
                 ).format(exception)
             )
         except OSError as exception:
             raise errors.FileHandlingError(
-                "Unable to copy file, error message: {0:s}".format(exception)
+                "Unable to copy file, error message: {0!s}".format(exception)
             )
 
         return destination
 
-    def CreateOrModifyFileWithContent(self, source: str, content: str):
+    def CreateOrModifyFileWithContent(
+        self, source: str, content: Union[str, Iterable[str]]
+    ):
         """Adds content to a file and create the file and path if non existing.
 
         Args:
           source (str): path of the file to edit.
-          content (str): content to append to the file.
+          content (str|Iterable[str]): content to append to the file.
 
         Returns:
           str: path of the edited file.
         """
-        _ = self.CreateFolderForFilePathIfNotExist(source)
         return self.AddContent(source, content)
 
-    def AddContent(self, source: str, content: str) -> str:
+    def AddContent(self, source: str, content: Union[str, Iterable[str]]) -> str:
         """Adds content to a file and create file if non existing.
 
         Args:
           source (str): path of the file to edit.
-          content (str): content to append to the file.
+          content (str|Iterable[str]): content to append to the file, either as
+              a string or as chunks that are written as they are generated.
 
         Returns:
           str: path of the edited file.
         """
-        _ = self.CreateFolderForFilePathIfNotExist(source)
-        with open(source, "a", encoding="utf-8") as file_object:
-            file_object.write(str(content))
+        self._AppendFile(source, content)
+        return source
 
+    def ReplaceContent(self, source: str, content: Union[str, Iterable[str]]) -> str:
+        """Replaces the content of a file and create file if non existing.
+
+        Args:
+          source (str): path of the file to edit.
+          content (str|Iterable[str]): new content of the file, either as
+              a string or as chunks that are written as they are generated.
+
+        Returns:
+          str: path of the edited file.
+        """
+        self._WriteFile(source, "")
+        self._AppendFile(source, content)
         return source
 
+    def SetTransaction(self, file_transaction: transaction.FileTransaction):
+        """Sets the transaction that stages all file changes.
+
+        Args:
+          file_transaction (transaction.FileTransaction): transaction or None
+              to change files directly.
+        """
+        self._transaction = file_transaction
+
     def CreateFolderForFilePathIfNotExist(self, file_path: str) -> str:
         """Creates folders for the given file if it does not exist.
 
@@ -173,3 +370,233 @@ class FileHandler:
         if not os.path.exists(directory_path):
             self._CreateFolder(directory_path)
         return directory_path
+
+
+class MemoryFileHandler(FileHandler):
+    """Handles the creation of files in memory.
+
+    Files are read from disk, but all changes are kept in memory, which allows
+    to preview the changes, for example in a dry run, and to write them to disk
+    at once.
+    """
+
+    def __init__(self):
+        """Initializes the memory file handler."""
+        super().__init__()
+        self._files = {}
+
+    def _AppendFile(self, path: str, content: Union[str, Iterable[str]]):
+        """Appends content to a file, the file is created if it does not exist.
+
+        Args:
+          path (str): path of the file.
+          content (str|Iterable[str]): content to append to the file, either as
+              a string or as chunks.
+        """
+        if not isinstance(content, str):
+            content = "".join(content)
+
+        current_content = ""
+        if self._IsFile(path):
+            current_content = self._ReadFile(path)
+
+        self._WriteFile(path, current_content + content)
+
+    def _CopyFile(self, source: str, destination: str):
+        """Copies a file.
+
+        Args:
+          source (str): path of the file to copy.
+          destination (str): path to copy the file to.
+
+        Raises:
+          OSError: when the file cannot be copied.
+          shutil.SameFileError: when the source and destination are the same
+              file.
+        """
+        if os.path.abspath(source) == os.path.abspath(destination):
+            raise shutil.SameFileError(
+                "{0:s} and {1:s} are the same file".format(source, destination)
+            )
+
+        self._files[os.path.abspath(destination)] = self._ReadData(source)
+
+    def _ReadData(self, path: str) -> bytes:
+        """Reads the data of a file.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          bytes: data of the file.
+        """
+        data = self._files.get(os.path.abspath(path), None)
+        if data is None:
+            with open(path, "rb") as file_object:
+                data = file_object.read()
+
+        return data
+
+    def _IsFile(self, path: str) -> bool:
+        """Determines if a file exists.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          bool: True if the file exists in memory or on disk.
+        """
+        return os.path.abspath(path) in self._files or os.path.isfile(path)
+
+    def _ReadFile(self, path: str) -> str:
+        """Reads the content of a file.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          str: content of the file.
+        """
+        return self._ReadData(path).decode("utf-8")
+
+    def _TouchFile(self, path: str):
+        """Creates an empty file if the file does not exist.
+
+        Args:
+          path (str): path of the file.
+        """
+        if not self._IsFile(path):
+            self._files[os.path.abspath(path)] = b""
+
+    def _WriteFile(self, path: str, content: str):
+        """Writes content to a file, replacing its current content.
+
+        Args:
+          path (str): path of the file.
+          content (str): content to write to the file.
+        """
+        self._files[os.path.abspath(path)] = content.encode("utf-8")
+
+    def CalculateDigest(self, path: str) -> str:
+        """Calculates the SHA-256 digest of the content of a file.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          str: hexadecimal SHA-256 digest or an empty string if the file does
+              not exist.
+        """
+        try:
+            data = self._ReadData(path)
+        except OSError:
+            return ""
+
+        return hashlib.sha256(data).hexdigest()
+
+    def GetDiff(self, root_path: str = "") -> str:
+        """Retrieves the changes to the files as a unified diff.
+
+        Args:
+          root_path (Optional[str]): path that the file names in the diff are
+              relative to.
+
+        Returns:
+          str: unified diff of the changed files against the files on disk.
+        """
+        diff_lines = []
+        for path in self.GetFilePaths():
+            file_name = path
+            if root_path:
+                file_name = os.path.relpath(path, root_path)
+
+            original_data = b""
+            if os.path.isfile(path):
+                with open(path, "rb") as file_object:
+                    original_data = file_object.read()
+
+            data = self._files[path]
+            if data == original_data:
+                continue
+
+            try:
+                original_lines = original_data.decode("utf-8").splitlines(keepends=True)
+                lines = data.decode("utf-8").splitlines(keepends=True)
+            except UnicodeDecodeError:
+                diff_lines.append(
+                    "Binary files a/{0:s} and b/{0:s} differ\n".format(file_name)
+                )
+                continue
+
+            for diff_line in difflib.unified_diff(
+                original_lines,
+                lines,
+                fromfile="a/{0:s}".format(file_name),
+                tofile="b/{0:s}".format(file_name),
+            ):
+                if not diff_line.endswith("\n"):
+                    diff_line = "{0:s}\n\\ No newline at end of file\n".format(
+                        diff_line
+                    )
+                diff_lines.append(diff_line)
+
+        return "".join(diff_lines)
+
+    def GetFileData(self, path: str) -> Optional[bytes]:
+        """Retrieves the data of a file that was changed.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          bytes: data of the file or None if the file was not changed.
+        """
+        return self._files.get(os.path.abspath(path), None)
+
+    def GetFilePaths(self) -> List[str]:
+        """Retrieves the paths of the files that were changed.
+
+        Returns:
+          list[str]: absolute paths of the changed files, in sorted order.
+        """
+        return sorted(self._files)
+
+    def SetTransaction(self, file_transaction: transaction.FileTransaction):
+        """Sets the transaction that stages all file changes.
+
+        Transactions are ignored, since files are only changed in memory.
+
+        Args:
+          file_transaction (transaction.FileTransaction): transaction or None.
+        """
+
+    def WriteToDisk(self, root_path: str) -> List[str]:
+        """Writes the changed files to disk, in a single transaction.
+
+        Args:
+          root_path (str): path of the project root, which is used to stage
+              the files.
+
+        Returns:
+          list[str]: paths of the files that were written.
+
+        Raises:
+          errors.FileHandlingError: when the files cannot be written.
+        """
+        file_transaction = transaction.FileTransaction(root_path)
+        try:
+            for path, data in sorted(self._files.items()):
+                staged_path = file_transaction.StageFile(path, keep_content=False)
+                with open(staged_path, "wb") as file_object:
+                    file_object.write(data)
+
+            file_paths = file_transaction.Commit()
+
+        except OSError as exception:
+            file_transaction.Rollback()
+            raise errors.FileHandlingError(
+                "Unable to write files with error: {0!s}".format(exception)
+            )
+
+        self._files = {}
+        return file_paths
@@ -0,0 +1,294 @@
+"""Content-addressed cache of code formatting results."""
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from typing import Optional
+from typing import Tuple
+
+
+class FormatCache:
+    """Caches the results of formatting code.
+
+    Formatting the same source code with the same style always produces the
+    same result, hence results are stored by the SHA-256 digest of the source
+    code, the style and the formatter version. Results are kept in a bounded
+    in-memory least recently used (LRU) cache and optionally persisted in
+    a size-bounded directory on disk.
+    """
+
+    # Maximum number of formatting results to keep in memory.
+    MAXIMUM_NUMBER_OF_ENTRIES = 256
+
+    # Maximum size in bytes of the on-disk cache.
+    MAXIMUM_CACHE_SIZE = 64 * 1024 * 1024
+
+    _CACHE_FILE_SUFFIX = ".json"
+
+    _cache_path = ""
+
+    # Estimated size in bytes of the on-disk cache, which is None until the
+    # cache directory has been scanned.
+    _cache_size = None
+
+    _entries = collections.OrderedDict()
+    _lock = threading.Lock()
+
+    _hits = 0
+    _misses = 0
+
+    @classmethod
+    def _EvictCacheFiles(cls):
+        """Removes the least recently used cache files when the cache is too big.
+
+        The cache directory is scanned to determine the size of the cache. When
+        the cache is too big, cache files are removed until the cache is three
+        quarters of its maximum size, so that the directory is not scanned
+        again for every file written afterwards.
+        """
+        cache_files = []
+        cache_size = 0
+        for directory_entry in os.scandir(cls._cache_path):
+            if not directory_entry.name.endswith(cls._CACHE_FILE_SUFFIX):
+                continue
+
+            try:
+                stat_object = directory_entry.stat()
+            except OSError:
+                continue
+
+            cache_files.append(
+                (stat_object.st_mtime, stat_object.st_size, directory_entry.path)
+            )
+            cache_size += stat_object.st_size
+
+        if cache_size > cls.MAXIMUM_CACHE_SIZE:
+            maximum_cache_size = (cls.MAXIMUM_CACHE_SIZE * 3) // 4
+
+            cache_files.sort()
+            for _, file_size, file_path in cache_files:
+                if cache_size <= maximum_cache_size:
+                    break
+
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    continue
+                cache_size -= file_size
+
+        with cls._lock:
+            cls._cache_size = cache_size
+
+    @classmethod
+    def _GetCacheFilePath(cls, digest: str) -> str:
+        """Retrieves the path of the cache file of a digest.
+
+        Args:
+          digest (str): digest of the formatting inputs.
+
+        Returns:
+          str: path of the cache file.
+        """
+        file_name = "{0:s}{1:s}".format(digest, cls._CACHE_FILE_SUFFIX)
+        return os.path.join(cls._cache_path, file_name)
+
+    @classmethod
+    def _ReadCacheFile(cls, digest: str) -> Optional[Tuple[str, bool]]:
+        """Reads a formatting result from the on-disk cache.
+
+        Args:
+          digest (str): digest of the formatting inputs.
+
+        Returns:
+          tuple[str, bool]: formatted code and whether the code was changed by
+              formatting or None if not cached.
+        """
+        cache_file_path = cls._GetCacheFilePath(digest)
+        try:
+            with open(cache_file_path, encoding="utf-8") as file_object:
+                json_dict = json.load(file_object)
+
+            # Update the modification time to keep track of least recent use.
+            os.utime(cache_file_path)
+
+        except (OSError, ValueError):
+            return None
+
+        return json_dict.get("formatted", ""), json_dict.get("changed", False)
+
+    @classmethod
+    def _StoreEntry(cls, digest: str, result: Tuple[str, bool]):
+        """Stores a formatting result in memory.
+
+        This function should only be called while holding the lock.
+
+        Args:
+          digest (str): digest of the formatting inputs.
+          result (tuple[str, bool]): formatted code and whether the code was
+              changed by formatting.
+        """
+        cls._entries[digest] = result
+        cls._entries.move_to_end(digest)
+        while len(cls._entries) > cls.MAXIMUM_NUMBER_OF_ENTRIES:
+            cls._entries.popitem(last=False)
+
+    @classmethod
+    def _WriteCacheFile(cls, digest: str, result: Tuple[str, bool]):
+        """Writes a formatting result to the on-disk cache.
+
+        The cache file is written to a temporary file first and then renamed,
+        so that concurrent runs never read a partially written cache file.
+
+        Args:
+          digest (str): digest of the formatting inputs.
+          result (tuple[str, bool]): formatted code and whether the code was
+              changed by formatting.
+        """
+        formatted, changed = result
+        json_data = json.dumps({"formatted": formatted, "changed": changed}).encode(
+            "utf-8"
+        )
+
+        try:
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=cls._cache_path, suffix=".tmp"
+            )
+            with os.fdopen(file_descriptor, "wb") as file_object:
+                file_object.write(json_data)
+
+            os.replace(temporary_path, cls._GetCacheFilePath(digest))
+
+            # The size of the cache is tracked in memory, hence the cache
+            # directory only needs to be scanned on the first write and when
+            # the cache has grown too big.
+            with cls._lock:
+                if cls._cache_size is None:
+                    evict_cache_files = True
+                else:
+                    cls._cache_size += len(json_data)
+                    evict_cache_files = cls._cache_size > cls.MAXIMUM_CACHE_SIZE
+
+            if evict_cache_files:
+                cls._EvictCacheFiles()
+
+        except OSError as exception:
+            logging.warning(
+                "Unable to write format cache file with error: {0!s}".format(exception)
+            )
+
+    @classmethod
+    def CalculateDigest(cls, code: str, style_data: bytes, version: str) -> str:
+        """Calculates the digest of formatting inputs.
+
+        Args:
+          code (str): code to format.
+          style_data (bytes): contents of the style file.
+          version (str): version of the formatter.
+
+        Returns:
+          str: hexadecimal SHA-256 digest of the formatting inputs.
+        """
+        hasher = hashlib.sha256()
+        for data in (code.encode("utf-8"), style_data, version.encode("utf-8")):
+            # The length prefix prevents different inputs from producing the
+            # same concatenation.
+            hasher.update("{0:d}:".format(len(data)).encode("ascii"))
+            hasher.update(data)
+
+        return hasher.hexdigest()
+
+    @classmethod
+    def Clear(cls):
+        """Clears the in-memory cache and statistics."""
+        with cls._lock:
+            cls._entries = collections.OrderedDict()
+            cls._hits = 0
+            cls._misses = 0
+
+    @classmethod
+    def GetCachePath(cls) -> str:
+        """Retrieves the path of the on-disk cache directory.
+
+        Returns:
+          str: path of the cache directory or an empty string when results are
+              only cached in memory.
+        """
+        return cls._cache_path
+
+    @classmethod
+    def GetResult(cls, digest: str) -> Optional[Tuple[str, bool]]:
+        """Retrieves a cached formatting result.
+
+        Args:
+          digest (str): digest of the formatting inputs.
+
+        Returns:
+          tuple[str, bool]: formatted code and whether the code was changed by
+              formatting or None if not cached.
+        """
+        with cls._lock:
+            result = cls._entries.get(digest, None)
+            if result:
+                cls._entries.move_to_end(digest)
+                cls._hits += 1
+                return result
+
+        if cls._cache_path:
+            result = cls._ReadCacheFile(digest)
+
+        with cls._lock:
+            if not result:
+                cls._misses += 1
+                return None
+
+            cls._hits += 1
+            cls._StoreEntry(digest, result)
+
+        return result
+
+    @classmethod
+    def GetStatistics(cls) -> Tuple[int, int]:
+        """Retrieves the cache statistics.
+
+        Returns:
+          tuple[int, int]: number of cache hits and misses.
+        """
+        with cls._lock:
+            return cls._hits, cls._misses
+
+    @classmethod
+    def SetCachePath(cls, path: str):
+        """Sets the path of the on-disk cache directory.
+
+        The directory is created if it does not exist.
+
+        Args:
+          path (str): path of the cache directory or an empty string to only
+              cache results in memory.
+        """
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+        with cls._lock:
+            cls._cache_path = path
+            cls._cache_size = None
+
+    @classmethod
+    def StoreResult(cls, digest: str, result: Tuple[str, bool]):
+        """Stores a formatting result.
+
+        Args:
+          digest (str): digest of the formatting inputs.
+          result (tuple[str, bool]): formatted code and whether the code was
+              changed by formatting.
+        """
+        with cls._lock:
+            cls._StoreEntry(digest, result)
+
+        if cls._cache_path:
+            cls._WriteCacheFile(digest, result)
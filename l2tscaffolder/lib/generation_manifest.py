@@ -0,0 +1,117 @@
+"""Manifest of generated modules, used to skip regenerating unchanged modules."""
+
+import json
+import logging
+import os
+
+from typing import Dict
+from typing import Tuple
+
+from l2tscaffolder.lib import file_handler
+
+
+class GenerationManifest:
+    """Records the inputs and outputs of generated modules.
+
+    The manifest is stored as a JSON file in the project root. Per module it
+    records the digest of the inputs the module was generated from and the
+    SHA-256 digest of every file that was written, by path relative to the
+    project root.
+    """
+
+    FILENAME = ".l2tscaffolder-manifest.json"
+
+    _FORMAT_VERSION = 1
+
+    def __init__(self, root_path: str):
+        """Initializes a generation manifest.
+
+        Args:
+          root_path (str): path of the project root.
+        """
+        super().__init__()
+        self._modules = {}
+        self._root_path = root_path
+        self.path = os.path.join(root_path, self.FILENAME)
+
+    def GetModule(self, module_key: str) -> Tuple[str, Dict[str, str]]:
+        """Retrieves the recorded inputs and outputs of a module.
+
+        Args:
+          module_key (str): key that identifies the module.
+
+        Returns:
+          tuple[str, dict[str, str]]: digest of the inputs and digests of the
+              written files per full path, or an empty string and an empty dict
+              if the module was not recorded.
+        """
+        module = self._modules.get(module_key, None)
+        if not module:
+            return "", {}
+
+        file_digests = {
+            os.path.join(self._root_path, relative_path): digest
+            for relative_path, digest in module["files"].items()
+        }
+        return module["input_digest"], file_digests
+
+    def Read(self):
+        """Reads the manifest from the project root.
+
+        A missing or invalid manifest is treated as an empty manifest, which
+        means all modules are generated.
+        """
+        self._modules = {}
+        try:
+            with open(self.path, encoding="utf-8") as file_object:
+                manifest = json.load(file_object)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exception:
+            logging.warning(
+                "Unable to read manifest: {0:s} with error: {1!s}".format(
+                    self.path, exception
+                )
+            )
+            return
+
+        if not isinstance(manifest, dict):
+            return
+
+        if manifest.get("version", None) != self._FORMAT_VERSION:
+            return
+
+        modules = manifest.get("modules", None)
+        if isinstance(modules, dict):
+            self._modules = modules
+
+    def SetModule(
+        self, module_key: str, input_digest: str, file_digests: Dict[str, str]
+    ):
+        """Records the inputs and outputs of a module.
+
+        Args:
+          module_key (str): key that identifies the module.
+          input_digest (str): digest of the inputs of the module.
+          file_digests (dict[str, str]): digests of the written files per full
+              path.
+        """
+        files = {
+            os.path.relpath(file_path, self._root_path): digest
+            for file_path, digest in file_digests.items()
+        }
+        self._modules[module_key] = {"files": files, "input_digest": input_digest}
+
+    def Write(self, handler: file_handler.FileHandler) -> str:
+        """Writes the manifest to the project root.
+
+        Args:
+          handler (file_handler.FileHandler): file handler used to write the
+              manifest, which allows the manifest to be part of a transaction.
+
+        Returns:
+          str: path of the manifest.
+        """
+        manifest = {"modules": self._modules, "version": self._FORMAT_VERSION}
+        content = json.dumps(manifest, indent=2, sort_keys=True)
+        return handler.ReplaceContent(self.path, "{0:s}\n".format(content))
@@ -1,9 +1,19 @@
 """Helper methods for mapping."""
 
+import hashlib
+import json
 import os
-import jinja2
+
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Union
+
+import l2tscaffolder
 
 from l2tscaffolder.lib import code_formatter
+from l2tscaffolder.lib import post_processor
+from l2tscaffolder.lib import template_cache
 
 
 class MappingHelper:
@@ -12,7 +22,15 @@ class MappingHelper:
     _DEFAULT_PATH_FORMATTER = ".style.yapf"
     _DEFAULT_PATH_TEMPLATE = "templates"
 
-    def __init__(self, template_path: str = "", formatter_path: str = ""):
+    # The escape error spans the end of a line and the start of the next line.
+    _ESCAPE_ERROR = "\\'\n        u'\\"
+
+    def __init__(
+        self,
+        template_path: str = "",
+        formatter_path: str = "",
+        formatter_name: str = "",
+    ):
         """Initializes the mapping helper class.
 
         Args:
@@ -22,6 +40,8 @@ class MappingHelper:
             formatter_path (Optional[str]):  file path of the formatter, relative
                 to the path to the tool. If none provided will use the default
                 path.
+            formatter_name (Optional[str]): name of the formatter backend. If
+                none provided will use the default formatter backend.
         """
         super().__init__()
         # TODO: Improve this, this is flaky.
@@ -36,14 +56,18 @@ class MappingHelper:
 
         full_template_path = os.path.join(self._tool_path, template_path)
         self._template_path = full_template_path
-        template_loader = jinja2.FileSystemLoader(self._template_path)
-        # TODO: Check if autoescape can be set to True due to potential XSS issues.
-        self._template_environment = jinja2.Environment(
-            autoescape=False, loader=template_loader, trim_blocks=False
-        )
 
         full_formatter_path = os.path.join(self._tool_path, formatter_path)
-        self.formatter = code_formatter.CodeFormatter(full_formatter_path)
+        formatter_class = code_formatter.FormatterManager.GetFormatterByName(
+            formatter_name
+        )
+        self.formatter = formatter_class(full_formatter_path)
+
+        self._yapf_comment_remover = post_processor.YapfCommentRemover()
+        self._whitespace_remover = post_processor.TrailingWhitespaceRemover()
+        self._post_processing_pipeline = post_processor.PostProcessingPipeline(
+            [self._yapf_comment_remover, self._whitespace_remover]
+        )
 
     def _RemoveWhitespaceAtEndOfLine(self, template: str) -> str:
         """Removes blanks at the end of lines.
@@ -56,9 +80,7 @@ class MappingHelper:
         Returns:
           str: template without end-of-line whitespace.
         """
-        while template.find("  \n") != -1:
-            template = template.replace("  \n", "\n")
-        return template
+        return self._whitespace_remover.ProcessText(template)
 
     def _RemoveEscapeError(self, template: str) -> str:
         """Removes the escape error.
@@ -76,7 +98,7 @@ class MappingHelper:
         Returns:
           str: the template without escape (eol) errors
         """
-        to_be_replaced = "\\'\n        u'\\"
+        to_be_replaced = self._ESCAPE_ERROR
         to_be_replaced_with = "'\n        u'\\\\"
 
         return template.replace(to_be_replaced, to_be_replaced_with)
@@ -93,7 +115,43 @@ class MappingHelper:
         Returns:
           str: template with yapf comments removed.
         """
-        return template.replace("# yapf: disable\n", "").replace("# yapf: enable\n", "")
+        return self._yapf_comment_remover.ProcessText(template)
+
+    def CalculateInputDigest(self, template_filenames: List[str], context: dict) -> str:
+        """Calculates a digest of everything that determines the rendered templates.
+
+        The digest covers the version of the tool, the formatter configuration,
+        the post-processing stages, the context and the contents of the
+        templates. The templates are not rendered.
+
+        Args:
+          template_filenames (list[str]): the names of the templates.
+          context (dict): the context of the templates as a dictionary.
+
+        Returns:
+          str: hexadecimal SHA-256 digest of the inputs.
+        """
+        inputs = [
+            l2tscaffolder.__version__.encode("utf-8"),
+            self.formatter.GetFingerprint().encode("utf-8"),
+            json.dumps(context, default=str, sort_keys=True).encode("utf-8"),
+        ]
+        for stage_name in self._post_processing_pipeline.GetStageNames():
+            inputs.append(stage_name.encode("utf-8"))
+
+        for template_filename in template_filenames:
+            template_path = os.path.join(self._template_path, template_filename)
+            with open(template_path, "rb") as file_object:
+                inputs.extend([template_filename.encode("utf-8"), file_object.read()])
+
+        hasher = hashlib.sha256()
+        for data in inputs:
+            # The length prefix prevents different inputs from producing the
+            # same concatenation.
+            hasher.update("{0:d}:".format(len(data)).encode("ascii"))
+            hasher.update(data)
+
+        return hasher.hexdigest()
 
     def GenerateClassName(self, scaffolder_name: str) -> str:
         """Generates a class name from the scaffolder name for file generation.
@@ -106,6 +164,87 @@ class MappingHelper:
         """
         return scaffolder_name.replace("_", " ").title().replace(" ", "")
 
+    def _PostProcess(self, formatted: str) -> str:
+        """Post-processes formatted code.
+
+        All post-processing stages are applied in a single pass over the lines
+        of the formatted code.
+
+        Args:
+          formatted (str): the formatted code.
+
+        Returns:
+          str: the post-processed code.
+        """
+        return self._post_processing_pipeline.ProcessText(formatted)
+
+    def _PostProcessChunks(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Removes escape errors from and post-processes rendered chunks.
+
+        Chunks are buffered up to a line boundary, so that memory use does not
+        depend on the size of the rendered template.
+
+        Args:
+          chunks (Iterable[str]): chunks of the rendered template.
+
+        Yields:
+          str: post-processed chunks of complete lines, the last chunk can be
+              an incomplete line.
+        """
+        # Number of characters of the escape error that follow the line feed.
+        escape_error_tail_size = len(self._ESCAPE_ERROR) - 3
+
+        buffer = ""
+        for chunk in chunks:
+            buffer = "".join([buffer, chunk])
+
+            # Split at the last line feed that has enough characters after it
+            # to determine it is not part of an escape error. The end offset is
+            # clamped since rfind() interprets a negative offset relative to
+            # the end of the buffer.
+            split_offset = buffer.rfind(
+                "\n", 0, max(0, len(buffer) - escape_error_tail_size)
+            )
+            while split_offset >= 2 and buffer.startswith(
+                self._ESCAPE_ERROR, split_offset - 2
+            ):
+                split_offset = buffer.rfind("\n", 0, split_offset)
+
+            if split_offset == -1:
+                continue
+
+            lines = self._RemoveEscapeError(buffer[: split_offset + 1])
+            buffer = buffer[split_offset + 1 :]
+            yield self._PostProcess(lines)
+
+        if buffer:
+            yield self._PostProcess(self._RemoveEscapeError(buffer))
+
+    def _Render(self, template_filename: str, context: dict) -> str:
+        """Renders the template with the context without formatting it.
+
+        Args:
+          template_filename (str): the name of the template
+          context (dict): the context of the template as a dictionary
+
+        Returns:
+          str: the rendered template as a string
+        """
+        template = template_cache.TemplateCache.GetTemplate(
+            self._template_path, template_filename
+        ).render(context)
+        return self._RemoveEscapeError(template)
+
+    def RegisterPostProcessor(self, stage: post_processor.BasePostProcessor):
+        """Registers an additional post-processing stage.
+
+        The stage is applied to the formatted code after the default stages.
+
+        Args:
+          stage (post_processor.BasePostProcessor): post-processing stage.
+        """
+        self._post_processing_pipeline.AddStage(stage)
+
     def RenderTemplate(self, template_filename: str, context: dict) -> str:
         """Renders the template with the context to return a string.
 
@@ -116,13 +255,62 @@ class MappingHelper:
         Returns:
           str: the rendered template as a string
         """
-        template = self._template_environment.get_template(template_filename).render(
-            context
-        )
-        template = self._RemoveEscapeError(template)
-
+        template = self._Render(template_filename, context)
         formatted = self.formatter.Format(template)[0]
-        formatted = self._RemoveYapfComment(formatted)
-        formatted = self._RemoveWhitespaceAtEndOfLine(formatted)
+        return self._PostProcess(formatted)
+
+    def RenderTemplates(
+        self, template_filenames: List[str], context: dict
+    ) -> List[str]:
+        """Renders multiple templates with the same context.
+
+        The rendered templates are formatted as a batch, which allows the
+        formatter to format them in parallel.
+
+        Args:
+          template_filenames (list[str]): the names of the templates.
+          context (dict): the context of the templates as a dictionary.
+
+        Returns:
+          list[str]: the rendered templates, in the same order as the names of
+              the templates.
+        """
+        templates = [
+            self._Render(template_filename, context)
+            for template_filename in template_filenames
+        ]
+        return [
+            self._PostProcess(formatted)
+            for formatted, _ in self.formatter.FormatMany(templates)
+        ]
+
+    def StreamTemplates(
+        self, template_filenames: List[str], context: dict
+    ) -> List[Union[str, Iterator[str]]]:
+        """Renders multiple templates, streaming them when possible.
+
+        When the formatter leaves code unchanged, for example when formatting
+        is disabled or deferred, the templates are not materialized as strings
+        but are generated chunk by chunk while being consumed. Otherwise the
+        templates are rendered and formatted as a batch.
+
+        Args:
+          template_filenames (list[str]): the names of the templates.
+          context (dict): the context of the templates as a dictionary.
+
+        Returns:
+          list[str|Iterator[str]]: the rendered templates, either as strings or
+              as iterators of chunks, in the same order as the names of the
+              templates.
+        """
+        if not self.formatter.SUPPORTS_STREAMING:
+            return self.RenderTemplates(template_filenames, context)
+
+        streams = []
+        for template_filename in template_filenames:
+            template = template_cache.TemplateCache.GetTemplate(
+                self._template_path, template_filename
+            )
+            streams.append(self._PostProcessChunks(template.generate(context)))
 
-        return formatted
+        return streams
@@ -0,0 +1,195 @@
+"""Post-processors for formatted code."""
+
+from typing import Iterator
+from typing import List
+
+
+def _SplitLines(text: str) -> Iterator[str]:
+    """Splits a text into lines, keeping the end-of-line characters.
+
+    Only line feeds are considered end-of-line characters, unlike
+    str.splitlines().
+
+    Args:
+      text (str): text to split.
+
+    Yields:
+      str: a line of the text.
+    """
+    line_start = 0
+    line_end = text.find("\n")
+    while line_end != -1:
+        yield text[line_start : line_end + 1]
+        line_start = line_end + 1
+        line_end = text.find("\n", line_start)
+
+    if line_start < len(text):
+        yield text[line_start:]
+
+
+class BasePostProcessor:
+    """Interface of a line-oriented post-processing stage."""
+
+    def ProcessLine(self, line: str) -> str:
+        """Processes a single line.
+
+        Args:
+          line (str): line to process, including its end-of-line character,
+              which is missing for the last line if the text does not end with
+              an end-of-line character.
+
+        Returns:
+          str: the processed line. An empty string removes the line, and a line
+              without an end-of-line character is joined with the next line.
+        """
+        raise NotImplementedError
+
+    def ProcessLines(self, lines: Iterator[str]) -> Iterator[str]:
+        """Processes lines.
+
+        A processed line without an end-of-line character is joined with the
+        next processed line, hence every line that is yielded, except for the
+        last, is a complete line.
+
+        Args:
+          lines (Iterator[str]): lines to process, including their end-of-line
+              characters.
+
+        Yields:
+          str: a processed line.
+        """
+        partial_line = ""
+        for line in lines:
+            processed_line = self.ProcessLine(line)
+            if processed_line.endswith("\n"):
+                yield partial_line + processed_line
+                partial_line = ""
+            else:
+                partial_line += processed_line
+
+        if partial_line:
+            yield partial_line
+
+    def ProcessText(self, text: str) -> str:
+        """Processes a text in a single pass over its lines.
+
+        Args:
+          text (str): text to process.
+
+        Returns:
+          str: the processed text.
+        """
+        return "".join(self.ProcessLines(_SplitLines(text)))
+
+
+class PostProcessingPipeline(BasePostProcessor):
+    """Applies multiple post-processing stages in a single pass."""
+
+    def __init__(self, stages: List[BasePostProcessor] = None):
+        """Initializes the post-processing pipeline.
+
+        Args:
+          stages (Optional[list[BasePostProcessor]]): post-processing stages,
+              applied to each line in order.
+        """
+        super().__init__()
+        self._stages = list(stages or [])
+
+    def AddStage(self, stage: BasePostProcessor):
+        """Adds a post-processing stage to the end of the pipeline.
+
+        Args:
+          stage (BasePostProcessor): post-processing stage.
+        """
+        self._stages.append(stage)
+
+    def GetStageNames(self) -> List[str]:
+        """Retrieves the names of the post-processing stages.
+
+        Returns:
+          list[str]: class names of the stages, in the order they are applied.
+        """
+        return [stage.__class__.__name__ for stage in self._stages]
+
+    def ProcessLine(self, line: str) -> str:
+        """Processes a single line with all stages.
+
+        Args:
+          line (str): line to process.
+
+        Returns:
+          str: the processed line.
+        """
+        for stage in self._stages:
+            if not line:
+                break
+            line = stage.ProcessLine(line)
+
+        return line
+
+    def ProcessLines(self, lines: Iterator[str]) -> Iterator[str]:
+        """Processes lines with all stages.
+
+        The stages are chained, each stage processes the lines as re-joined by
+        the previous stage, so that a line that was joined with the next line
+        is processed as a whole by the following stages.
+
+        Args:
+          lines (Iterator[str]): lines to process, including their end-of-line
+              characters.
+
+        Returns:
+          Iterator[str]: processed lines.
+        """
+        for stage in self._stages:
+            lines = stage.ProcessLines(lines)
+
+        return lines
+
+
+class TrailingWhitespaceRemover(BasePostProcessor):
+    """Removes pairs of blanks at the end of lines.
+
+    This is for those parts that are ignored with yapf.
+    """
+
+    def ProcessLine(self, line: str) -> str:
+        """Removes pairs of blanks at the end of a line.
+
+        Args:
+          line (str): line to process.
+
+        Returns:
+          str: the line without pairs of blanks before the end-of-line.
+        """
+        if not line.endswith("  \n"):
+            return line
+
+        stripped_line = line[:-1].rstrip(" ")
+        number_of_blanks = len(line) - 1 - len(stripped_line)
+        return "{0:s}{1:s}\n".format(stripped_line, " " * (number_of_blanks % 2))
+
+
+class YapfCommentRemover(BasePostProcessor):
+    """Removes yapf enable and disable comments.
+
+    The comment as well as the new line will be removed. The yapf comment has
+    to be at the end of the line, or on its own line.
+    """
+
+    _YAPF_COMMENTS = ("# yapf: disable\n", "# yapf: enable\n")
+
+    def ProcessLine(self, line: str) -> str:
+        """Removes a yapf comment from a line.
+
+        Args:
+          line (str): line to process.
+
+        Returns:
+          str: the line without the yapf comment.
+        """
+        for yapf_comment in self._YAPF_COMMENTS:
+            if line.endswith(yapf_comment):
+                return line[: -len(yapf_comment)]
+
+        return line
@@ -0,0 +1,177 @@
+"""Process-wide cache of Jinja2 environments and compiled templates."""
+
+import collections
+import os
+import threading
+
+from typing import TYPE_CHECKING
+from typing import Tuple
+
+import l2tscaffolder
+
+# Jinja2 is imported when the first environment is created, since importing
+# it takes a significant part of the start-up time of the tool.
+if TYPE_CHECKING:
+    import jinja2
+
+
+class TemplateCache:
+    """Shares Jinja2 environments and compiled templates between scaffolders.
+
+    Environments are kept per template directory and compiled templates are
+    kept in a bounded least recently used (LRU) cache, so that each template is
+    only compiled once per process, regardless of how many mapping helpers are
+    created.
+    """
+
+    # Maximum number of compiled templates to keep in the cache.
+    MAXIMUM_NUMBER_OF_TEMPLATES = 128
+
+    # Filename pattern of the bytecode cache files, the version of the tool is
+    # part of the filename so that an upgrade never picks up stale bytecode.
+    _BYTECODE_CACHE_PATTERN = "__l2tscaffolder_{0:s}_%s.cache".format(
+        l2tscaffolder.__version__
+    )
+
+    _bytecode_cache_path = ""
+    _environments = {}
+    _lock = threading.Lock()
+    _templates = collections.OrderedDict()
+
+    _hits = 0
+    _misses = 0
+
+    @classmethod
+    def _CreateEnvironment(cls, template_path: str) -> "jinja2.Environment":
+        """Creates a Jinja2 environment.
+
+        Args:
+          template_path (str): path to the templates directory.
+
+        Returns:
+          jinja2.Environment: the Jinja2 environment.
+        """
+        import jinja2  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        bytecode_cache = None
+        if cls._bytecode_cache_path:
+            # The bytecode cache stores a checksum of the template source with the
+            # bytecode, a template that changed on disk is therefore recompiled.
+            bytecode_cache = jinja2.FileSystemBytecodeCache(
+                directory=cls._bytecode_cache_path,
+                pattern=cls._BYTECODE_CACHE_PATTERN,
+            )
+
+        template_loader = jinja2.FileSystemLoader(template_path)
+        # The cache of the environment is disabled since compiled templates
+        # are cached by the template cache itself.
+        # TODO: Check if autoescape can be set to True due to potential XSS issues.
+        return jinja2.Environment(
+            autoescape=False,
+            bytecode_cache=bytecode_cache,
+            cache_size=0,
+            loader=template_loader,
+            trim_blocks=False,
+        )
+
+    @classmethod
+    def Clear(cls):
+        """Clears the cached environments, templates and statistics."""
+        with cls._lock:
+            cls._environments = {}
+            cls._templates = collections.OrderedDict()
+            cls._hits = 0
+            cls._misses = 0
+
+    @classmethod
+    def GetBytecodeCachePath(cls) -> str:
+        """Retrieves the path of the bytecode cache directory.
+
+        Returns:
+          str: path of the bytecode cache directory or an empty string when
+              the bytecode cache is disabled.
+        """
+        return cls._bytecode_cache_path
+
+    @classmethod
+    def GetEnvironment(cls, template_path: str) -> "jinja2.Environment":
+        """Retrieves the shared Jinja2 environment of a template directory.
+
+        Args:
+          template_path (str): path to the templates directory.
+
+        Returns:
+          jinja2.Environment: the Jinja2 environment.
+        """
+        with cls._lock:
+            environment = cls._environments.get(template_path, None)
+            if not environment:
+                environment = cls._CreateEnvironment(template_path)
+                cls._environments[template_path] = environment
+
+        return environment
+
+    @classmethod
+    def GetStatistics(cls) -> Tuple[int, int]:
+        """Retrieves the cache statistics.
+
+        Returns:
+          tuple[int, int]: number of cache hits and misses.
+        """
+        with cls._lock:
+            return cls._hits, cls._misses
+
+    @classmethod
+    def GetTemplate(
+        cls, template_path: str, template_filename: str
+    ) -> "jinja2.Template":
+        """Retrieves a compiled template.
+
+        Args:
+          template_path (str): path to the templates directory.
+          template_filename (str): name of the template.
+
+        Returns:
+          jinja2.Template: the compiled template.
+        """
+        lookup_key = (template_path, template_filename)
+
+        with cls._lock:
+            template = cls._templates.get(lookup_key, None)
+            if template:
+                cls._hits += 1
+                cls._templates.move_to_end(lookup_key)
+                return template
+
+            cls._misses += 1
+
+        environment = cls.GetEnvironment(template_path)
+        template = environment.get_template(template_filename)
+
+        with cls._lock:
+            cls._templates[lookup_key] = template
+            cls._templates.move_to_end(lookup_key)
+            while len(cls._templates) > cls.MAXIMUM_NUMBER_OF_TEMPLATES:
+                cls._templates.popitem(last=False)
+
+        return template
+
+    @classmethod
+    def SetBytecodeCachePath(cls, path: str):
+        """Sets the path of the on-disk bytecode cache directory.
+
+        Compiled templates are persisted in this directory, which allows
+        subsequent runs of the tool to skip compiling templates from source.
+        The directory is created if it does not exist.
+
+        Args:
+          path (str): path of the bytecode cache directory or an empty string
+              to disable the bytecode cache.
+        """
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+        with cls._lock:
+            cls._bytecode_cache_path = path
+            cls._environments = {}
+            cls._templates = collections.OrderedDict()
@@ -0,0 +1,234 @@
+"""Transactional file changes."""
+
+import logging
+import os
+import shutil
+import tempfile
+
+from typing import List
+from typing import Tuple
+
+from l2tscaffolder.lib import errors
+
+
+class FileTransaction:
+    """Stages file changes and applies them all at once.
+
+    Changed files are staged in a temporary directory inside the project root,
+    which is on the same file system as the files they replace. On commit the
+    staged files are flushed to disk and moved into place with os.replace(),
+    which replaces a file atomically. Directories are flushed once per commit,
+    regardless of the number of files that changed in them. If anything fails,
+    all changes are rolled back.
+    """
+
+    _BACKUP_SUFFIX = ".backup"
+
+    _STAGING_DIRECTORY_PREFIX = ".l2tscaffolder-"
+
+    def __init__(self, root_path: str):
+        """Initializes a file transaction.
+
+        Args:
+          root_path (str): path of the project root, which is used to store
+              the staged files.
+        """
+        super().__init__()
+        self._backups = []
+        self._created_directories = []
+        self._number_of_directory_checks = 0
+        self._number_of_saved_directory_checks = 0
+        self._root_path = root_path
+        self._staged_files = {}
+        self._staging_path = ""
+
+    def _CreateDirectories(self, directory_path: str):
+        """Creates a directory and its missing parents.
+
+        Created directories are recorded, so that they can be removed on
+        rollback.
+
+        Args:
+          directory_path (str): path of the directory.
+        """
+        missing_directories = []
+        while directory_path and not os.path.isdir(directory_path):
+            missing_directories.append(directory_path)
+            directory_path = os.path.dirname(directory_path)
+
+        for missing_directory in reversed(missing_directories):
+            os.mkdir(missing_directory)
+            self._created_directories.append(missing_directory)
+
+    def _Flush(self, path: str):
+        """Flushes a file or directory to disk.
+
+        Args:
+          path (str): path of the file or directory.
+        """
+        try:
+            file_descriptor = os.open(path, os.O_RDONLY)
+        except OSError:
+            # Directories cannot be opened on all platforms.
+            return
+
+        try:
+            os.fsync(file_descriptor)
+        except OSError as exception:
+            logging.debug(
+                "Unable to flush: {0:s} with error: {1!s}".format(path, exception)
+            )
+        finally:
+            os.close(file_descriptor)
+
+    def _RemoveStagingDirectory(self):
+        """Removes the staging directory and everything staged in it."""
+        if self._staging_path:
+            shutil.rmtree(self._staging_path, ignore_errors=True)
+
+        self._staged_files = {}
+        self._staging_path = ""
+
+    def Commit(self) -> List[str]:
+        """Moves all staged files into place.
+
+        Returns:
+          list[str]: paths of the files that were changed.
+
+        Raises:
+          errors.FileHandlingError: when the staged files cannot be moved into
+              place, in which case all changes are rolled back.
+        """
+        staged_files = list(self._staged_files.items())
+
+        try:
+            directories = set()
+            for destination, staged_path in staged_files:
+                self._Flush(staged_path)
+
+                # Every directory is only checked once, regardless of the number
+                # of files in it.
+                directory_path = os.path.dirname(destination)
+                if directory_path in directories:
+                    self._number_of_saved_directory_checks += 1
+                else:
+                    self._CreateDirectories(directory_path)
+                    directories.add(directory_path)
+                    self._number_of_directory_checks += 1
+
+            for created_directory in self._created_directories:
+                directories.add(os.path.dirname(created_directory))
+
+            for index, (destination, staged_path) in enumerate(staged_files):
+                backup_path = ""
+                if os.path.exists(destination):
+                    backup_path = os.path.join(
+                        self._staging_path,
+                        "{0:d}{1:s}".format(index, self._BACKUP_SUFFIX),
+                    )
+                    try:
+                        os.link(destination, backup_path)
+                    except OSError:
+                        shutil.copy2(destination, backup_path)
+
+                os.replace(staged_path, destination)
+                self._backups.append((destination, backup_path))
+
+            for directory_path in sorted(directories):
+                self._Flush(directory_path)
+
+        except OSError as exception:
+            self.Rollback()
+            raise errors.FileHandlingError(
+                "Unable to commit file changes with error: {0!s}".format(exception)
+            )
+
+        self._backups = []
+        self._created_directories = []
+        self._RemoveStagingDirectory()
+
+        return [destination for destination, _ in staged_files]
+
+    def GetDirectoryCheckStatistics(self) -> Tuple[int, int]:
+        """Retrieves the statistics of the destination directory checks.
+
+        A destination directory is only checked once per commit, the checks
+        that were skipped for other files in the same directory are counted
+        as saved.
+
+        Returns:
+          tuple[int, int]: number of destination directories that were checked
+              and number of directory checks that were saved.
+        """
+        return (
+            self._number_of_directory_checks,
+            self._number_of_saved_directory_checks,
+        )
+
+    def GetStagedPath(self, path: str) -> str:
+        """Retrieves the staged path of a file, if the file is staged.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          str: path of the staged file or an empty string if the file is not
+              staged.
+        """
+        return self._staged_files.get(os.path.abspath(path), "")
+
+    def Rollback(self):
+        """Discards all staged files and undoes committed changes."""
+        for destination, backup_path in reversed(self._backups):
+            try:
+                if backup_path:
+                    os.replace(backup_path, destination)
+                else:
+                    os.remove(destination)
+            except OSError as exception:
+                logging.error(
+                    "Unable to roll back changes to: {0:s} with error: {1!s}".format(
+                        destination, exception
+                    )
+                )
+
+        for created_directory in reversed(self._created_directories):
+            try:
+                os.rmdir(created_directory)
+            except OSError:
+                pass
+
+        self._backups = []
+        self._created_directories = []
+        self._RemoveStagingDirectory()
+
+    def StageFile(self, path: str, keep_content: bool = True) -> str:
+        """Stages a file.
+
+        Args:
+          path (str): path of the file.
+          keep_content (Optional[bool]): True if the staged file should start
+              with the current content of the file.
+
+        Returns:
+          str: path of the staged file, which is to be written instead of
+              the file.
+        """
+        path = os.path.abspath(path)
+        staged_path = self._staged_files.get(path, None)
+        if staged_path:
+            return staged_path
+
+        if not self._staging_path:
+            self._staging_path = tempfile.mkdtemp(
+                dir=self._root_path, prefix=self._STAGING_DIRECTORY_PREFIX
+            )
+
+        staged_path = os.path.join(
+            self._staging_path, "{0:d}".format(len(self._staged_files))
+        )
+        if keep_content and os.path.isfile(path):
+            shutil.copy(path, staged_path)
+
+        self._staged_files[path] = staged_path
+        return staged_path
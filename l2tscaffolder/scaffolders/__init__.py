@@ -1,6 +1,38 @@
-"""This file imports Python modules that registers scaffolders."""
+"""This file registers the scaffolders.
 
-from l2tscaffolder.scaffolders import plaso_sqlite
-from l2tscaffolder.scaffolders import timesketch_index
-from l2tscaffolder.scaffolders import timesketch_sketch
-from l2tscaffolder.scaffolders import turbinia
+The scaffolders are registered without importing the modules that implement
+them, since these import the template engine and code formatter. A module is
+imported when its scaffolder is used.
+"""
+
+from l2tscaffolder.lib import definitions
+from l2tscaffolder.scaffolders import manager
+
+manager.ScaffolderManager.RegisterLazyScaffolder(
+    "sqlite",
+    "Provides a scaffolder to generate a plaso SQLite plugin.",
+    definitions.DEFINITION_PLASO,
+    "l2tscaffolder.scaffolders.plaso_sqlite",
+    "PlasoSQLiteScaffolder",
+)
+manager.ScaffolderManager.RegisterLazyScaffolder(
+    "index_analyzer",
+    "Provides a scaffolder to generate a Timesketch index analyzer plugin.",
+    definitions.DEFINITION_TIMESKETCH,
+    "l2tscaffolder.scaffolders.timesketch_index",
+    "TimesketchIndexScaffolder",
+)
+manager.ScaffolderManager.RegisterLazyScaffolder(
+    "sketch_analyzer",
+    "Provides a scaffolder to generate a Timesketch sketch analyzer plugin.",
+    definitions.DEFINITION_TIMESKETCH,
+    "l2tscaffolder.scaffolders.timesketch_sketch",
+    "TimesketchSketchScaffolder",
+)
+manager.ScaffolderManager.RegisterLazyScaffolder(
+    "turbinia_job_and_task",
+    "Provides a scaffolder to generate a Turbinia job and task plugins.",
+    definitions.DEFINITION_TURBINIA,
+    "l2tscaffolder.scaffolders.turbinia",
+    "TurbiniaJobTaskScaffolder",
+)
@@ -0,0 +1,289 @@
+"""Discovers scaffolders provided by other packages through entry points."""
+
+import json
+import logging
+import os
+import pathlib
+import sys
+import tempfile
+
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from l2tscaffolder.scaffolders import manager
+
+
+class ScaffolderCatalog:
+    """Discovers scaffolders registered in the "l2tscaffolder.scaffolders" group.
+
+    A package provides scaffolders by declaring entry points, for example in
+    its pyproject.toml:
+
+      [project.entry-points."l2tscaffolder.scaffolders"]
+      my_scaffolder = "my_package.my_module:MyScaffolder"
+
+    Discovered scaffolders are registered lazily with the scaffolder manager.
+    To determine the name, description and project of a scaffolder its module
+    is imported once. The results are stored in a catalog per installed
+    distribution, which is persisted in the cache directory. Since the
+    directory name of an installed distribution contains its version, only
+    distributions that were installed, upgraded or removed since the catalog
+    was written are read again.
+    """
+
+    CATALOG_FILENAME = "scaffolders.json"
+
+    ENTRY_POINT_GROUP = "l2tscaffolder.scaffolders"
+
+    _DISTRIBUTION_SUFFIXES = (".dist-info", ".egg-info")
+
+    _FORMAT_VERSION = 1
+
+    _cache_path = ""
+
+    # Number of distributions that were read since the statistics were reset,
+    # instead of retrieved from the catalog.
+    _number_of_read_distributions = 0
+
+    @classmethod
+    def _GetDistributionPaths(cls, paths: List[str]) -> Dict[str, int]:
+        """Retrieves the paths of installed distributions.
+
+        Args:
+          paths (list[str]): paths to search for installed distributions.
+
+        Returns:
+          dict[str, int]: modification time per path of the metadata directory
+              of an installed distribution, such as "foo-1.0.dist-info".
+        """
+        distribution_paths = {}
+        for path in paths:
+            try:
+                directory_entries = list(os.scandir(path or "."))
+            except OSError:
+                continue
+
+            for directory_entry in directory_entries:
+                if not directory_entry.name.endswith(cls._DISTRIBUTION_SUFFIXES):
+                    continue
+
+                try:
+                    stat_object = directory_entry.stat()
+                except OSError:
+                    continue
+
+                distribution_path = os.path.abspath(directory_entry.path)
+                distribution_paths.setdefault(
+                    distribution_path, stat_object.st_mtime_ns
+                )
+
+        return distribution_paths
+
+    @classmethod
+    def _ReadCatalog(cls) -> Dict[str, Dict[str, object]]:
+        """Reads the catalog from the cache directory.
+
+        A missing or invalid catalog is treated as an empty catalog.
+
+        Returns:
+          dict[str, dict[str, object]]: catalog entries per distribution path.
+        """
+        if not cls._cache_path:
+            return {}
+
+        catalog_path = os.path.join(cls._cache_path, cls.CATALOG_FILENAME)
+        try:
+            with open(catalog_path, encoding="utf-8") as file_object:
+                catalog = json.load(file_object)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exception:
+            logging.warning(
+                "Unable to read scaffolder catalog: {0:s} with error: {1!s}".format(
+                    catalog_path, exception
+                )
+            )
+            return {}
+
+        if not isinstance(catalog, dict):
+            return {}
+
+        if catalog.get("version", None) != cls._FORMAT_VERSION:
+            return {}
+
+        distributions = catalog.get("distributions", None)
+        if not isinstance(distributions, dict):
+            return {}
+
+        return distributions
+
+    @classmethod
+    def _ReadDistribution(cls, path: str) -> Optional[List[Dict[str, str]]]:
+        """Reads the scaffolders provided by a distribution.
+
+        Args:
+          path (str): path of the metadata directory of the distribution.
+
+        Returns:
+          list[dict[str, str]]: information about the scaffolders provided by
+              the distribution or None if a scaffolder could not be loaded.
+        """
+        # importlib.metadata is only imported when the catalog is stale, since
+        # importing it takes a significant part of the start-up time.
+        from importlib import metadata  # pylint: disable=import-outside-toplevel
+
+        cls._number_of_read_distributions += 1
+
+        distribution = metadata.PathDistribution(pathlib.Path(path))
+        entry_points = distribution.entry_points.select(group=cls.ENTRY_POINT_GROUP)
+
+        scaffolders = []
+        for entry_point in entry_points:
+            try:
+                scaffolder_class = entry_point.load()
+            except Exception as exception:  # pylint: disable=broad-except
+                logging.warning(
+                    "Unable to load scaffolder: {0:s} with error: {1!s}".format(
+                        entry_point.value, exception
+                    )
+                )
+                return None
+
+            scaffolders.append(
+                {
+                    "class_name": scaffolder_class.__name__,
+                    "description": scaffolder_class.DESCRIPTION,
+                    "module_name": scaffolder_class.__module__,
+                    "name": scaffolder_class.NAME,
+                    "project": scaffolder_class.PROJECT,
+                }
+            )
+
+        return scaffolders
+
+    @classmethod
+    def _WriteCatalog(cls, distributions: Dict[str, Dict[str, object]]):
+        """Writes the catalog to the cache directory.
+
+        The catalog is written to a temporary file first and then renamed, so
+        that concurrent runs never read a partially written catalog.
+
+        Args:
+          distributions (dict[str, dict[str, object]]): catalog entries per
+              distribution path.
+        """
+        catalog = {"distributions": distributions, "version": cls._FORMAT_VERSION}
+        json_string = json.dumps(catalog, indent=2, sort_keys=True)
+
+        try:
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=cls._cache_path, suffix=".tmp"
+            )
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file_object:
+                file_object.write(json_string)
+
+            os.replace(
+                temporary_path, os.path.join(cls._cache_path, cls.CATALOG_FILENAME)
+            )
+
+        except OSError as exception:
+            logging.warning(
+                "Unable to write scaffolder catalog with error: {0!s}".format(exception)
+            )
+
+    @classmethod
+    def GetCachePath(cls) -> str:
+        """Retrieves the path of the directory the catalog is persisted in.
+
+        Returns:
+          str: path of the cache directory or an empty string when the catalog
+              is not persisted.
+        """
+        return cls._cache_path
+
+    @classmethod
+    def GetNumberOfReadDistributions(cls) -> int:
+        """Retrieves the number of distributions read instead of cached.
+
+        Returns:
+          int: number of distributions of which the entry points were read.
+        """
+        return cls._number_of_read_distributions
+
+    @classmethod
+    def RegisterScaffolders(cls, paths: Optional[List[str]] = None):
+        """Discovers scaffolders and registers them with the scaffolder manager.
+
+        Scaffolders of which the name is already registered are skipped.
+
+        Args:
+          paths (Optional[list[str]]): paths to search for installed
+              distributions, where None represents sys.path.
+        """
+        if paths is None:
+            paths = sys.path
+
+        cached_distributions = cls._ReadCatalog()
+        distributions = {}
+        for path, modification_time in cls._GetDistributionPaths(paths).items():
+            distribution = cached_distributions.get(path, None)
+            if (
+                not isinstance(distribution, dict)
+                or distribution.get("modification_time", None) != modification_time
+            ):
+                scaffolders = cls._ReadDistribution(path)
+                if scaffolders is None:
+                    continue
+
+                distribution = {
+                    "modification_time": modification_time,
+                    "scaffolders": scaffolders,
+                }
+
+            distributions[path] = distribution
+
+        if cls._cache_path and distributions != cached_distributions:
+            cls._WriteCatalog(distributions)
+
+        registered_names = set(manager.ScaffolderManager.GetScaffolderNames())
+        for distribution in distributions.values():
+            for scaffolder in distribution.get("scaffolders", None) or []:
+                try:
+                    arguments = [
+                        scaffolder[key]
+                        for key in (
+                            "name",
+                            "description",
+                            "project",
+                            "module_name",
+                            "class_name",
+                        )
+                    ]
+                except (KeyError, TypeError):
+                    logging.warning("Skipping invalid scaffolder catalog entry.")
+                    continue
+
+                scaffolder_name = arguments[0].lower()
+                if scaffolder_name not in registered_names:
+                    manager.ScaffolderManager.RegisterLazyScaffolder(*arguments)
+                    registered_names.add(scaffolder_name)
+
+    @classmethod
+    def ResetStatistics(cls):
+        """Resets the number of distributions read instead of cached."""
+        cls._number_of_read_distributions = 0
+
+    @classmethod
+    def SetCachePath(cls, path: str):
+        """Sets the path of the directory the catalog is persisted in.
+
+        The directory is created if it does not exist.
+
+        Args:
+          path (str): path of the cache directory or an empty string to not
+              persist the catalog.
+        """
+        if path:
+            os.makedirs(path, exist_ok=True)
+        cls._cache_path = path
@@ -1,5 +1,8 @@
 """The scaffolder interface classes."""
 
+import os
+
+from typing import TYPE_CHECKING
 from typing import Dict
 from typing import Iterator
 from typing import List
@@ -8,6 +11,11 @@ from typing import Tuple
 from l2tscaffolder.lib import definitions
 from l2tscaffolder.lib import errors
 
+# The mapping helper is imported when the first mapping helper is created,
+# since it is not needed to list the scaffolders or ask their questions.
+if TYPE_CHECKING:
+    from l2tscaffolder.lib import mapping_helper
+
 
 class BaseQuestion:
     """Scaffolder question.
@@ -117,11 +125,63 @@ class Scaffolder:
     # Each element in the list should be an instance of BaseQuestion.
     QUESTIONS = []
 
+    # Attributes that can optionally be set in addition to the answers to the
+    # questions, such as options that change how files are generated, and
+    # their types.
+    OPTIONAL_ATTRIBUTES = {}
+
+    # Path of the style file of the code formatter, relative to the path to
+    # the tool, or an empty string for the default style file.
+    FORMATTER_PATH = ""
+
+    # Path of the directory scaffolders can cache files in that are derived
+    # from their inputs, which is shared by all scaffolders.
+    _cache_path = ""
+
     def __init__(self):
         """Initializes the scaffolder."""
         super().__init__()
+        self._mapping_helper = None
         self._output_name = ""
 
+    def _GetFilesToGenerate(self) -> List[Tuple[str, str]]:
+        """Retrieves the files to generate and the templates to render them from.
+
+        If not overwritten this will return an empty list.
+
+        Returns:
+          list[tuple[str, str]]: file name and template filename.
+        """
+        return []
+
+    def _GetMappingHelper(self) -> "mapping_helper.MappingHelper":
+        """Retrieves the mapping helper, which is created on first use.
+
+        Creating a mapping helper creates a template environment and code
+        formatter, which are not needed to ask the questions of the scaffolder.
+
+        Returns:
+          mapping_helper.MappingHelper: mapping helper.
+        """
+        if not self._mapping_helper:
+            # pylint: disable=import-outside-toplevel,redefined-outer-name
+            from l2tscaffolder.lib import mapping_helper
+
+            self._mapping_helper = mapping_helper.MappingHelper(
+                formatter_path=self.FORMATTER_PATH
+            )
+        return self._mapping_helper
+
+    @classmethod
+    def GetCachePath(cls) -> str:
+        """Retrieves the path of the cache directory of the scaffolders.
+
+        Returns:
+          str: path of the cache directory or an empty string when no cache
+              directory is set.
+        """
+        return Scaffolder._cache_path
+
     def GetInitFileChanges(self) -> Iterator[Tuple[str, str]]:
         """Generate a list of init files that need changing and the changes to them.
 
@@ -130,6 +190,30 @@ class Scaffolder:
         """
         raise NotImplementedError
 
+    def GetInputDigest(self) -> str:
+        """Calculates a digest of all inputs the generated files depend on.
+
+        The digest is used to skip generating files of which none of the inputs
+        changed since they were last generated. Files to copy are not covered
+        by the digest. The digest covers the templates of the files to
+        generate and the Jinja2 context, without rendering the templates. When
+        there are no files to generate this will return an empty string, which
+        means the files are always generated.
+
+        Returns:
+          str: hexadecimal digest of the inputs or an empty string if the
+              files should always be generated.
+        """
+        template_filenames = [
+            template_filename for _, template_filename in self._GetFilesToGenerate()
+        ]
+        if not template_filenames:
+            return ""
+
+        return self._GetMappingHelper().CalculateInputDigest(
+            template_filenames, self.GetJinjaContext()
+        )
+
     def GetJinjaContext(self) -> Dict[str, object]:
         """Returns a dict that can be used as a context for Jinja2 templates.
 
@@ -140,18 +224,25 @@ class Scaffolder:
         """
         return {}
 
-    def GetQuestions(self) -> List[BaseQuestion]:
+    @classmethod
+    def GetQuestions(cls) -> List[BaseQuestion]:
         """Returns scaffolder questions.
 
+        The questions are class level, so they can be retrieved without
+        creating a scaffolder object.
+
         Returns:
           list[BaseQuestion]: questions to prompt the user with.
         """
-        return self.QUESTIONS
+        return cls.QUESTIONS
 
     # pylint: disable=redundant-yields-doc
     def GenerateFiles(self) -> Iterator[Tuple[str, str]]:
         """Generates files this scaffolder provides.
 
+        The content of a file is either a string or an iterator of chunks of
+        the content, which are written to disk as they are generated.
+
         Yields:
           list: file name and content of the file to be written to disk.
         """
@@ -167,6 +258,16 @@ class Scaffolder:
         """
         return iter(())
 
+    def PrepareGeneration(self):
+        """Prepares the scaffolder for generating files.
+
+        Creates the state the scaffolder creates on first use, such as the
+        mapping helper and its code formatter, which parses the style of the
+        formatter. This is called before files are generated by multiple
+        threads, so that the threads only share state that is ready to use.
+        """
+        self._GetMappingHelper()
+
     def RaiseIfNotReady(self):
         """Checks to see if all attributes are set to start generating files.
 
@@ -193,6 +294,22 @@ class Scaffolder:
                     ).format(jinja_context_attribute)
                 )
 
+    @classmethod
+    def SetCachePath(cls, path: str):
+        """Sets the path of the cache directory of the scaffolders.
+
+        Scaffolders can cache files in this directory that are derived from
+        their inputs, such as minimized test files. The directory is created if
+        it does not exist.
+
+        Args:
+          path (str): path of the cache directory or an empty string to not
+              cache files in between runs.
+        """
+        if path:
+            os.makedirs(path, exist_ok=True)
+        Scaffolder._cache_path = path
+
     def SetOutputName(self, output_name: str):
         """Sets the name of the output module.
 
@@ -225,7 +342,7 @@ class Scaffolder:
 
         if not isinstance(value, value_type):
             raise ValueError(
-                "Value is of type {0:s}, not {1:s}".format(type(value), value_type)
+                "Value is of type {0!s}, not {1!s}".format(type(value), value_type)
             )
 
         setattr(self, name, value)
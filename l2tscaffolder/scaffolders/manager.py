@@ -1,5 +1,8 @@
 """The scaffolder manager."""
 
+import importlib
+
+from typing import Callable
 from typing import Dict
 from typing import Iterator
 from typing import List
@@ -10,10 +13,96 @@ from typing import Type
 from l2tscaffolder.scaffolders import interface
 
 
+class ScaffolderInformation:
+    """Information about a registered scaffolder.
+
+    The information is available without importing the module that implements
+    the scaffolder, which is only imported when the scaffolder class is needed.
+
+    Attributes:
+      class_name (str): name of the scaffolder class.
+      description (str): one line description of the scaffolder.
+      module_name (str): name of the module that implements the scaffolder.
+      name (str): name of the scaffolder.
+      project (str): name of the definition the scaffolder belongs to.
+      scaffolder_class (type): scaffolder class (subclass of Scaffolder) or None
+          if the module that implements the scaffolder was not imported yet.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        project: str,
+        module_name: str,
+        class_name: str,
+    ):
+        """Initializes scaffolder information.
+
+        Args:
+          name (str): name of the scaffolder.
+          description (str): one line description of the scaffolder.
+          project (str): name of the definition the scaffolder belongs to.
+          module_name (str): name of the module that implements the scaffolder.
+          class_name (str): name of the scaffolder class.
+        """
+        super().__init__()
+        self.class_name = class_name
+        self.description = description
+        self.module_name = module_name
+        self.name = name
+        self.project = project
+        self.scaffolder_class = None
+
+
 class ScaffolderManager:
     """The scaffolder manager."""
 
-    _scaffolder_classes = {}
+    # Functions that register additional scaffolders, which have not been
+    # called yet.
+    _discovery_functions = []
+
+    _scaffolders = {}
+
+    @classmethod
+    def _DiscoverScaffolders(cls):
+        """Calls the discovery functions that have not been called yet.
+
+        Every discovery function is only called once.
+        """
+        discovery_functions, cls._discovery_functions = cls._discovery_functions, []
+        for discovery_function in discovery_functions:
+            discovery_function()
+
+    @classmethod
+    def _GetScaffolderClass(
+        cls, scaffolder_name: str
+    ) -> Optional[Type[interface.Scaffolder]]:
+        """Retrieves a scaffolder class, importing its module if needed.
+
+        Args:
+          scaffolder_name (str): lower case name of the scaffolder.
+
+        Returns:
+          type: scaffolder class (subclass of Scaffolder) or None if no
+              scaffolder is registered for the name.
+        """
+        information = cls._scaffolders.get(scaffolder_name, None)
+        if not information:
+            # The scaffolder might be provided by a discovery function.
+            cls._DiscoverScaffolders()
+            information = cls._scaffolders.get(scaffolder_name, None)
+
+        if not information:
+            return None
+
+        if not information.scaffolder_class:
+            module = importlib.import_module(information.module_name)
+            # Importing the module normally registers the scaffolder class.
+            if not information.scaffolder_class:
+                information.scaffolder_class = getattr(module, information.class_name)
+
+        return information.scaffolder_class
 
     @classmethod
     def DeregisterScaffolder(cls, scaffolder_class: Type[interface.Scaffolder]):
@@ -28,19 +117,20 @@ class ScaffolderManager:
           KeyError: if scaffolder class is not set for the corresponding name.
         """
         scaffolder_name = scaffolder_class.NAME.lower()
-        if scaffolder_name not in cls._scaffolder_classes:
+        if scaffolder_name not in cls._scaffolders:
             raise KeyError(
                 "Scaffolder class not set for name: {0:s}.".format(
                     scaffolder_class.NAME
                 )
             )
 
-        del cls._scaffolder_classes[scaffolder_name]
+        del cls._scaffolders[scaffolder_name]
 
     @classmethod
     def GetScaffolderClasses(cls) -> Iterator[Type[interface.Scaffolder]]:
         """Generates a list of all registered scaffolder classes."""
-        yield from cls._scaffolder_classes.values()
+        for _, scaffolder_class in cls.GetScaffolders():
+            yield scaffolder_class
 
     @classmethod
     def GetScaffolderNames(cls) -> Iterator[str]:
@@ -49,8 +139,23 @@ class ScaffolderManager:
         Yields:
           str: scaffolder names.
         """
-        for scaffolder_name, _ in cls.GetScaffolders():
-            yield scaffolder_name
+        cls._DiscoverScaffolders()
+        yield from list(cls._scaffolders.keys())
+
+    @classmethod
+    def GetScaffolderNamesByProject(cls, project: str) -> Iterator[str]:
+        """Retrieves the names of the scaffolders of a definition.
+
+        Args:
+          project (str): name of the definition.
+
+        Yields:
+          str: scaffolder names.
+        """
+        cls._DiscoverScaffolders()
+        for scaffolder_name, information in list(cls._scaffolders.items()):
+            if information.project == project:
+                yield scaffolder_name
 
     @classmethod
     def GetScaffolderInformation(cls) -> Iterator[Tuple[str, str]]:
@@ -59,8 +164,9 @@ class ScaffolderManager:
         Yields:
           tuple[str, str]: pairs of scaffolder names and descriptions.
         """
-        for scaffolder_name, scaffolder_class in cls.GetScaffolders():
-            yield (scaffolder_name, scaffolder_class.DESCRIPTION)
+        cls._DiscoverScaffolders()
+        for scaffolder_name, information in list(cls._scaffolders.items()):
+            yield (scaffolder_name, information.description)
 
     @classmethod
     def GetScaffolderObjectByName(
@@ -74,7 +180,7 @@ class ScaffolderManager:
         Returns:
           Scaffolder: scaffolder object or None.
         """
-        scaffolder_class = cls._scaffolder_classes.get(scaffolder_name.lower(), None)
+        scaffolder_class = cls._GetScaffolderClass(scaffolder_name.lower())
         if scaffolder_class:
             return scaffolder_class()
         return None
@@ -87,7 +193,7 @@ class ScaffolderManager:
           dict[str, Scaffolder]: scaffolders per name.
         """
         scaffolder_objects = {}
-        for scaffolder_name, scaffolder_class in cls._scaffolder_classes.items():
+        for scaffolder_name, scaffolder_class in cls.GetScaffolders():
             scaffolder_object = scaffolder_class()
             scaffolder_objects[scaffolder_name] = scaffolder_object
 
@@ -97,13 +203,14 @@ class ScaffolderManager:
     def GetScaffolderQuestions(cls) -> List[interface.BaseQuestion]:
         """Retrieves all the questions asked by scaffolders.
 
+        The questions are retrieved without creating scaffolder objects.
+
         Returns:
           list[interface.BaseQuestion]: questions asked by all scaffolders.
         """
         questions = []
-        for scaffolder_class in cls._scaffolder_classes.values():
-            scaffolder_object = scaffolder_class()
-            questions.extend(scaffolder_object.GetQuestions())
+        for scaffolder_class in cls.GetScaffolderClasses():
+            questions.extend(scaffolder_class.GetQuestions())
 
         return questions
 
@@ -120,18 +227,18 @@ class ScaffolderManager:
           list: a list with all the questions needed to setup the  scaffolder.
               If scaffolder_name is not registered an empty list will be returned.
         """
-        scaffolder_class = cls._scaffolder_classes.get(scaffolder_name.lower(), None)
+        scaffolder_class = cls._GetScaffolderClass(scaffolder_name.lower())
         if not scaffolder_class:
             return []
 
-        scaffolder_object = scaffolder_class()
-        return scaffolder_object.GetQuestions()
+        return scaffolder_class.GetQuestions()
 
     @classmethod
     def GetScaffolders(cls) -> Iterator[Tuple[str, Type[interface.Scaffolder]]]:
         """Retrieves the registered scaffolders.
 
-        Retrieves a dictionary of all registered scaffolders.
+        Retrieves a dictionary of all registered scaffolders, which imports
+        the modules of scaffolders that were registered lazily.
 
         Yields:
           tuple: contains:
@@ -139,14 +246,66 @@ class ScaffolderManager:
           * str: name of the scaffolder:
           * type: scaffolder class (subclass of Scaffolder).
         """
-        for scaffolder_name, scaffolder_class in cls._scaffolder_classes.items():
-            yield scaffolder_name, scaffolder_class
+        cls._DiscoverScaffolders()
+        for scaffolder_name in list(cls._scaffolders.keys()):
+            scaffolder_class = cls._GetScaffolderClass(scaffolder_name)
+            if scaffolder_class:
+                yield scaffolder_name, scaffolder_class
+
+    @classmethod
+    def RegisterDiscoveryFunction(cls, discovery_function: Callable[[], None]):
+        """Registers a function that registers additional scaffolders.
+
+        The function is called when the scaffolders are first listed or when a
+        scaffolder is looked up that is not registered, so that scaffolders
+        are only discovered when they can be needed.
+
+        Args:
+          discovery_function (Callable[[], None]): function that registers
+              additional scaffolders.
+        """
+        cls._discovery_functions.append(discovery_function)
+
+    @classmethod
+    def RegisterLazyScaffolder(
+        cls,
+        name: str,
+        description: str,
+        project: str,
+        module_name: str,
+        class_name: str,
+    ):
+        """Registers a scaffolder without importing the module that implements it.
+
+        The module is imported when the scaffolder class is first needed, for
+        example to create a scaffolder object.
+
+        Args:
+          name (str): name of the scaffolder, which must match the NAME of the
+              scaffolder class.
+          description (str): one line description of the scaffolder.
+          project (str): name of the definition the scaffolder belongs to.
+          module_name (str): name of the module that implements the scaffolder.
+          class_name (str): name of the scaffolder class.
+
+        Raises:
+          KeyError: if a scaffolder is already set for the corresponding name.
+        """
+        scaffolder_name = name.lower()
+        if scaffolder_name in cls._scaffolders:
+            raise KeyError("Scaffolder already set for name: {0:s}.".format(name))
+
+        cls._scaffolders[scaffolder_name] = ScaffolderInformation(
+            name, description, project, module_name, class_name
+        )
 
     @classmethod
     def RegisterScaffolder(cls, scaffolder_class: Type[interface.Scaffolder]):
         """Registers a scaffolder class.
 
         The scaffolder classes are identified based on their lower case name.
+        A scaffolder that was registered lazily is replaced by the scaffolder
+        class that implements it.
 
         Args:
           scaffolder_class (type): scaffolder class (subclass of Scaffolder).
@@ -155,14 +314,29 @@ class ScaffolderManager:
           KeyError: if scaffolder class is already set for the corresponding name.
         """
         scaffolder_name = scaffolder_class.NAME.lower()
-        if scaffolder_name in cls._scaffolder_classes:
+        information = cls._scaffolders.get(scaffolder_name, None)
+        if information and (
+            information.scaffolder_class
+            or information.module_name != scaffolder_class.__module__
+            or information.class_name != scaffolder_class.__name__
+        ):
             raise KeyError(
                 "Scaffolder class already set for name: {0:s}.".format(
                     scaffolder_class.NAME
                 )
             )
 
-        cls._scaffolder_classes[scaffolder_name] = scaffolder_class
+        if not information:
+            information = ScaffolderInformation(
+                scaffolder_class.NAME,
+                scaffolder_class.DESCRIPTION,
+                scaffolder_class.PROJECT,
+                scaffolder_class.__module__,
+                scaffolder_class.__name__,
+            )
+            cls._scaffolders[scaffolder_name] = information
+
+        information.scaffolder_class = scaffolder_class
 
     @classmethod
     def RegisterScaffolders(cls, scaffolder_classes: List[Type[interface.Scaffolder]]):
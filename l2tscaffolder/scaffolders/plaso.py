@@ -10,7 +10,6 @@ from typing import Tuple
 
 from l2tscaffolder.lib import definitions
 from l2tscaffolder.lib import errors
-from l2tscaffolder.lib import mapping_helper
 from l2tscaffolder.scaffolders import interface
 
 
@@ -70,35 +69,34 @@ class PlasoBaseScaffolder(interface.Scaffolder):
         self._formatter_test_path = os.path.join("tests", "formatters")
         self._parser_path = os.path.join("plaso", "parsers")
         self._parser_test_path = os.path.join("tests", "parsers")
-        self._mapping_helper = mapping_helper.MappingHelper()
 
         self.class_name = ""
         self.test_file = ""
         self.test_file_path = ""
 
-    def _GenerateFormatter(self) -> str:
-        """Generates the formatter file."""
-        return self._mapping_helper.RenderTemplate(
-            self.TEMPLATE_FORMATTER_FILE, self.GetJinjaContext()
-        )
-
-    def _GenerateFormatterTest(self) -> str:
-        """Generates the formatter test file."""
-        return self._mapping_helper.RenderTemplate(
-            self.TEMPLATE_FORMATTER_TEST, self.GetJinjaContext()
-        )
+    def _GetFilesToGenerate(self) -> List[Tuple[str, str]]:
+        """Retrieves the files to generate and the templates to render them from.
 
-    def _GenerateParser(self) -> str:
-        """Generates the parser file."""
-        return self._mapping_helper.RenderTemplate(
-            self.TEMPLATE_PARSER_FILE, self.GetJinjaContext()
-        )
+        Returns:
+          list[tuple[str, str]]: file name and template filename.
+        """
+        parser_name = "{0:s}.py".format(self._output_name)
 
-    def _GenerateParserTest(self) -> str:
-        """Generates the parser test file."""
-        return self._mapping_helper.RenderTemplate(
-            self.TEMPLATE_PARSER_TEST, self.GetJinjaContext()
-        )
+        return [
+            (os.path.join(self._parser_path, parser_name), self.TEMPLATE_PARSER_FILE),
+            (
+                os.path.join(self._parser_test_path, parser_name),
+                self.TEMPLATE_PARSER_TEST,
+            ),
+            (
+                os.path.join(self._formatter_path, parser_name),
+                self.TEMPLATE_FORMATTER_FILE,
+            ),
+            (
+                os.path.join(self._formatter_test_path, parser_name),
+                self.TEMPLATE_FORMATTER_TEST,
+            ),
+        ]
 
     def GetInitFileChanges(self) -> Iterator[Tuple[str, str]]:
         """Generate a list of init files that need changing and the changes to them.
@@ -118,6 +116,15 @@ class PlasoBaseScaffolder(interface.Scaffolder):
         parser_init_path = os.path.join(self._parser_path, "__init__.py")
         yield parser_init_path, parser_string
 
+    def GetInputDigest(self) -> str:
+        """Calculates a digest of all inputs the generated files depend on.
+
+        Returns:
+          str: hexadecimal digest of the inputs.
+        """
+        self.class_name = self._GetMappingHelper().GenerateClassName(self._output_name)
+        return super().GetInputDigest()
+
     def GetJinjaContext(self) -> Dict[str, object]:
         """Returns a dict that can be used as a context for Jinja2 templates.
 
@@ -134,7 +141,8 @@ class PlasoBaseScaffolder(interface.Scaffolder):
 
         return context
 
-    def GetQuestions(self) -> List[interface.BaseQuestion]:
+    @classmethod
+    def GetQuestions(cls) -> List[interface.BaseQuestion]:
         """Returns scaffolder questions as well as adding plaso related ones.
 
         Returns:
@@ -144,7 +152,7 @@ class PlasoBaseScaffolder(interface.Scaffolder):
             "test_file",
             "Absolute or relative path to the file that will be used for tests.",
         )
-        questions = self.QUESTIONS
+        questions = list(cls.QUESTIONS)
         questions.append(test_file_question)
         return questions
 
@@ -156,57 +164,30 @@ class PlasoBaseScaffolder(interface.Scaffolder):
            str: file name.
            str: file content.
         """
-        parser_name = "{0:s}.py".format(self._output_name)
+        self.class_name = self._GetMappingHelper().GenerateClassName(self._output_name)
 
-        self.class_name = self._mapping_helper.GenerateClassName(self._output_name)
+        files_to_generate = self._GetFilesToGenerate()
+        file_paths = [file_path for file_path, _ in files_to_generate]
+        template_filenames = [
+            template_filename for _, template_filename in files_to_generate
+        ]
 
+        # The templates are rendered as a batch so that they can be formatted
+        # in parallel, or streamed when formatting is disabled.
         try:
-            parser_path = os.path.join(self._parser_path, parser_name)
-            parser_content = self._GenerateParser()
-            yield parser_path, parser_content
-        except SyntaxError as exception:
-            logging.error(
-                (
-                    "Syntax error while attempting to generate parser, error "
-                    "message: {0!s}"
-                ).format(exception)
+            contents = self._GetMappingHelper().StreamTemplates(
+                template_filenames, self.GetJinjaContext()
             )
-
-        test_path = os.path.join(self._parser_test_path, parser_name)
-        try:
-            test_content = self._GenerateParserTest()
-            yield test_path, test_content
-        except SyntaxError as exception:
-            logging.error(
-                (
-                    "Syntax error while attempting to generate parser test, error "
-                    "message: {0!s}"
-                ).format(exception)
-            )
-
-        formatter_path = os.path.join(self._formatter_path, parser_name)
-        try:
-            formatter_content = self._GenerateFormatter()
-            yield formatter_path, formatter_content
         except SyntaxError as exception:
             logging.error(
                 (
-                    "Syntax error while attempting to generate formatter, error "
+                    "Syntax error while attempting to generate parser, error "
                     "message: {0!s}"
                 ).format(exception)
             )
+            return
 
-        formatter_test_path = os.path.join(self._formatter_test_path, parser_name)
-        try:
-            formatter_test_content = self._GenerateFormatterTest()
-            yield formatter_test_path, formatter_test_content
-        except SyntaxError as exception:
-            logging.error(
-                (
-                    "Syntax error while attempting to generate formatter test, error "
-                    "message: {0!s}"
-                ).format(exception)
-            )
+        yield from zip(file_paths, contents)
 
     # pylint raises issues with OSError being raised and not documented, but it is
     # not raised.
@@ -1,11 +1,21 @@
 """The scaffolder interface classes."""
 
+import atexit
+import hashlib
+import json
+import logging
 import os
+import shutil
 import sqlite3
+import tempfile
+import threading
 
 from typing import Dict
 from typing import Iterator
+from typing import List
+from typing import Set
 from typing import Tuple
+from urllib import parse as urlparse
 
 from l2tscaffolder.lib import errors
 from l2tscaffolder.scaffolders import interface
@@ -101,6 +111,10 @@ class PlasoSQLiteScaffolder(plaso.PlasoPluginScaffolder):
           parser, the key is the name for each SQL statement run against the
           database and the value is the data type used for each generated event
           resulting from that SQL statement.
+      minimize_test_file (bool): True if a minimized copy of the test database
+          should be copied instead of the test database, which only contains
+          the tables read by the queries and the required tables, with a sample
+          of their rows.
       queries (dict): a dict containing query name and SQL statements or queries
           run against the database.
       query_columns (dict): for each SQL statement run against the database, with
@@ -116,6 +130,14 @@ class PlasoSQLiteScaffolder(plaso.PlasoPluginScaffolder):
     NAME = "sqlite"
     DESCRIPTION = "Provides a scaffolder to generate a plaso SQLite plugin."
 
+    # Maximum number of database schemas to keep in the cache.
+    MAXIMUM_NUMBER_OF_CACHED_SCHEMAS = 32
+
+    # Maximum number of rows per table in a minimized test database.
+    MAXIMUM_NUMBER_OF_SAMPLED_ROWS = 100
+
+    OPTIONAL_ATTRIBUTES = {"minimize_test_file": bool}
+
     SCHEMA_QUERY = (
         "SELECT tbl_name, sql "
         "FROM sqlite_master "
@@ -129,6 +151,15 @@ class PlasoSQLiteScaffolder(plaso.PlasoPluginScaffolder):
     TEMPLATE_FORMATTER_FILE = "sqlite_plugin_formatter.jinja2"
     TEMPLATE_FORMATTER_TEST = "sqlite_plugin_formatter_test.jinja2"
 
+    # Number of bytes read at once to calculate the digest of a file.
+    _DIGEST_READ_SIZE = 64 * 1024
+
+    # Suffix of the file that contains the digest of a minimized test database.
+    _DIGEST_SUFFIX = ".sha256"
+
+    # Maximum number of bytes of a database to access with memory-mapped I/O.
+    _MMAP_SIZE = 1024 * 1024 * 1024
+
     # Questions, a list that contains all the needed questions that the
     # user should be prompted about before the plugin or parser is created.
     # Each element in the list needs to be an instance of BaseQuestion.
@@ -153,17 +184,169 @@ class PlasoSQLiteScaffolder(plaso.PlasoPluginScaffolder):
         ),
     ]
 
+    # Database schemas per path, size and modification time of the database.
+    _schema_cache = {}
+
+    # Temporary directory of the process that minimized test databases are
+    # stored in when no cache directory is set.
+    _temporary_directory = ""
+    _temporary_directory_lock = threading.Lock()
+
     def __init__(self):
         """Initializes the plaso SQLite plugin scaffolder."""
         super().__init__()
         self.database_name = ""
         self.database_schema = {}
         self.data_types = {}
+        self.minimize_test_file = False
         self.queries = {}
         self.query_columns = {}
         self.required_tables = []
         self.timestamp_columns = {}
 
+    def _CalculateFileDigest(self, path: str) -> str:
+        """Calculates the digest of the content of a file.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          str: hexadecimal SHA-256 digest of the content of the file.
+
+        Raises:
+          OSError: if the file cannot be read.
+        """
+        hasher = hashlib.sha256()
+        with open(path, "rb") as file_object:
+            data = file_object.read(self._DIGEST_READ_SIZE)
+            while data:
+                hasher.update(data)
+                data = file_object.read(self._DIGEST_READ_SIZE)
+
+        return hasher.hexdigest()
+
+    def _CopySampledRows(self, database: sqlite3.Connection, table_names: List[str]):
+        """Creates tables with a sample of the rows of the test database.
+
+        The sample consists of the first rows of a table by rowid, which makes
+        the sample deterministic.
+
+        Args:
+          database (sqlite3.Connection): database to create the tables in, with
+              the test database attached as "source".
+          table_names (list[str]): names of the tables to create.
+
+        Raises:
+          sqlite3.Error: if the tables cannot be created.
+        """
+        schema_rows = []
+        for table_name in table_names:
+            schema_rows.extend(
+                database.execute(
+                    (
+                        "SELECT type, sql FROM source.sqlite_master "
+                        "WHERE tbl_name = ? AND sql IS NOT NULL"
+                    ),
+                    (table_name,),
+                )
+            )
+
+        for object_type, sql in schema_rows:
+            if object_type == "table":
+                database.execute(sql)
+
+        for table_name in table_names:
+            quoted_name = '"{0:s}"'.format(table_name.replace('"', '""'))
+            insert_query = "INSERT INTO main.{0:s} SELECT * FROM source.{0:s}".format(
+                quoted_name
+            )
+            try:
+                database.execute(
+                    "{0:s} ORDER BY rowid LIMIT ?".format(insert_query),
+                    (self.MAXIMUM_NUMBER_OF_SAMPLED_ROWS,),
+                )
+            except sqlite3.OperationalError:
+                # Tables without rowid are sampled in the order of their
+                # primary key.
+                database.execute(
+                    "{0:s} LIMIT ?".format(insert_query),
+                    (self.MAXIMUM_NUMBER_OF_SAMPLED_ROWS,),
+                )
+
+        # Indexes are created after the rows were inserted, triggers and views
+        # are not needed by the queries.
+        for object_type, sql in schema_rows:
+            if object_type == "index":
+                database.execute(sql)
+
+        database.commit()
+
+    @classmethod
+    def _GetMinimizedTestFileDirectory(cls) -> str:
+        """Determines the directory to store minimized test databases in.
+
+        Minimized test databases are stored in the cache directory of the
+        scaffolders when set, so that they are reused in between runs.
+        Otherwise they are stored in a temporary directory of the process,
+        which is removed when the process exits. A predictable path in the
+        shared temporary directory is not used, since other users can create
+        files there.
+
+        Returns:
+          str: path of the directory.
+
+        Raises:
+          OSError: if the directory cannot be created.
+        """
+        cache_path = cls.GetCachePath()
+        if cache_path:
+            directory_path = os.path.join(cache_path, "sqlite")
+            os.makedirs(directory_path, mode=0o700, exist_ok=True)
+            return directory_path
+
+        with cls._temporary_directory_lock:
+            if not PlasoSQLiteScaffolder._temporary_directory:
+                directory_path = tempfile.mkdtemp(prefix="l2tscaffolder-minimized-")
+                atexit.register(shutil.rmtree, directory_path, ignore_errors=True)
+                PlasoSQLiteScaffolder._temporary_directory = directory_path
+
+            return PlasoSQLiteScaffolder._temporary_directory
+
+    def _GetMinimizedTestFilePath(self) -> str:
+        """Determines the path of the minimized copy of the test database.
+
+        The path depends on the test database, the queries and the required
+        tables, so that a minimized copy is only created once.
+
+        Returns:
+          str: path of the minimized test database.
+
+        Raises:
+          OSError: if the test database cannot be accessed or the directory to
+              store the minimized test database in cannot be created.
+        """
+        stat_object = os.stat(self.test_file)
+
+        inputs = [
+            os.path.abspath(self.test_file),
+            "{0:d}".format(stat_object.st_size),
+            "{0:d}".format(stat_object.st_mtime_ns),
+            json.dumps(self.queries, sort_keys=True),
+            json.dumps(sorted(self.required_tables)),
+            "{0:d}".format(self.MAXIMUM_NUMBER_OF_SAMPLED_ROWS),
+        ]
+        hasher = hashlib.sha256()
+        for data in inputs:
+            data = data.encode("utf-8")
+            hasher.update("{0:d}:".format(len(data)).encode("ascii"))
+            hasher.update(data)
+
+        _, extension = os.path.splitext(self.test_file)
+        return os.path.join(
+            self._GetMinimizedTestFileDirectory(),
+            "{0:s}{1:s}".format(hasher.hexdigest(), extension),
+        )
+
     def _GetQueryColumns(self, query: str) -> Iterator[str]:
         """Generates column names from a SQL statement.
 
@@ -190,6 +373,11 @@ class PlasoSQLiteScaffolder(plaso.PlasoPluginScaffolder):
     def _GetSchema(self, database_path: str) -> Dict[str, str]:
         """Returns the schema of a SQLite database as a dict.
 
+        The database is opened read-only and immutable, so that no journal
+        files are created and no locks are taken, which also allows databases
+        on read-only media. The schema is cached per path, size and
+        modification time of the database.
+
         Args:
           database_path (str): full path to the SQLite database.
 
@@ -201,52 +389,208 @@ class PlasoSQLiteScaffolder(plaso.PlasoPluginScaffolder):
         Raises:
           sqlite3.DatabaseError: if the database cannot be read.
         """
-        database = sqlite3.connect(database_path)
+        database_path = os.path.abspath(database_path)
         try:
-            database.row_factory = sqlite3.Row
-            cursor = database.cursor()
+            stat_object = os.stat(database_path)
+        except OSError as exception:
+            raise sqlite3.DatabaseError(
+                "Unable to open database: {0:s} with error: {1!s}".format(
+                    database_path, exception
+                )
+            )
+
+        cache_key = (database_path, stat_object.st_size, stat_object.st_mtime_ns)
+        schema = self._schema_cache.get(cache_key, None)
+        if schema is not None:
+            return dict(schema)
+
+        database_uri = "file:{0:s}?mode=ro&immutable=1".format(
+            urlparse.quote(database_path)
+        )
+        database = sqlite3.connect(database_uri, uri=True)
+        try:
+            database.execute("PRAGMA mmap_size = {0:d}".format(self._MMAP_SIZE))
 
-            sql_results = cursor.execute(self.SCHEMA_QUERY)
+            sql_results = database.execute(self.SCHEMA_QUERY)
 
             schema = {
                 table_name: " ".join(query.split()) for table_name, query in sql_results
             }
 
-        except sqlite3.DatabaseError:
+        finally:
             database.close()
-            raise
 
-        return schema
+        if len(self._schema_cache) >= self.MAXIMUM_NUMBER_OF_CACHED_SCHEMAS:
+            self._schema_cache.clear()
+        self._schema_cache[cache_key] = schema
 
-    def GetJinjaContext(self) -> Dict[str, object]:
-        """Returns a dict that can be used as a context for Jinja2 templates.
+        return dict(schema)
+
+    def _GetTablesReadByQueries(self, database: sqlite3.Connection) -> Set[str]:
+        """Determines the tables the queries read from.
+
+        The tables are reported by an authorizer while the queries are
+        compiled, the queries are not run.
+
+        Args:
+          database (sqlite3.Connection): database with the test database
+              attached as "source".
 
         Returns:
-          dict: containing:
-            str: name of Jinja argument.
-            object: Jinja argument value.
+          set[str]: names of the tables the queries read from.
         """
-        context = super().GetJinjaContext()
-        context["database_name"] = self.database_name
-        context["database_schema"] = self.database_schema
-        context["data_types"] = self.data_types
-        context["queries"] = self.queries
-        context["query_columns"] = self.query_columns
-        context["required_tables"] = self.required_tables
-        context["timestamp_columns"] = self.timestamp_columns
-        return context
+        table_names = set()
 
-    def GenerateFiles(self) -> Iterator[Tuple[str, str]]:
-        """Generates files required for the SQLite plugin.
+        def _Authorizer(action, table_name, unused_column_name, database_name, _):
+            """Records the tables that are read from the test database."""
+            if action == sqlite3.SQLITE_READ and database_name == "source":
+                table_names.add(table_name)
+            return sqlite3.SQLITE_OK
 
-        Yields:
-          tuple: file name and content of the file to be written to disk.
+        database.set_authorizer(_Authorizer)
+        try:
+            for query_name, query in sorted(self.queries.items()):
+                try:
+                    database.execute("EXPLAIN {0:s}".format(query))
+                except sqlite3.Error as exception:
+                    logging.warning(
+                        "Unable to compile query: {0:s} with error: {1!s}".format(
+                            query_name, exception
+                        )
+                    )
+        finally:
+            database.set_authorizer(None)
+
+        return table_names
+
+    def _IsValidMinimizedTestFile(self, path: str) -> bool:
+        """Determines if a previously minimized test database can be reused.
+
+        Args:
+          path (str): path of the minimized test database.
+
+        Returns:
+          bool: True if the content of the minimized test database matches the
+              digest that was stored when it was created.
+        """
+        try:
+            with open(
+                "{0:s}{1:s}".format(path, self._DIGEST_SUFFIX), encoding="ascii"
+            ) as file_object:
+                stored_digest = file_object.read().strip()
+
+            return stored_digest == self._CalculateFileDigest(path)
+
+        except (OSError, ValueError):
+            return False
+
+    def _MinimizeTestFile(self) -> str:
+        """Creates a minimized copy of the test database.
+
+        The copy contains the tables the queries read from and the required
+        tables, with a sample of their rows. If a query returns rows from the
+        test database but not from the sample, the test database cannot be
+        minimized. A copy that was created before is reused if its content
+        matches the digest stored with it.
+
+        Returns:
+          str: path of the minimized test database or an empty string if the
+              test database cannot be minimized.
+        """
+        try:
+            minimized_path = self._GetMinimizedTestFilePath()
+        except OSError as exception:
+            logging.warning(
+                "Unable to minimize test file: {0:s} with error: {1!s}".format(
+                    self.test_file, exception
+                )
+            )
+            return ""
+
+        if self._IsValidMinimizedTestFile(minimized_path):
+            return minimized_path
+
+        temporary_path = "{0:s}.{1:d}.tmp".format(minimized_path, os.getpid())
+        source_uri = "file:{0:s}?mode=ro".format(
+            urlparse.quote(os.path.abspath(self.test_file))
+        )
+
+        database = sqlite3.connect("file::memory:", uri=True)
+        try:
+            database.execute("ATTACH DATABASE ? AS source", (source_uri,))
+
+            # The main database is empty, hence the queries read from the test
+            # database until the sampled tables are created.
+            query_names = [
+                query_name
+                for query_name, query in sorted(self.queries.items())
+                if self._QueryReturnsRows(database, query)
+            ]
+
+            table_names = self._GetTablesReadByQueries(database)
+            table_names.update(self.required_tables)
+            existing_table_names = set(
+                table_name
+                for (table_name,) in database.execute(
+                    "SELECT name FROM source.sqlite_master WHERE type = 'table'"
+                )
+            )
+            table_names = sorted(
+                table_name
+                for table_name in table_names & existing_table_names
+                if not table_name.startswith("sqlite_")
+            )
+
+            self._CopySampledRows(database, table_names)
+
+            for query_name in query_names:
+                if not self._QueryReturnsRows(database, self.queries[query_name]):
+                    logging.warning(
+                        (
+                            "Unable to minimize test file: {0:s}, query: {1:s} "
+                            "returns no rows from the sampled rows."
+                        ).format(self.test_file, query_name)
+                    )
+                    return ""
+
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            database.execute("VACUUM main INTO ?", (temporary_path,))
+
+            # The digest is stored with the minimized test database, so that
+            # a database that was changed afterwards is not reused.
+            digest_path = "{0:s}{1:s}".format(temporary_path, self._DIGEST_SUFFIX)
+            with open(digest_path, "w", encoding="ascii") as file_object:
+                file_object.write(self._CalculateFileDigest(temporary_path))
+
+            os.replace(temporary_path, minimized_path)
+            os.replace(
+                digest_path, "{0:s}{1:s}".format(minimized_path, self._DIGEST_SUFFIX)
+            )
+
+        except (OSError, sqlite3.Error) as exception:
+            logging.warning(
+                "Unable to minimize test file: {0:s} with error: {1!s}".format(
+                    self.test_file, exception
+                )
+            )
+            return ""
+
+        finally:
+            database.close()
+
+        return minimized_path
+
+    def _PrepareJinjaContext(self):
+        """Determines the attributes of the Jinja2 context from the answers.
 
         Raises:
           errors.UnableToConfigure: if it is not possible to generate
               the files.
         """
-        _, _, database_name = self.test_file.rpartition(os.sep)
+        # The name of the test database in the project, which differs from
+        # the name of the test file when a minimized copy is copied.
+        _, _, database_name = (self.test_file_path or self.test_file).rpartition(os.sep)
         self.database_name = database_name
 
         self.data_types = {}
@@ -275,6 +619,80 @@ class PlasoSQLiteScaffolder(plaso.PlasoPluginScaffolder):
 
         self.database_schema = self._GetSchema(self.test_file)
 
+    def _QueryReturnsRows(self, database: sqlite3.Connection, query: str) -> bool:
+        """Determines if a query returns rows.
+
+        Args:
+          database (sqlite3.Connection): database to run the query against.
+          query (str): SQL query.
+
+        Returns:
+          bool: True if the query returns at least one row.
+        """
+        try:
+            return database.execute(query).fetchone() is not None
+        except sqlite3.Error:
+            return False
+
+    def GetFilesToCopy(self) -> Iterator[Tuple[str, str]]:
+        """Return a list of files that need to be copied.
+
+        Yields:
+          tuple: containing:
+            str: file name of source.
+            str: file name of destination.
+        """
+        for file_source, file_destination in super().GetFilesToCopy():
+            if self.minimize_test_file and file_source == self.test_file:
+                minimized_path = self._MinimizeTestFile()
+                if minimized_path:
+                    # The minimized copy gets a name of its own, so that it
+                    # never replaces a complete test database of the same name
+                    # that other tests in the project rely on.
+                    destination_stem, extension = os.path.splitext(file_destination)
+                    file_source = minimized_path
+                    file_destination = "{0:s}_minimized{1:s}".format(
+                        destination_stem, extension
+                    )
+                    self.test_file_path = file_destination
+
+            yield file_source, file_destination
+
+    def GetJinjaContext(self) -> Dict[str, object]:
+        """Returns a dict that can be used as a context for Jinja2 templates.
+
+        Returns:
+          dict: containing:
+            str: name of Jinja argument.
+            object: Jinja argument value.
+        """
+        context = super().GetJinjaContext()
+        context["database_name"] = self.database_name
+        context["database_schema"] = self.database_schema
+        context["data_types"] = self.data_types
+        context["queries"] = self.queries
+        context["query_columns"] = self.query_columns
+        context["required_tables"] = self.required_tables
+        context["timestamp_columns"] = self.timestamp_columns
+        return context
+
+    def GetInputDigest(self) -> str:
+        """Calculates a digest of all inputs the generated files depend on.
+
+        Returns:
+          str: hexadecimal digest of the inputs.
+        """
+        self._PrepareJinjaContext()
+        return super().GetInputDigest()
+
+    def GenerateFiles(self) -> Iterator[Tuple[str, str]]:
+        """Generates files required for the SQLite plugin.
+
+        Yields:
+          tuple: file name and content of the file to be written to disk.
+        """
+        self._PrepareJinjaContext()
+
         for name, content in super().GenerateFiles():
             yield name, content
 
@@ -5,10 +5,10 @@ import logging
 
 from typing import Dict
 from typing import Iterator
+from typing import List
 from typing import Tuple
 
 from l2tscaffolder.lib import definitions
-from l2tscaffolder.lib import mapping_helper
 from l2tscaffolder.scaffolders import interface
 
 
@@ -28,6 +28,10 @@ class TimesketchBaseScaffolder(interface.Scaffolder):
     # Define which project this particular scaffolder belongs to.
     PROJECT = definitions.DEFINITION_TIMESKETCH
 
+    # Timesketch uses 4 spaces instead of 2, thus we need to set a different
+    # formatter.
+    FORMATTER_PATH = ".style.ts.yapf"
+
     # Filename of templates.
     TEMPLATE_PLUGIN_FILE = ""
     TEMPLATE_PLUGIN_TEST = ""
@@ -42,25 +46,25 @@ class TimesketchBaseScaffolder(interface.Scaffolder):
         super().__init__()
         self._plugin_path = os.path.join("timesketch", "lib", "analyzers")
         self._plugin_test_path = os.path.join("timesketch", "lib", "analyzers")
-        # Timesketch uses 4 spaces instead of 2, thus we need to set a different
-        # formatter.
-        self._mapping_helper = mapping_helper.MappingHelper(
-            formatter_path=".style.ts.yapf"
-        )
 
         self.class_name = ""
 
-    def _GeneratePlugin(self) -> str:
-        """Generates the plugin file."""
-        return self._mapping_helper.RenderTemplate(
-            self.TEMPLATE_PLUGIN_FILE, self.GetJinjaContext()
-        )
+    def _GetFilesToGenerate(self) -> List[Tuple[str, str]]:
+        """Retrieves the files to generate and the templates to render them from.
 
-    def _GeneratePluginTest(self) -> str:
-        """Generates the plugin test file."""
-        return self._mapping_helper.RenderTemplate(
-            self.TEMPLATE_PLUGIN_TEST, self.GetJinjaContext()
-        )
+        Returns:
+          list[tuple[str, str]]: file name and template filename.
+        """
+        plugin_name = "{0:s}.py".format(self._output_name)
+        test_file_name = "{0:s}_test.py".format(self._output_name)
+
+        return [
+            (os.path.join(self._plugin_path, plugin_name), self.TEMPLATE_PLUGIN_FILE),
+            (
+                os.path.join(self._plugin_test_path, test_file_name),
+                self.TEMPLATE_PLUGIN_TEST,
+            ),
+        ]
 
     def GetInitFileChanges(self) -> Iterator[Tuple[str, str]]:
         """Generate a list of init files that need changing and the changes to them.
@@ -75,6 +79,15 @@ class TimesketchBaseScaffolder(interface.Scaffolder):
         plugin_init_path = os.path.join(self._plugin_path, "__init__.py")
         yield plugin_init_path, plugin_string
 
+    def GetInputDigest(self) -> str:
+        """Calculates a digest of all inputs the generated files depend on.
+
+        Returns:
+          str: hexadecimal digest of the inputs.
+        """
+        self.class_name = self._GetMappingHelper().GenerateClassName(self._output_name)
+        return super().GetInputDigest()
+
     def GetJinjaContext(self) -> Dict[str, object]:
         """Returns a dict that can be used as a context for Jinja2 templates.
 
@@ -97,14 +110,18 @@ class TimesketchBaseScaffolder(interface.Scaffolder):
            str: file name.
            str: file content.
         """
-        plugin_name = "{0:s}.py".format(self._output_name)
+        self.class_name = self._GetMappingHelper().GenerateClassName(self._output_name)
 
-        self.class_name = self._mapping_helper.GenerateClassName(self._output_name)
+        files_to_generate = self._GetFilesToGenerate()
+        file_paths = [file_path for file_path, _ in files_to_generate]
+        template_filenames = [
+            template_filename for _, template_filename in files_to_generate
+        ]
 
         try:
-            plugin_path = os.path.join(self._plugin_path, plugin_name)
-            plugin_content = self._GeneratePlugin()
-            yield plugin_path, plugin_content
+            contents = self._GetMappingHelper().StreamTemplates(
+                template_filenames, self.GetJinjaContext()
+            )
         except SyntaxError as exception:
             logging.error(
                 (
@@ -112,16 +129,6 @@ class TimesketchBaseScaffolder(interface.Scaffolder):
                     "message: {0!s}"
                 ).format(exception)
             )
+            return
 
-        test_file_name = "{0:s}_test.py".format(self._output_name)
-        test_path = os.path.join(self._plugin_test_path, test_file_name)
-        try:
-            test_content = self._GeneratePluginTest()
-            yield test_path, test_content
-        except SyntaxError as exception:
-            logging.error(
-                (
-                    "Syntax error while attempting to generate plugin test, error "
-                    "message: {0!s}"
-                ).format(exception)
-            )
+        yield from zip(file_paths, contents)
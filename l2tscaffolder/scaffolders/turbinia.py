@@ -6,10 +6,10 @@ import logging
 
 from typing import Dict
 from typing import Iterator
+from typing import List
 from typing import Tuple
 
 from l2tscaffolder.lib import definitions
-from l2tscaffolder.lib import mapping_helper
 from l2tscaffolder.scaffolders import interface
 from l2tscaffolder.scaffolders import manager
 
@@ -39,21 +39,21 @@ class TurbiniaJobTaskScaffolder(interface.Scaffolder):
         super().__init__()
         self._job_path = os.path.join("turbinia", "jobs")
         self._task_path = os.path.join("turbinia", "workers")
-        self._mapping_helper = mapping_helper.MappingHelper()
 
         self.class_name = ""
 
-    def _GenerateJobFile(self) -> str:
-        """Generates the job job file."""
-        return self._mapping_helper.RenderTemplate(
-            self.TEMPLATE_JOB_FILE, self.GetJinjaContext()
-        )
+    def _GetFilesToGenerate(self) -> List[Tuple[str, str]]:
+        """Retrieves the files to generate and the templates to render them from.
 
-    def _GenerateTaskFile(self) -> str:
-        """Generates the task file."""
-        return self._mapping_helper.RenderTemplate(
-            self.TEMPLATE_TASK_FILE, self.GetJinjaContext()
-        )
+        Returns:
+          list[tuple[str, str]]: file name and template filename.
+        """
+        plugin_name = "{0:s}.py".format(self._output_name)
+
+        return [
+            (os.path.join(self._job_path, plugin_name), self.TEMPLATE_JOB_FILE),
+            (os.path.join(self._task_path, plugin_name), self.TEMPLATE_TASK_FILE),
+        ]
 
     def GetInitFileChanges(self) -> Iterator[Tuple[str, str]]:
         """Generate a list of init files that need changing and the changes to them.
@@ -68,6 +68,15 @@ class TurbiniaJobTaskScaffolder(interface.Scaffolder):
         job_init_path = os.path.join(self._job_path, "__init__.py")
         yield job_init_path, job_string
 
+    def GetInputDigest(self) -> str:
+        """Calculates a digest of all inputs the generated files depend on.
+
+        Returns:
+          str: hexadecimal digest of the inputs.
+        """
+        self.class_name = self._GetMappingHelper().GenerateClassName(self._output_name)
+        return super().GetInputDigest()
+
     def GetJinjaContext(self) -> Dict[str, object]:
         """Returns a dict that can be used as a context for Jinja2 templates.
 
@@ -92,26 +101,18 @@ class TurbiniaJobTaskScaffolder(interface.Scaffolder):
            str: file name.
            str: file content.
         """
-        plugin_name = "{0:s}.py".format(self._output_name)
+        self.class_name = self._GetMappingHelper().GenerateClassName(self._output_name)
 
-        self.class_name = self._mapping_helper.GenerateClassName(self._output_name)
+        files_to_generate = self._GetFilesToGenerate()
+        file_paths = [file_path for file_path, _ in files_to_generate]
+        template_filenames = [
+            template_filename for _, template_filename in files_to_generate
+        ]
 
         try:
-            job_path = os.path.join(self._job_path, plugin_name)
-            job_content = self._GenerateJobFile()
-            yield job_path, job_content
-        except SyntaxError as exception:
-            logging.error(
-                (
-                    "Syntax error while attempting to generate component, error "
-                    "message: {0!s}"
-                ).format(exception)
+            contents = self._GetMappingHelper().StreamTemplates(
+                template_filenames, self.GetJinjaContext()
             )
-
-        try:
-            task_path = os.path.join(self._task_path, plugin_name)
-            task_content = self._GenerateTaskFile()
-            yield task_path, task_content
         except SyntaxError as exception:
             logging.error(
                 (
@@ -119,6 +120,9 @@ class TurbiniaJobTaskScaffolder(interface.Scaffolder):
                     "message: {0!s}"
                 ).format(exception)
             )
+            return
+
+        yield from zip(file_paths, contents)
 
 
 manager.ScaffolderManager.RegisterScaffolder(TurbiniaJobTaskScaffolder)
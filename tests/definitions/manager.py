@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Test class for the definition manager."""
 
+import os
 import unittest
 
 from l2tscaffolder.definitions import interface
@@ -64,6 +65,15 @@ class FailingTestProject(interface.ScaffolderDefinition):
         return False
 
 
+class MarkerTestProject(interface.ScaffolderDefinition):
+    """Test project that is detected by its markers."""
+
+    NAME = "marker"
+
+    MARKER_DIRECTORIES = ["foobar"]
+    MARKER_FILES = ["foobar/__init__.py"]
+
+
 class DefinitionManagerTest(unittest.TestCase):
     """Test case for the definition manager."""
 
@@ -107,6 +117,28 @@ class DefinitionManagerTest(unittest.TestCase):
         manager.DefinitionManager.DeregisterDefinition(SilverTestProject)
         self.assertEqual(len(list(manager.DefinitionManager.GetDefinitionNames())), 2)
 
+    def testGetDefinitionNameByPath(self):
+        """Test detecting the definition of a project."""
+        test_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "test_data"
+        )
+        definition_name = manager.DefinitionManager.GetDefinitionNameByPath(
+            "the golden path"
+        )
+        self.assertEqual(definition_name, "gold")
+
+        path = os.path.join(test_path, "PlasoFailPath1")
+        definition_name = manager.DefinitionManager.GetDefinitionNameByPath(path)
+        self.assertIsNone(definition_name)
+
+        manager.DefinitionManager.RegisterDefinition(MarkerTestProject)
+        try:
+            definition_name = manager.DefinitionManager.GetDefinitionNameByPath(path)
+            self.assertEqual(definition_name, "marker")
+            self.assertTrue(MarkerTestProject().ValidatePath(path))
+        finally:
+            manager.DefinitionManager.DeregisterDefinition(MarkerTestProject)
+
     def testGetDefinitionNames(self):
         """Test getting definition names."""
         definitions = list(manager.DefinitionManager.GetDefinitionNames())
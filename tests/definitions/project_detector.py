@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Tests for the project detector."""
+
+import os
+import tempfile
+import unittest
+
+from l2tscaffolder.definitions import project_detector
+
+
+class ProjectDetectorTest(unittest.TestCase):
+    """Tests for the project detector."""
+
+    def setUp(self):
+        """Makes preparations before running an individual test."""
+        project_detector.ProjectDetector.Clear()
+
+    def testHasMarkers(self):
+        """Tests matching a project root against markers."""
+        test_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "test_data"
+        )
+        detector = project_detector.ProjectDetector
+
+        path = os.path.join(test_path, "PlasoPath")
+        self.assertTrue(
+            detector.HasMarkers(path, ["plaso", "plaso/parsers"], ["plaso.ini"])
+        )
+        self.assertFalse(detector.HasMarkers(path, ["plaso.ini"], []))
+        self.assertFalse(detector.HasMarkers(path, [], ["plaso"]))
+        self.assertFalse(detector.HasMarkers(path, ["plaso/bogus"], []))
+        self.assertFalse(detector.HasMarkers(path, ["bogus/parsers"], []))
+
+        path = os.path.join(test_path, "PlasoFailPath2")
+        self.assertFalse(
+            detector.HasMarkers(path, ["plaso", "plaso/parsers"], ["plaso.ini"])
+        )
+
+        path = os.path.join(test_path, "bogus")
+        self.assertFalse(detector.HasMarkers(path, [], []))
+
+    def testHasMarkersCache(self):
+        """Tests that listings are cached per directory and modification time."""
+        detector = project_detector.ProjectDetector
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            os.makedirs(os.path.join(temporary_directory, "foo", "bar"))
+
+            self.assertTrue(
+                detector.HasMarkers(temporary_directory, ["foo", "foo/bar"], [])
+            )
+            self.assertFalse(detector.HasMarkers(temporary_directory, [], ["baz"]))
+            self.assertEqual(detector.GetNumberOfScannedDirectories(), 2)
+
+            path = os.path.join(temporary_directory, "baz")
+            with open(path, "w", encoding="utf-8") as file_object:
+                file_object.write("\n")
+
+            # Make sure the modification time changes regardless of the
+            # timestamp granularity of the file system.
+            stat_object = os.stat(temporary_directory)
+            os.utime(
+                temporary_directory,
+                ns=(stat_object.st_atime_ns, stat_object.st_mtime_ns + 1000000000),
+            )
+
+            self.assertTrue(detector.HasMarkers(temporary_directory, [], ["baz"]))
+            self.assertEqual(detector.GetNumberOfScannedDirectories(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
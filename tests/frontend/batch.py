@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""Tests for the batch frontend."""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from l2tscaffolder.definitions import manager as definition_manager
+from l2tscaffolder.definitions import plaso
+from l2tscaffolder.frontend import batch
+from l2tscaffolder.lib import errors
+from l2tscaffolder.scaffolders import manager as scaffolder_manager
+from l2tscaffolder.scaffolders import plaso_sqlite
+from tests.frontend import frontend as frontend_test
+
+
+class TestBatchFrontend(batch.BatchFrontend):
+    """Test implementation of the batch frontend."""
+
+    def __init__(self, output_handler_to_use, dry_run=False):
+        """Initializes the batch frontend."""
+        super().__init__(output_handler_to_use, dry_run=dry_run)
+        self.git_helper = MagicMock()
+
+    def _GetGitHelper(self, project_path):
+        """Mock retrieving the git helper."""
+        return self.git_helper
+
+
+class BatchFrontendTest(unittest.TestCase):
+    """Tests for the batch frontend."""
+
+    # Temporary directory for mocking a plaso source tree.
+    root_directory = None
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the test class."""
+        try:
+            definition_manager.DefinitionManager.RegisterDefinition(plaso.PlasoProject)
+        except KeyError:
+            pass
+
+        try:
+            scaffolder_manager.ScaffolderManager.RegisterScaffolder(
+                plaso_sqlite.PlasoSQLiteScaffolder
+            )
+        except KeyError:
+            pass
+
+        # pylint: disable=consider-using-with
+        cls.root_directory = tempfile.TemporaryDirectory()
+
+        root_dir_name = cls.root_directory.name
+        os.makedirs(os.path.join(root_dir_name, "plaso", "parsers", "sqlite_plugins"))
+
+        path = os.path.join(root_dir_name, "plaso.ini")
+        with open(path, "w", encoding="utf-8") as file_object:
+            file_object.write("\n")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Cleans up after running tests."""
+        cls.root_directory.cleanup()
+
+    def _CreateFrontend(self):
+        """Creates a batch frontend that writes its output to a buffer.
+
+        Returns:
+          TestBatchFrontend: batch frontend.
+        """
+        test_output_handler = frontend_test.TestOutputHandler()
+        test_output_handler.SetOutput(io.StringIO())
+        return TestBatchFrontend(test_output_handler)
+
+    def _CreateEntry(self, module_name, queries):
+        """Creates a manifest entry of the SQLite plugin scaffolder.
+
+        Args:
+          module_name (str): name of the module.
+          queries (dict[str, str]): SQL queries per callback name.
+
+        Returns:
+          batch.ManifestEntry: manifest entry.
+        """
+        answers = {
+            "queries": queries,
+            "required_tables": ["bar"],
+            "test_file": os.path.join(os.getcwd(), "test_data", "test_sqlite.db"),
+        }
+        return batch.ManifestEntry(
+            definition="plaso",
+            project_path=self.root_directory.name,
+            scaffolder="sqlite",
+            module_name=module_name,
+            answers=answers,
+        )
+
+    def testGenerateModules(self):
+        """Tests generating multiple modules."""
+        test_frontend = self._CreateFrontend()
+        entries = [
+            self._CreateEntry("batch one", {"Foo": "SELECT foo FROM bar;"}),
+            self._CreateEntry("batch two", {"Bar": "SELECT bar FROM bar;"}),
+        ]
+
+        result = test_frontend.GenerateModules(entries)
+        self.assertTrue(result)
+
+        for file_name in ("batch_one.py", "batch_two.py"):
+            path = os.path.join(
+                self.root_directory.name,
+                "plaso",
+                "parsers",
+                "sqlite_plugins",
+                file_name,
+            )
+            self.assertTrue(os.path.isfile(path))
+
+        test_frontend.git_helper.AddFilesToTrack.assert_called_once()
+        file_paths = test_frontend.git_helper.AddFilesToTrack.call_args[0][0]
+        self.assertIn(
+            os.path.join("plaso", "parsers", "sqlite_plugins", "batch_one.py"),
+            file_paths,
+        )
+        self.assertIn(
+            os.path.join("plaso", "parsers", "sqlite_plugins", "batch_two.py"),
+            file_paths,
+        )
+        self.assertEqual(len(file_paths), len(set(file_paths)))
+
+    def testGenerateModulesDryRun(self):
+        """Tests generating modules without writing them to disk."""
+        test_output_handler = frontend_test.TestOutputHandler()
+        string_buffer = io.StringIO()
+        test_output_handler.SetOutput(string_buffer)
+        test_frontend = TestBatchFrontend(test_output_handler, dry_run=True)
+
+        entries = [self._CreateEntry("batch dry", {"Foo": "SELECT foo FROM bar;"})]
+
+        result = test_frontend.GenerateModules(entries)
+        self.assertTrue(result)
+
+        path = os.path.join(
+            self.root_directory.name,
+            "plaso",
+            "parsers",
+            "sqlite_plugins",
+            "batch_dry.py",
+        )
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(test_frontend.git_helper.AddFilesToTrack.called)
+        self.assertIn(
+            "+++ b/plaso/parsers/sqlite_plugins/batch_dry.py", string_buffer.getvalue()
+        )
+
+    def testGenerateModulesWithInvalidAnswer(self):
+        """Tests that nothing is generated when an answer is invalid."""
+        test_frontend = self._CreateFrontend()
+        entries = [
+            self._CreateEntry("batch valid", {"Foo": "SELECT foo FROM bar;"}),
+            self._CreateEntry("batch invalid", {"foo": "SELECT foo FROM bar;"}),
+        ]
+
+        result = test_frontend.GenerateModules(entries)
+        self.assertFalse(result)
+
+        path = os.path.join(
+            self.root_directory.name,
+            "plaso",
+            "parsers",
+            "sqlite_plugins",
+            "batch_valid.py",
+        )
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(test_frontend.git_helper.AddFilesToTrack.called)
+
+        entries = [self._CreateEntry("batch", {"Foo": "SELECT foo FROM bar;"})]
+        del entries[0].answers["required_tables"]
+        self.assertFalse(test_frontend.GenerateModules(entries))
+
+        entries = [self._CreateEntry("batch", {"Foo": "SELECT foo FROM bar;"})]
+        entries[0].scaffolder = "bogus"
+        self.assertFalse(test_frontend.GenerateModules(entries))
+
+        entries = [self._CreateEntry("batch", {"Foo": "SELECT foo FROM bar;"})]
+        entries[0].answers["minimize_test_file"] = "yes"
+        self.assertFalse(test_frontend.GenerateModules(entries))
+
+    def testGenerateModulesWithFailingModule(self):
+        """Tests that other modules are generated when one module fails."""
+        test_output_handler = frontend_test.TestOutputHandler()
+        string_buffer = io.StringIO()
+        test_output_handler.SetOutput(string_buffer)
+        test_frontend = TestBatchFrontend(test_output_handler)
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            corrupt_file = os.path.join(temporary_directory, "corrupt.db")
+            with open(corrupt_file, "wb") as file_object:
+                file_object.write(b"SQLite format 3\x00" + b"\xff" * 4096)
+
+            entries = [
+                self._CreateEntry("batch corrupt", {"Foo": "SELECT foo FROM bar;"}),
+                self._CreateEntry("batch intact", {"Foo": "SELECT foo FROM bar;"}),
+            ]
+            entries[0].answers["test_file"] = corrupt_file
+
+            result = test_frontend.GenerateModules(entries)
+
+        self.assertFalse(result)
+        self.assertIn(
+            "Unable to generate module: BatchCorrupt with error:",
+            string_buffer.getvalue(),
+        )
+
+        path = os.path.join(
+            self.root_directory.name,
+            "plaso",
+            "parsers",
+            "sqlite_plugins",
+            "batch_intact.py",
+        )
+        self.assertTrue(os.path.isfile(path))
+
+    def testStart(self):
+        """Tests that the git helpers are closed after generating modules."""
+        test_frontend = self._CreateFrontend()
+        git_helper = MagicMock()
+        # pylint: disable=protected-access
+        test_frontend._git_helpers[self.root_directory.name] = git_helper
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            manifest_path = os.path.join(temporary_directory, "manifest.json")
+            with open(manifest_path, "w", encoding="utf-8") as file_object:
+                json.dump({"modules": []}, file_object)
+
+            test_frontend.Start(manifest_path)
+
+        git_helper.Close.assert_called_once()
+        self.assertEqual(test_frontend._git_helpers, {})
+
+    def testStartWithWorkersInNewProcess(self):
+        """Tests rendering modules concurrently in a new Python process.
+
+        yapf and the worker processes of the code formatter are only set up
+        when the first module is rendered, which a new process is needed for.
+        """
+        test_file = os.path.join(os.getcwd(), "test_data", "test_sqlite.db")
+        modules = [
+            {
+                "definition": "plaso",
+                "project_path": self.root_directory.name,
+                "scaffolder": "sqlite",
+                "module_name": "worker_{0:d}".format(index),
+                "answers": {
+                    "queries": {"Foo": "SELECT foo FROM bar;"},
+                    "required_tables": ["bar"],
+                    "test_file": test_file,
+                },
+            }
+            for index in range(8)
+        ]
+
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.getcwd()
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            manifest_path = os.path.join(temporary_directory, "manifest.json")
+            with open(manifest_path, "w", encoding="utf-8") as file_object:
+                json.dump({"modules": modules}, file_object)
+
+            process = subprocess.run(
+                [
+                    sys.executable,
+                    os.path.join("tools", "l2t_scaffolder.py"),
+                    "--manifest",
+                    manifest_path,
+                    "--workers",
+                    "4",
+                    "--dry-run",
+                ],
+                capture_output=True,
+                check=True,
+                encoding="utf-8",
+                env=environment,
+            )
+
+        self.assertNotIn("Unable to generate module", process.stdout)
+        self.assertNotIn("Unable to generate module", process.stderr)
+        for index in range(8):
+            self.assertIn("Generated module: Worker{0:d}".format(index), process.stdout)
+
+    def testReadManifest(self):
+        """Tests reading a manifest file."""
+        test_frontend = self._CreateFrontend()
+        manifest = {
+            "modules": [
+                {
+                    "definition": "plaso",
+                    "project_path": "plaso_tree",
+                    "scaffolder": "sqlite",
+                    "module_name": "foobar",
+                    "answers": {"required_tables": ["bar"]},
+                }
+            ]
+        }
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            manifest_path = os.path.join(temporary_directory, "manifest.json")
+            with open(manifest_path, "w", encoding="utf-8") as file_object:
+                json.dump(manifest, file_object)
+
+            entries = test_frontend.ReadManifest(manifest_path)
+
+            self.assertEqual(len(entries), 1)
+            self.assertEqual(
+                entries[0].project_path,
+                os.path.join(os.path.abspath(temporary_directory), "plaso_tree"),
+            )
+            self.assertEqual(entries[0].scaffolder, "sqlite")
+            self.assertEqual(entries[0].answers, {"required_tables": ["bar"]})
+
+            manifest["modules"][0]["bogus"] = True
+            with open(manifest_path, "w", encoding="utf-8") as file_object:
+                json.dump(manifest, file_object)
+
+            with self.assertRaises(errors.WrongCliInput):
+                test_frontend.ReadManifest(manifest_path)
+
+            with open(manifest_path, "w", encoding="utf-8") as file_object:
+                file_object.write("{")
+
+            with self.assertRaises(errors.WrongCliInput):
+                test_frontend.ReadManifest(manifest_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
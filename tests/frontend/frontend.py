@@ -229,6 +229,9 @@ class ScaffolderFrontendTest(unittest.TestCase):
         test_frontend = TestFrontend(test_output_handler)
         test_frontend.Start("plaso")
 
+        # The git helper is closed, which stops the git processes it started.
+        test_frontend._mock.Close.assert_called_once()  # pylint: disable=protected-access
+
         string_buffer.seek(0)
         lines = string_buffer.read().split("\n")
         first_line = lines[0]
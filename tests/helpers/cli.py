@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Tests for command line helper."""
 
+import os
+import tempfile
 import unittest
 
 from l2tscaffolder.helpers import cli
@@ -26,6 +28,20 @@ class CLIHelperTest(unittest.TestCase):
         self.assertEqual(stdout, "hello\n")
         self.assertEqual(stderr, "")
 
+    def testRunCommandWithWorkingDirectory(self):
+        """Tests running a command in a working directory."""
+        test_helper = cli.CLIHelper()
+        cwd = os.getcwd()
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            exit_code, stdout, _ = test_helper.RunCommand(
+                "pwd -P", cwd=temporary_directory
+            )
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(stdout.strip(), os.path.realpath(temporary_directory))
+
+        self.assertEqual(os.getcwd(), cwd)
+
 
 if __name__ == "__main__":
     unittest.main()
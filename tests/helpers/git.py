@@ -1,19 +1,181 @@
 #!/usr/bin/env python3
 """Tests for the git helper."""
 
+import os
+import shutil
+import subprocess
+import tempfile
 import unittest
 
+from concurrent import futures
+from unittest import mock
+
 from l2tscaffolder.helpers import git
 
 
 class GitHelperTest(unittest.TestCase):
     """Tests the git helper"""
 
+    def _CreateRepository(self, temporary_directory, number_of_files):
+        """Creates a git repository with untracked files.
+
+        Args:
+          temporary_directory (str): path of the repository.
+          number_of_files (int): number of untracked files to create.
+
+        Returns:
+          list[str]: paths of the untracked files, relative to the repository.
+        """
+        subprocess.run(["git", "init", "-q", temporary_directory], check=True)
+        os.makedirs(os.path.join(temporary_directory, "sub dir"))
+
+        file_paths = []
+        for index in range(number_of_files):
+            file_path = os.path.join("sub dir", "file {0:d}.py".format(index))
+            with open(
+                os.path.join(temporary_directory, file_path), "w", encoding="utf-8"
+            ) as file_object:
+                file_object.write("\n")
+            file_paths.append(file_path)
+
+        return file_paths
+
+    def _GetStagedFiles(self, temporary_directory):
+        """Retrieves the staged files of a git repository.
+
+        Args:
+          temporary_directory (str): path of the repository.
+
+        Returns:
+          set[str]: paths of the staged files, relative to the repository.
+        """
+        output = subprocess.run(
+            ["git", "diff", "--cached", "--name-only", "-z"],
+            capture_output=True,
+            check=True,
+            cwd=temporary_directory,
+        ).stdout
+        return set(output.decode("utf-8").split("\0")) - {""}
+
     def testInitialize(self):
         """Tests that the helper can be initialized."""
         helper = git.GitHelper("https://github.com/log2timeline/l2tdevtools.git")
         self.assertIsNotNone(helper)
 
+    @unittest.skipUnless(shutil.which("git"), "git is not available")
+    def testAddFilesToTrack(self):
+        """Tests adding files to track with a single git command."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            file_paths = self._CreateRepository(temporary_directory, 3)
+
+            helper = git.GitHelper(temporary_directory)
+            helper.AddFilesToTrack([])
+            self.assertEqual(self._GetStagedFiles(temporary_directory), set())
+
+            helper.AddFilesToTrack(file_paths[:2])
+            self.assertEqual(
+                self._GetStagedFiles(temporary_directory), set(file_paths[:2])
+            )
+
+            helper.AddFileToTrack(file_paths[2])
+            self.assertEqual(self._GetStagedFiles(temporary_directory), set(file_paths))
+
+    @unittest.skipUnless(shutil.which("git"), "git is not available")
+    def testAddFilesToTrackWithMissingFile(self):
+        """Tests that a missing file does not prevent adding the other files."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            file_paths = self._CreateRepository(temporary_directory, 2)
+
+            helper = git.GitHelper(temporary_directory)
+            helper.AddFilesToTrack(
+                [file_paths[0], os.path.join("sub dir", "__init__.py"), file_paths[1]]
+            )
+            self.assertEqual(self._GetStagedFiles(temporary_directory), set(file_paths))
+
+    @unittest.skipUnless(shutil.which("git"), "git is not available")
+    def testAddFilesToTrackWithPathspecFile(self):
+        """Tests adding more files than fit the command line."""
+        # pylint: disable=protected-access
+        number_of_files = git.GitHelper._MAXIMUM_NUMBER_OF_PATH_ARGUMENTS + 1
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            file_paths = self._CreateRepository(temporary_directory, number_of_files)
+
+            helper = git.GitHelper(temporary_directory)
+            helper.AddFilesToTrack(file_paths)
+            self.assertEqual(self._GetStagedFiles(temporary_directory), set(file_paths))
+
+    @unittest.skipUnless(shutil.which("git"), "git is not available")
+    def testRunCommandFromThreads(self):
+        """Tests running git commands for multiple projects concurrently."""
+        cwd = os.getcwd()
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            file_paths_per_project = {}
+            for index in range(4):
+                project_path = os.path.join(
+                    temporary_directory, "project{0:d}".format(index)
+                )
+                file_paths_per_project[project_path] = self._CreateRepository(
+                    project_path, index + 1
+                )
+
+            def _AddFiles(project_path):
+                """Adds the files of a project to track.
+
+                Args:
+                  project_path (str): path of the project.
+                """
+                helper = git.GitHelper(project_path)
+                helper.AddFilesToTrack(file_paths_per_project[project_path])
+
+            # The working directory of the process must never change, since
+            # that would affect all other threads.
+            with mock.patch("os.chdir", side_effect=AssertionError("os.chdir")):
+                with futures.ThreadPoolExecutor(max_workers=4) as executor:
+                    list(executor.map(_AddFiles, file_paths_per_project.keys()))
+
+            self.assertEqual(os.getcwd(), cwd)
+            for project_path, file_paths in file_paths_per_project.items():
+                self.assertEqual(self._GetStagedFiles(project_path), set(file_paths))
+
+    @unittest.skipUnless(shutil.which("git"), "git is not available")
+    def testBranches(self):
+        """Tests creating, looking up and switching branches."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            subprocess.run(
+                ["git", "init", "-q", "-b", "main", temporary_directory], check=True
+            )
+            subprocess.run(
+                [
+                    "git",
+                    "-c",
+                    "user.name=Test",
+                    "-c",
+                    "user.email=test@example.com",
+                    "commit",
+                    "-q",
+                    "--allow-empty",
+                    "-m",
+                    "Test",
+                ],
+                check=True,
+                cwd=temporary_directory,
+            )
+
+            helper = git.GitHelper(temporary_directory)
+            self.assertEqual(helper.GetActiveBranch(), "main")
+            self.assertFalse(helper.HasBranch("foo_bar"))
+
+            self.assertEqual(helper.CreateBranch("foo_bar"), 0)
+            self.assertTrue(helper.HasBranch("foo_bar"))
+
+            self.assertEqual(helper.SwitchToBranch("foo_bar"), 0)
+            self.assertEqual(helper.GetActiveBranch(), "foo_bar")
+            self.assertEqual(helper.SwitchToBranch("foo_bar"), 0)
+
+            helper.Close()
+
 
 if __name__ == "__main__":
     unittest.main()
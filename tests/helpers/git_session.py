@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Tests for the git session."""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from l2tscaffolder.helpers import git_session
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not available")
+class GitSessionTest(unittest.TestCase):
+    """Tests the git session."""
+
+    def _RunGit(self, project_path, *arguments):
+        """Runs a git command.
+
+        Args:
+          project_path (str): path of the git project.
+          arguments (list[str]): arguments of the git command.
+        """
+        subprocess.run(
+            [
+                "git",
+                "-c",
+                "user.name=Test",
+                "-c",
+                "user.email=test@example.com",
+                *arguments,
+            ],
+            capture_output=True,
+            check=True,
+            cwd=project_path,
+        )
+
+    def _CreateRepository(self, project_path):
+        """Creates a git repository with a commit on the "main" branch.
+
+        Args:
+          project_path (str): path of the git project.
+        """
+        self._RunGit(project_path, "init", "-q", "-b", "main")
+        self._RunGit(project_path, "commit", "-q", "--allow-empty", "-m", "Test")
+
+    def testGetActiveBranch(self):
+        """Tests determining the active branch."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            self._CreateRepository(temporary_directory)
+
+            session = git_session.GitSession(temporary_directory)
+            self.assertEqual(session.GetActiveBranch(), "main")
+
+            self._RunGit(temporary_directory, "checkout", "-q", "-b", "feature/foo")
+            self.assertEqual(session.GetActiveBranch(), "feature/foo")
+
+            self._RunGit(temporary_directory, "checkout", "-q", "--detach")
+            self.assertIsNone(session.GetActiveBranch())
+
+            session.Close()
+
+    def testGetActiveBranchWithReplacedHead(self):
+        """Tests that a replaced HEAD of the same size and time is read again."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            self._CreateRepository(temporary_directory)
+            self._RunGit(temporary_directory, "branch", "aaaa")
+            self._RunGit(temporary_directory, "branch", "bbbb")
+            self._RunGit(temporary_directory, "checkout", "-q", "aaaa")
+
+            session = git_session.GitSession(temporary_directory)
+            self.assertEqual(session.GetActiveBranch(), "aaaa")
+
+            # Replace HEAD like git does, by renaming a new file over it, with
+            # the same size and modification time.
+            head_path = os.path.join(temporary_directory, ".git", "HEAD")
+            stat_object = os.stat(head_path)
+            lock_path = "{0:s}.lock".format(head_path)
+            with open(lock_path, "w", encoding="utf-8") as file_object:
+                file_object.write("ref: refs/heads/bbbb\n")
+            os.utime(lock_path, ns=(stat_object.st_atime_ns, stat_object.st_mtime_ns))
+            os.replace(lock_path, head_path)
+
+            self.assertEqual(session.GetActiveBranch(), "bbbb")
+
+            session.Close()
+
+    def testHasBranch(self):
+        """Tests determining if a branch exists."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            self._CreateRepository(temporary_directory)
+
+            session = git_session.GitSession(temporary_directory)
+            self.assertTrue(session.HasBranch("main"))
+            self.assertFalse(session.HasBranch("foo"))
+            self.assertFalse(session.HasBranch("../HEAD"))
+            self.assertFalse(session.HasBranch("feature"))
+
+            self._RunGit(temporary_directory, "branch", "feature/foo")
+            self.assertTrue(session.HasBranch("feature/foo"))
+            self.assertFalse(session.HasBranch("feature"))
+
+            self._RunGit(temporary_directory, "pack-refs", "--all")
+            self.assertTrue(session.HasBranch("main"))
+            self.assertTrue(session.HasBranch("feature/foo"))
+
+            self._RunGit(temporary_directory, "branch", "-D", "feature/foo")
+            self.assertFalse(session.HasBranch("feature/foo"))
+
+            session.Close()
+
+    def testHasBranchWithProcess(self):
+        """Tests determining if a branch exists with git cat-file."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            self._CreateRepository(temporary_directory)
+            self._RunGit(temporary_directory, "branch", "foo")
+
+            # A folder inside the project does not contain the git directory.
+            project_path = os.path.join(temporary_directory, "sub")
+            os.makedirs(project_path)
+
+            session = git_session.GitSession(project_path)
+            self.assertIsNone(session.GetActiveBranch())
+            self.assertTrue(session.HasBranch("main"))
+            self.assertTrue(session.HasBranch("foo"))
+            self.assertFalse(session.HasBranch("bar"))
+
+            session.Close()
+            self.assertTrue(session.HasBranch("foo"))
+            session.Close()
+
+
+if __name__ == "__main__":
+    unittest.main()
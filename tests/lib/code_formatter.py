@@ -1,11 +1,20 @@
 #!/usr/bin/env python3
 """Tests for the code formatter."""
 
+import os
+import shlex
+import shutil
+import sys
+import tempfile
 import unittest
 
+from unittest import mock
+
 from yapf.yapflib import errors
 
 from l2tscaffolder.lib import code_formatter
+from l2tscaffolder.lib import errors as scaffolder_errors
+from l2tscaffolder.lib import format_cache
 from tests.test_helper import path_helper
 
 
@@ -47,6 +56,189 @@ class CodeFormatterTest(unittest.TestCase):
         self.assertTrue(code_changed)
         self.assertEqual(formatted_code, correct_code)
 
+    def testFormatCache(self):
+        """Tests that formatting results are cached."""
+        yapf_path = path_helper.YapfStyleFilePath()
+        formatter = code_formatter.CodeFormatter(yapf_path)
+        format_cache.FormatCache.Clear()
+
+        code_string = "foo = bar(1,2)\n"
+        result = formatter.Format(code_string)
+        self.assertEqual(result, ("foo = bar(1, 2)\n", True))
+        self.assertEqual(format_cache.FormatCache.GetStatistics(), (0, 1))
+
+        self.assertEqual(formatter.Format(code_string), result)
+        self.assertEqual(format_cache.FormatCache.GetStatistics(), (1, 1))
+
+    def testFormatMany(self):
+        """Tests formatting multiple pieces of code."""
+        yapf_path = path_helper.YapfStyleFilePath()
+        formatter = code_formatter.CodeFormatter(yapf_path)
+        format_cache.FormatCache.Clear()
+
+        code_strings = ["a = b(1,2)\n", "c = d(3,4)\n", "e = f(5,6)\n"]
+        expected_results = [
+            ("a = b(1, 2)\n", True),
+            ("c = d(3, 4)\n", True),
+            ("e = f(5, 6)\n", True),
+        ]
+
+        self.assertEqual(formatter.FormatMany(code_strings), expected_results)
+
+        format_cache.FormatCache.Clear()
+        code_formatter.CodeFormatter.SetNumberOfWorkers(2)
+        try:
+            results = formatter.FormatMany(code_strings)
+        finally:
+            code_formatter.CodeFormatter.SetNumberOfWorkers(1)
+
+        self.assertEqual(results, expected_results)
+        self.assertEqual(format_cache.FormatCache.GetStatistics(), (0, 3))
+
+        # The results of the worker processes are cached.
+        self.assertEqual(formatter.FormatMany(code_strings), expected_results)
+        self.assertEqual(format_cache.FormatCache.GetStatistics(), (3, 3))
+
+    def testGetPoolRegistersShutdown(self):
+        """Tests that the worker processes are shut down at exit."""
+        # pylint: disable=protected-access
+        yapf_path = path_helper.YapfStyleFilePath()
+        formatter = code_formatter.CodeFormatter(yapf_path)
+
+        code_formatter.CodeFormatter.SetNumberOfWorkers(2)
+        try:
+            with (
+                mock.patch.object(
+                    code_formatter.CodeFormatter, "_shutdown_registered", False
+                ),
+                mock.patch("atexit.register") as register_function,
+            ):
+                formatter._GetPool(0)
+                formatter._GetPool(0)
+        finally:
+            code_formatter.CodeFormatter.SetNumberOfWorkers(1)
+
+        register_function.assert_called_once_with(
+            code_formatter.CodeFormatter.ShutdownWorkers
+        )
+
+    def testStyleIsParsedOnce(self):
+        """Tests that the style is shared and only parsed when modified."""
+        yapf_path = path_helper.YapfStyleFilePath()
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            style_path = os.path.join(temporary_directory, ".style.yapf")
+            shutil.copyfile(yapf_path, style_path)
+
+            formatter = code_formatter.CodeFormatter(style_path)
+            other_formatter = code_formatter.CodeFormatter(style_path)
+
+            # pylint: disable=protected-access
+            _, parsed_style, _ = formatter._GetStyle()
+            _, other_parsed_style, _ = other_formatter._GetStyle()
+            self.assertIs(parsed_style, other_parsed_style)
+            self.assertEqual(parsed_style["INDENT_WIDTH"], 2)
+
+            with open(style_path, "w", encoding="utf-8") as file_object:
+                file_object.write("[style]\nbased_on_style = pep8\n")
+            os.utime(style_path, ns=(0, 0))
+
+            _, parsed_style, _ = formatter._GetStyle()
+            self.assertEqual(parsed_style["INDENT_WIDTH"], 4)
+
+            format_cache.FormatCache.Clear()
+            formatted_code, _ = formatter.Format("if a:\n  b = 1\n")
+
+        self.assertEqual(formatted_code, "if a:\n    b = 1\n")
+
+
+class ExternalCommandFormatterTest(unittest.TestCase):
+    """Test case for the external command formatter."""
+
+    def testFormatMany(self):
+        """Tests formatting code with an external command."""
+        yapf_path = path_helper.YapfStyleFilePath()
+        formatter = code_formatter.ExternalCommandFormatter(yapf_path)
+
+        code_formatter.ExternalCommandFormatter.SetCommand(
+            "{0:s} -m yapf --in-place --style={{style_path}}".format(
+                shlex.quote(sys.executable)
+            )
+        )
+        try:
+            results = formatter.FormatMany(["a = b(1,2)\n", "c = 3\n"])
+
+            code_formatter.ExternalCommandFormatter.SetCommand(
+                "{0:s} -c 'import sys; sys.exit(1)'".format(shlex.quote(sys.executable))
+            )
+            with self.assertRaises(scaffolder_errors.FormatterError):
+                formatter.Format("a = 1\n")
+
+        finally:
+            code_formatter.ExternalCommandFormatter.SetCommand(
+                "yapf --in-place --style={style_path}"
+            )
+
+        self.assertEqual(results, [("a = b(1, 2)\n", True), ("c = 3\n", False)])
+
+
+class PassthroughFormatterTest(unittest.TestCase):
+    """Test case for the passthrough formatter."""
+
+    def testFormat(self):
+        """Tests that code is left unformatted."""
+        formatter = code_formatter.PassthroughFormatter("")
+        self.assertEqual(formatter.Format("a=b(1,2)\n"), ("a=b(1,2)\n", False))
+        self.assertEqual(
+            formatter.FormatMany(["a=1", "b=2"]), [("a=1", False), ("b=2", False)]
+        )
+
+
+class FormatterManagerTest(unittest.TestCase):
+    """Test case for the formatter manager."""
+
+    def testGetFormatterByName(self):
+        """Tests retrieving formatters by name."""
+        manager = code_formatter.FormatterManager
+        self.assertEqual(manager.GetFormatterByName(""), code_formatter.CodeFormatter)
+        self.assertEqual(
+            manager.GetFormatterByName("passthrough"),
+            code_formatter.PassthroughFormatter,
+        )
+
+        with self.assertRaises(KeyError):
+            manager.GetFormatterByName("bogus")
+
+    def testSetDefaultFormatter(self):
+        """Tests setting the default formatter."""
+        manager = code_formatter.FormatterManager
+        manager.SetDefaultFormatter("passthrough")
+        try:
+            self.assertEqual(manager.GetDefaultFormatterName(), "passthrough")
+            self.assertEqual(
+                manager.GetFormatterByName(""), code_formatter.PassthroughFormatter
+            )
+        finally:
+            manager.SetDefaultFormatter("yapf")
+
+        with self.assertRaises(KeyError):
+            manager.SetDefaultFormatter("bogus")
+
+    def testRegisterFormatter(self):
+        """Tests registering and deregistering formatters."""
+        manager = code_formatter.FormatterManager
+        with self.assertRaises(KeyError):
+            manager.RegisterFormatter(code_formatter.PassthroughFormatter)
+
+        manager.DeregisterFormatter(code_formatter.PassthroughFormatter)
+        self.assertNotIn("passthrough", list(manager.GetFormatterNames()))
+
+        with self.assertRaises(KeyError):
+            manager.DeregisterFormatter(code_formatter.PassthroughFormatter)
+
+        manager.RegisterFormatter(code_formatter.PassthroughFormatter)
+        self.assertIn("passthrough", list(manager.GetFormatterNames()))
+
 
 if __name__ == "__main__":
     unittest.main()
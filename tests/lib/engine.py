@@ -2,12 +2,16 @@
 """Tests class for the scaffolder engine"""
 
 import os
+import tempfile
+import threading
 import unittest
 
 from l2tscaffolder.definitions import interface as definition_interface
 from l2tscaffolder.definitions import manager as definition_manager
 from l2tscaffolder.lib import engine
 from l2tscaffolder.lib import errors
+from l2tscaffolder.lib import file_handler
+from l2tscaffolder.lib import generation_manifest
 from l2tscaffolder.scaffolders import interface as scaffolder_interface
 
 
@@ -53,6 +57,81 @@ class AwesomeScaffolder(scaffolder_interface.Scaffolder):
         return iter(())
 
 
+class ContentScaffolder(AwesomeScaffolder):
+    """Test scaffolder that generates a file and changes an init file."""
+
+    NAME = "Content"
+
+    def GetInitFileChanges(self):
+        """Generate a list of init files that need changing and the changes to them.
+
+        Yields:
+          tuple(str, str): path to the init file and the entry to add to it.
+        """
+        yield "__init__.py", "from test import {0:s}\n".format(self._output_name)
+
+    def GenerateFiles(self):
+        """Generates a file, with content that is generated in chunks.
+
+        Yields:
+          tuple(str, iter[str]): file name and content of the file.
+        """
+        file_name = "{0:s}.py".format(self._output_name)
+        yield file_name, iter([self.test1, self.test2, self.test3])
+
+
+class DigestScaffolder(ContentScaffolder):
+    """Test scaffolder that calculates a digest of its inputs."""
+
+    NAME = "Digest"
+
+    def GetInputDigest(self):
+        """Calculates a digest of all inputs the generated files depend on.
+
+        Returns:
+          str: digest of the inputs.
+        """
+        return "".join([self.test1, self.test2, self.test3])
+
+
+class FailingScaffolder(ContentScaffolder):
+    """Test scaffolder that fails to generate its second file."""
+
+    NAME = "Failing"
+
+    def GenerateFiles(self):
+        """Generates a file and fails on the next one.
+
+        Yields:
+          tuple(str, str): file name and content of the file.
+
+        Raises:
+          FormatterError: always.
+        """
+        yield from super().GenerateFiles()
+        raise errors.FormatterError("Unable to format code.")
+
+
+class PreparingScaffolder(ContentScaffolder):
+    """Test scaffolder that records the thread it was prepared in."""
+
+    NAME = "Preparing"
+
+    def __init__(self):
+        super().__init__()
+        self.prepare_thread = None
+
+    def PrepareGeneration(self):
+        """Records the thread the scaffolder is prepared in.
+
+        Raises:
+          FormatterError: when the scaffolder is configured to fail.
+        """
+        self.prepare_thread = threading.current_thread()
+        if self.test1 == "fail":
+            raise errors.FormatterError("Unable to parse style.")
+
+
 class NotWrongDefinition(definition_interface.ScaffolderDefinition):
     """Definition for the not so wrong project."""
 
@@ -76,6 +155,238 @@ class ScaffolderEngineTest(unittest.TestCase):
     def setUpClass(cls):
         definition_manager.DefinitionManager.RegisterDefinition(NotWrongDefinition)
 
+    def _CreateScaffolder(self, value):
+        """Creates a configured content scaffolder.
+
+        Args:
+          value (str): value of the scaffolder attributes.
+
+        Returns:
+          ContentScaffolder: configured scaffolder.
+        """
+        test_scaffolder = ContentScaffolder()
+        for attribute in ("test1", "test2", "test3"):
+            test_scaffolder.SetAttribute(attribute, value, str)
+        return test_scaffolder
+
+    def testGenerateModules(self):
+        """Tests generating multiple modules concurrently."""
+        test_engine = engine.ScaffolderEngine()
+        module_names = ["module {0:d}".format(index) for index in range(8)]
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            init_path = os.path.join(temporary_directory, "__init__.py")
+            with open(init_path, "w", encoding="utf-8") as file_object:
+                file_object.write("")
+
+            test_engine.SetProjectRootPath(temporary_directory)
+            for module_name in module_names:
+                test_engine.AddModule(module_name, self._CreateScaffolder("a"))
+            test_engine.AddModule("not ready", ContentScaffolder())
+
+            reports = test_engine.GenerateModules(number_of_workers=4)
+
+            with open(init_path, encoding="utf-8") as file_object:
+                init_lines = file_object.readlines()
+
+            with open(
+                os.path.join(temporary_directory, "module_0.py"), encoding="utf-8"
+            ) as file_object:
+                content = file_object.read()
+
+        self.assertEqual(content, "aaa")
+
+        expected_names = ["Module{0:d}".format(index) for index in range(8)]
+        expected_names.append("NotReady")
+        self.assertEqual([report.module_name for report in reports], expected_names)
+
+        for index, report in enumerate(reports[:-1]):
+            file_name = "module_{0:d}.py".format(index)
+            self.assertEqual(
+                report.file_paths,
+                [os.path.join(temporary_directory, file_name), init_path],
+            )
+            self.assertFalse(report.error)
+
+        self.assertTrue(reports[-1].error)
+        self.assertEqual(reports[-1].file_paths, [])
+
+        expected_lines = [
+            "from test import module_{0:d}\n".format(index) for index in range(8)
+        ]
+        self.assertEqual(init_lines, expected_lines)
+
+        self.assertEqual(test_engine.GenerateModules(), [])
+
+    def testGenerateModulesPreparesScaffolders(self):
+        """Tests that scaffolders are prepared by the calling thread."""
+        test_engine = engine.ScaffolderEngine()
+        test_scaffolders = []
+        for value in ("a", "fail", "b"):
+            test_scaffolder = PreparingScaffolder()
+            for attribute in ("test1", "test2", "test3"):
+                test_scaffolder.SetAttribute(attribute, value, str)
+            test_scaffolders.append(test_scaffolder)
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            test_engine.SetProjectRootPath(temporary_directory)
+            for index, test_scaffolder in enumerate(test_scaffolders):
+                test_engine.AddModule("module {0:d}".format(index), test_scaffolder)
+
+            reports = test_engine.GenerateModules(number_of_workers=2)
+
+        for test_scaffolder in test_scaffolders:
+            self.assertIs(test_scaffolder.prepare_thread, threading.current_thread())
+
+        self.assertEqual(
+            [bool(report.error) for report in reports], [False, True, False]
+        )
+        self.assertEqual(reports[1].error, "Unable to parse style.")
+        self.assertEqual(reports[1].file_paths, [])
+        self.assertEqual(
+            reports[2].file_paths, [os.path.join(temporary_directory, "module_2.py")]
+        )
+
+    def testGenerateModulesWithoutInitFile(self):
+        """Tests that init files that do not exist are not reported."""
+        test_engine = engine.ScaffolderEngine()
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            test_engine.SetProjectRootPath(temporary_directory)
+            test_engine.AddModule("module", self._CreateScaffolder("a"))
+
+            reports = test_engine.GenerateModules()
+
+            self.assertEqual(os.listdir(temporary_directory), ["module.py"])
+
+        self.assertEqual(
+            reports[0].file_paths, [os.path.join(temporary_directory, "module.py")]
+        )
+
+    def testGenerateModulesInMemory(self):
+        """Tests generating modules with a memory file handler."""
+        test_engine = engine.ScaffolderEngine()
+        memory_file_handler = file_handler.MemoryFileHandler()
+        test_engine.SetFileHandler(memory_file_handler)
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            init_path = os.path.join(temporary_directory, "__init__.py")
+            with open(init_path, "w", encoding="utf-8") as file_object:
+                file_object.write("")
+
+            test_engine.SetProjectRootPath(temporary_directory)
+            test_engine.AddModule("first", self._CreateScaffolder("a"))
+            test_engine.AddModule("second", self._CreateScaffolder("b"))
+            reports = test_engine.GenerateModules()
+
+            self.assertEqual(os.listdir(temporary_directory), ["__init__.py"])
+            with open(init_path, encoding="utf-8") as file_object:
+                self.assertEqual(file_object.read(), "")
+
+            first_path = os.path.join(temporary_directory, "first.py")
+            second_path = os.path.join(temporary_directory, "second.py")
+            self.assertEqual(reports[0].file_paths, [first_path, init_path])
+            self.assertEqual(reports[1].file_paths, [second_path, init_path])
+            self.assertEqual(
+                memory_file_handler.GetFilePaths(), [init_path, first_path, second_path]
+            )
+            self.assertEqual(memory_file_handler.GetFileData(second_path), b"bbb")
+            self.assertEqual(
+                memory_file_handler.GetFileData(init_path),
+                b"from test import first\nfrom test import second\n",
+            )
+
+    def testGenerateModulesIncremental(self):
+        """Tests skipping modules of which none of the inputs changed."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            init_path = os.path.join(temporary_directory, "__init__.py")
+            with open(init_path, "w", encoding="utf-8") as file_object:
+                file_object.write("")
+
+            module_path = os.path.join(temporary_directory, "module.py")
+
+            def _GenerateModule(value):
+                """Generates the module incrementally."""
+                test_engine = engine.ScaffolderEngine()
+                test_engine.SetIncremental(True)
+                test_engine.SetProjectRootPath(temporary_directory)
+
+                test_scaffolder = DigestScaffolder()
+                for attribute in ("test1", "test2", "test3"):
+                    test_scaffolder.SetAttribute(attribute, value, str)
+
+                test_engine.AddModule("module", test_scaffolder)
+                return test_engine.GenerateModules()[0]
+
+            report = _GenerateModule("a")
+            self.assertEqual(report.file_paths, [module_path, init_path])
+            self.assertEqual(report.skipped_file_paths, [])
+            self.assertTrue(
+                os.path.isfile(
+                    os.path.join(
+                        temporary_directory,
+                        generation_manifest.GenerationManifest.FILENAME,
+                    )
+                )
+            )
+
+            report = _GenerateModule("a")
+            self.assertEqual(report.file_paths, [])
+            self.assertEqual(report.skipped_file_paths, [module_path])
+
+            # A changed input generates the module again, replacing the content
+            # of the previously generated file. The init file already contains
+            # the import, hence it is not changed.
+            report = _GenerateModule("b")
+            self.assertEqual(report.file_paths, [module_path])
+            with open(module_path, encoding="utf-8") as file_object:
+                self.assertEqual(file_object.read(), "bbb")
+
+            # A changed output generates the module again.
+            with open(module_path, "a", encoding="utf-8") as file_object:
+                file_object.write("changed")
+
+            report = _GenerateModule("b")
+            self.assertEqual(report.file_paths, [module_path])
+            with open(module_path, encoding="utf-8") as file_object:
+                self.assertEqual(file_object.read(), "bbb")
+
+            with open(init_path, encoding="utf-8") as file_object:
+                self.assertEqual(file_object.read(), "from test import module\n")
+
+    def testGenerateFilesRollback(self):
+        """Tests that a failure while generating files discards all changes."""
+        test_engine = engine.ScaffolderEngine()
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            init_path = os.path.join(temporary_directory, "__init__.py")
+            with open(init_path, "w", encoding="utf-8") as file_object:
+                file_object.write("")
+
+            test_engine.SetProjectRootPath(temporary_directory)
+            test_engine.SetModuleName("failing")
+
+            test_scaffolder = FailingScaffolder()
+            for attribute in ("test1", "test2", "test3"):
+                test_scaffolder.SetAttribute(attribute, "a", str)
+            test_engine.SetScaffolder(test_scaffolder)
+
+            with self.assertRaises(errors.FormatterError):
+                _ = list(test_engine.GenerateFiles())
+
+            self.assertEqual(os.listdir(temporary_directory), ["__init__.py"])
+
+            test_engine.SetScaffolder(self._CreateScaffolder("a"))
+            file_paths = list(test_engine.GenerateFiles())
+
+            self.assertEqual(
+                file_paths,
+                [os.path.join(temporary_directory, "failing.py"), init_path],
+            )
+            self.assertEqual(
+                sorted(os.listdir(temporary_directory)), ["__init__.py", "failing.py"]
+            )
+
     def testSetModuleName(self):
         """Tests setting the module name."""
         test_engine = engine.ScaffolderEngine()
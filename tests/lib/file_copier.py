@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Tests for the file copier."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from l2tscaffolder.lib import file_copier
+
+
+class FileCopierTest(unittest.TestCase):
+    """Tests for the file copier."""
+
+    # pylint: disable=protected-access
+
+    def setUp(self):
+        """Sets up the needed objects used throughout the test."""
+        file_copier.FileCopier.ResetStatistics()
+
+    def tearDown(self):
+        """Cleans up after running an individual test."""
+        file_copier.FileCopier.SetAllowHardLinks(False)
+
+    def _CreateFile(self, path, size):
+        """Creates a file with deterministic content.
+
+        Args:
+          path (str): path of the file.
+          size (int): size of the file.
+
+        Returns:
+          bytes: content of the file.
+        """
+        data = bytes(index % 251 for index in range(size))
+        with open(path, "wb") as file_object:
+            file_object.write(data)
+        return data
+
+    def _ReadFile(self, path):
+        """Reads the content of a file.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          bytes: content of the file.
+        """
+        with open(path, "rb") as file_object:
+            return file_object.read()
+
+    def testCopyFile(self):
+        """Tests copying a file."""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "source.db")
+            destination = os.path.join(directory, "destination.db")
+            data = self._CreateFile(source, 3 * 1024 * 1024 + 7)
+
+            method = file_copier.FileCopier.CopyFile(source, destination)
+
+            self.assertNotEqual(method, file_copier.FileCopier.METHOD_HARD_LINK)
+            self.assertEqual(self._ReadFile(destination), data)
+            self.assertFalse(os.path.samefile(source, destination))
+            self.assertEqual(file_copier.FileCopier.GetStatistics(), {method: 1})
+
+            with self.assertRaises(shutil.SameFileError):
+                file_copier.FileCopier.CopyFile(source, source)
+
+    def testCopyFileFallback(self):
+        """Tests copying a file when the faster copy methods are not supported."""
+        copier = file_copier.FileCopier
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "source.db")
+            destination = os.path.join(directory, "destination.db")
+            data = self._CreateFile(source, 1024 * 1024 + 3)
+
+            with mock.patch.object(copier, "_CopyWithReflink", return_value=False):
+                with mock.patch.object(
+                    copier, "_CopyWithCopyFileRange", return_value=False
+                ):
+                    method = copier.CopyFile(source, destination)
+                    self.assertEqual(self._ReadFile(destination), data)
+                    self.assertIn(
+                        method, [copier.METHOD_SENDFILE, copier.METHOD_BUFFERED]
+                    )
+
+                    with mock.patch.object(
+                        copier, "_CopyWithSendfile", return_value=False
+                    ):
+                        method = copier.CopyFile(source, destination)
+                        self.assertEqual(self._ReadFile(destination), data)
+                        self.assertEqual(method, copier.METHOD_BUFFERED)
+
+    def testCopyFileWithHardLinks(self):
+        """Tests copying a file by hard linking it."""
+        file_copier.FileCopier.SetAllowHardLinks(True)
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "source.db")
+            destination = os.path.join(directory, "destination.db")
+            self._CreateFile(source, 1024)
+
+            method = file_copier.FileCopier.CopyFile(source, destination)
+
+            self.assertEqual(method, file_copier.FileCopier.METHOD_HARD_LINK)
+            self.assertTrue(os.path.samefile(source, destination))
+
+    def testIsIdentical(self):
+        """Tests determining if a file has the same content as its copy."""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "source.db")
+            destination = os.path.join(directory, "destination.db")
+            self._CreateFile(source, 2048)
+
+            self.assertFalse(file_copier.FileCopier.IsIdentical(source, destination))
+
+            shutil.copyfile(source, destination)
+            self.assertTrue(file_copier.FileCopier.IsIdentical(source, destination))
+
+            with open(destination, "r+b") as file_object:
+                file_object.seek(1024)
+                file_object.write(b"\xff")
+
+            self.assertFalse(file_copier.FileCopier.IsIdentical(source, destination))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,10 @@ import filecmp
 import os
 import tempfile
 import unittest
+from unittest import mock
 
+from l2tscaffolder.lib import errors
+from l2tscaffolder.lib import file_copier
 from l2tscaffolder.lib import file_handler
 
 
@@ -81,6 +84,30 @@ class FileHandlerTest(unittest.TestCase):
             self.assertTrue(os.path.exists(destination))
             self.assertTrue(filecmp.cmp(destination, source))
 
+    def testCopyFileIfIdentical(self):
+        """Tests that a file is not copied if the copy is identical."""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, self.file)
+            destination = os.path.join(directory, "copy", self.file)
+            with open(source, "w", encoding="utf-8") as file_object:
+                file_object.write("test content.")
+
+            handler = file_handler.FileHandler()
+            handler.CopyFile(source, destination)
+
+            with mock.patch.object(file_copier.FileCopier, "CopyFile") as copy_file:
+                handler.CopyFile(source, destination)
+                copy_file.assert_not_called()
+
+                with open(source, "a", encoding="utf-8") as file_object:
+                    file_object.write("more")
+
+                handler.CopyFile(source, destination)
+                copy_file.assert_called_once()
+
+            with self.assertRaises(errors.FileHandlingError):
+                handler.CopyFile(source, source)
+
     def testAddContentIfFileExists(self):
         """Tests if the editing of a file existing works."""
         content = "this is test content. "
@@ -118,6 +145,40 @@ class FileHandlerTest(unittest.TestCase):
 
         self.assertEqual(expected, actual)
 
+    def testAddContentFromChunks(self):
+        """Tests adding content that is generated in chunks."""
+        chunks = ["this is ", "test ", "content."]
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, self.file)
+            handler = file_handler.FileHandler()
+            handler.AddContent(source, iter(chunks))
+
+            with open(source, encoding="utf-8") as file_object:
+                actual = file_object.read()
+
+        self.assertEqual("".join(chunks), actual)
+
+    def testReplaceContent(self):
+        """Tests replacing the content of a file."""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, self.file)
+            handler = file_handler.FileHandler()
+            self.assertEqual(handler.CalculateDigest(source), "")
+
+            handler.AddContent(source, "old content.")
+            handler.ReplaceContent(source, iter(["new ", "content."]))
+
+            with open(source, encoding="utf-8") as file_object:
+                actual = file_object.read()
+
+            self.assertEqual(
+                handler.CalculateDigest(source),
+                "e31f3aca5804f74e69bde085edd53f535e05fc3ca769d6a1480ddba68b23c312",
+            )
+
+        self.assertEqual("new content.", actual)
+
     def testCreateOrModifyFileWithContentIfFileExists(self):
         """Tests creation or modification of existing file with content."""
         content = "this is test content. "
@@ -184,6 +245,180 @@ class FileHandlerTest(unittest.TestCase):
 
         self.assertEqual(content, expected_content)
 
+    def testAddImportsToInit(self):
+        """Tests adding multiple lines to an init file."""
+        test_content = (
+            '"""Imports."""\n'
+            "\n"
+            "from project import bar\n"
+            "from project import foo\n"
+            "\n"
+            "value = 1\n"
+        )
+        new_imports = [
+            "from project import zulu\n",
+            "from project import alpha\n",
+            "from project import foo\n",
+            "from project import baz\n",
+            "from project import alpha\n",
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "__init__.py")
+            with open(path, "w", encoding="utf-8") as file_object:
+                file_object.write(test_content)
+
+            handler = file_handler.FileHandler()
+            self.assertTrue(handler.AddImportsToInit(path, new_imports))
+            self.assertFalse(handler.AddImportsToInit(path, new_imports))
+            self.assertFalse(
+                handler.AddImportsToInit(
+                    os.path.join(directory, "bogus", "__init__.py"), new_imports
+                )
+            )
+
+            with open(path, encoding="utf-8") as file_object:
+                content = file_object.read()
+
+        expected_content = (
+            '"""Imports."""\n'
+            "\n"
+            "from project import alpha\n"
+            "from project import bar\n"
+            "from project import baz\n"
+            "from project import foo\n"
+            "\n"
+            "value = 1\n"
+            "from project import zulu\n"
+        )
+        self.assertEqual(content, expected_content)
+
+
+class MemoryFileHandlerTest(unittest.TestCase):
+    """Tests for the MemoryFileHandler class."""
+
+    maxDiff = None
+
+    def testAddContent(self):
+        """Tests adding content to files in memory."""
+        with tempfile.TemporaryDirectory() as directory:
+            existing_path = os.path.join(directory, "existing.py")
+            with open(existing_path, "w", encoding="utf-8") as file_object:
+                file_object.write("old\n")
+
+            new_path = os.path.join(directory, "new", "new.py")
+
+            handler = file_handler.MemoryFileHandler()
+            handler.AddContent(existing_path, "new\n")
+            handler.AddContent(new_path, iter(["new ", "content\n"]))
+            handler.AddContent(new_path, "more\n")
+
+            self.assertEqual(os.listdir(directory), ["existing.py"])
+            with open(existing_path, encoding="utf-8") as file_object:
+                self.assertEqual(file_object.read(), "old\n")
+
+            self.assertEqual(handler.GetFilePaths(), [existing_path, new_path])
+            self.assertEqual(handler.GetFileData(existing_path), b"old\nnew\n")
+            self.assertEqual(handler.GetFileData(new_path), b"new content\nmore\n")
+
+    def testAddImportsToInit(self):
+        """Tests adding imports to an init file in memory."""
+        with tempfile.TemporaryDirectory() as directory:
+            init_path = os.path.join(directory, "__init__.py")
+            with open(init_path, "w", encoding="utf-8") as file_object:
+                file_object.write("from project import bar\n")
+
+            handler = file_handler.MemoryFileHandler()
+            handler.AddImportsToInit(init_path, ["from project import alpha\n"])
+            handler.AddImportsToInit(init_path, ["from project import zulu\n"])
+            handler.AddImportsToInit(
+                os.path.join(directory, "missing.py"), ["from project import foo\n"]
+            )
+
+            with open(init_path, encoding="utf-8") as file_object:
+                self.assertEqual(file_object.read(), "from project import bar\n")
+
+        self.assertEqual(handler.GetFilePaths(), [init_path])
+        self.assertEqual(
+            handler.GetFileData(init_path),
+            (
+                b"from project import alpha\n"
+                b"from project import bar\n"
+                b"from project import zulu\n"
+            ),
+        )
+
+    def testCopyFile(self):
+        """Tests copying a file in memory."""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "source.db")
+            with open(source, "wb") as file_object:
+                file_object.write(b"\xff\x00data")
+
+            destination = os.path.join(directory, "test_data", "destination.db")
+
+            handler = file_handler.MemoryFileHandler()
+            handler.CopyFile(source, destination)
+
+            with self.assertRaises(errors.FileHandlingError):
+                handler.CopyFile(source, source)
+
+            self.assertFalse(os.path.exists(destination))
+            self.assertEqual(handler.GetFileData(destination), b"\xff\x00data")
+
+            diff = handler.GetDiff(root_path=directory)
+
+        expected_diff = (
+            "Binary files a/test_data/destination.db and b/test_data/destination.db "
+            "differ\n"
+        )
+        self.assertEqual(diff, expected_diff)
+
+    def testGetDiff(self):
+        """Tests retrieving the changes as a unified diff."""
+        with tempfile.TemporaryDirectory() as directory:
+            existing_path = os.path.join(directory, "existing.py")
+            with open(existing_path, "w", encoding="utf-8") as file_object:
+                file_object.write("old\n")
+
+            handler = file_handler.MemoryFileHandler()
+            handler.AddContent(existing_path, "new\n")
+            handler.AddContent(os.path.join(directory, "new.py"), "content")
+
+            diff = handler.GetDiff(root_path=directory)
+
+        expected_diff = (
+            "--- a/existing.py\n"
+            "+++ b/existing.py\n"
+            "@@ -1 +1,2 @@\n"
+            " old\n"
+            "+new\n"
+            "--- a/new.py\n"
+            "+++ b/new.py\n"
+            "@@ -0,0 +1 @@\n"
+            "+content\n"
+            "\\ No newline at end of file\n"
+        )
+        self.assertEqual(diff, expected_diff)
+
+    def testWriteToDisk(self):
+        """Tests writing the changed files to disk."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "new", "new.py")
+
+            handler = file_handler.MemoryFileHandler()
+            handler.AddContent(path, "content\n")
+            file_paths = handler.WriteToDisk(directory)
+
+            with open(path, encoding="utf-8") as file_object:
+                content = file_object.read()
+
+            self.assertEqual(file_paths, [path])
+            self.assertEqual(sorted(os.listdir(directory)), ["new"])
+
+        self.assertEqual(content, "content\n")
+        self.assertEqual(handler.GetFilePaths(), [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Tests for the format cache."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from l2tscaffolder.lib import format_cache
+
+
+class FormatCacheTest(unittest.TestCase):
+    """Tests for the format cache."""
+
+    def setUp(self):
+        """Makes sure each test starts with an empty cache."""
+        format_cache.FormatCache.Clear()
+
+    def tearDown(self):
+        """Cleans up the cache."""
+        format_cache.FormatCache.Clear()
+
+    def testCalculateDigest(self):
+        """Tests calculating the digest of formatting inputs."""
+        digest = format_cache.FormatCache.CalculateDigest("a = 1\n", b"style", "1.0")
+        self.assertEqual(len(digest), 64)
+
+        self.assertEqual(
+            digest,
+            format_cache.FormatCache.CalculateDigest("a = 1\n", b"style", "1.0"),
+        )
+        self.assertNotEqual(
+            digest,
+            format_cache.FormatCache.CalculateDigest("a = 1\n", b"style", "1.1"),
+        )
+        self.assertNotEqual(
+            digest,
+            format_cache.FormatCache.CalculateDigest("a = 1\ns", b"tyle", "1.0"),
+        )
+
+    def testGetResult(self):
+        """Tests storing and retrieving formatting results in memory."""
+        digest = format_cache.FormatCache.CalculateDigest("a=1\n", b"", "1.0")
+        self.assertIsNone(format_cache.FormatCache.GetResult(digest))
+
+        format_cache.FormatCache.StoreResult(digest, ("a = 1\n", True))
+        result = format_cache.FormatCache.GetResult(digest)
+        self.assertEqual(result, ("a = 1\n", True))
+        self.assertEqual(format_cache.FormatCache.GetStatistics(), (1, 1))
+
+    def testOnDiskCache(self):
+        """Tests persisting formatting results on disk."""
+        digest = format_cache.FormatCache.CalculateDigest("b=2\n", b"", "1.0")
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            cache_path = os.path.join(temporary_directory, "yapf")
+            format_cache.FormatCache.SetCachePath(cache_path)
+            try:
+                format_cache.FormatCache.StoreResult(digest, ("b = 2\n", True))
+                self.assertEqual(len(os.listdir(cache_path)), 1)
+
+                # Results are read back from disk after clearing the memory.
+                format_cache.FormatCache.Clear()
+                result = format_cache.FormatCache.GetResult(digest)
+            finally:
+                format_cache.FormatCache.SetCachePath("")
+
+        self.assertEqual(result, ("b = 2\n", True))
+
+    def testOnDiskCacheEviction(self):
+        """Tests that the on-disk cache is bounded in size."""
+        maximum_cache_size = format_cache.FormatCache.MAXIMUM_CACHE_SIZE
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            format_cache.FormatCache.SetCachePath(temporary_directory)
+            format_cache.FormatCache.MAXIMUM_CACHE_SIZE = 0
+            try:
+                digest = format_cache.FormatCache.CalculateDigest("c=3\n", b"", "1.0")
+                format_cache.FormatCache.StoreResult(digest, ("c = 3\n", True))
+                cache_files = os.listdir(temporary_directory)
+            finally:
+                format_cache.FormatCache.MAXIMUM_CACHE_SIZE = maximum_cache_size
+                format_cache.FormatCache.SetCachePath("")
+
+        self.assertEqual(cache_files, [])
+
+        # The result is still cached in memory.
+        self.assertEqual(format_cache.FormatCache.GetResult(digest), ("c = 3\n", True))
+
+    def testOnDiskCacheEvictionScans(self):
+        """Tests that the on-disk cache is not scanned for every write."""
+        maximum_cache_size = format_cache.FormatCache.MAXIMUM_CACHE_SIZE
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            format_cache.FormatCache.SetCachePath(temporary_directory)
+            format_cache.FormatCache.MAXIMUM_CACHE_SIZE = 4096
+            try:
+                with mock.patch("os.scandir", side_effect=os.scandir) as mock_scandir:
+                    for index in range(100):
+                        code = "d = {0:d}\n".format(index)
+                        digest = format_cache.FormatCache.CalculateDigest(
+                            code, b"", "1.0"
+                        )
+                        format_cache.FormatCache.StoreResult(digest, (code, True))
+
+                cache_size = sum(
+                    os.path.getsize(os.path.join(temporary_directory, file_name))
+                    for file_name in os.listdir(temporary_directory)
+                )
+            finally:
+                format_cache.FormatCache.MAXIMUM_CACHE_SIZE = maximum_cache_size
+                format_cache.FormatCache.SetCachePath("")
+
+        self.assertLessEqual(cache_size, 4096)
+        self.assertGreater(cache_size, 0)
+        self.assertLess(mock_scandir.call_count, 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Tests for the generation manifest."""
+
+import os
+import tempfile
+import unittest
+
+from l2tscaffolder.lib import file_handler
+from l2tscaffolder.lib import generation_manifest
+
+
+class GenerationManifestTest(unittest.TestCase):
+    """Tests for the generation manifest."""
+
+    def testReadAndWrite(self):
+        """Tests writing and reading a manifest."""
+        with tempfile.TemporaryDirectory() as root_path:
+            manifest = generation_manifest.GenerationManifest(root_path)
+            self.assertEqual(manifest.GetModule("sqlite:foo"), ("", {}))
+
+            file_path = os.path.join(root_path, "plaso", "foo.py")
+            manifest.SetModule("sqlite:foo", "1234", {file_path: "abcd"})
+            manifest_path = manifest.Write(file_handler.FileHandler())
+            self.assertEqual(
+                manifest_path,
+                os.path.join(
+                    root_path, generation_manifest.GenerationManifest.FILENAME
+                ),
+            )
+
+            manifest = generation_manifest.GenerationManifest(root_path)
+            manifest.Read()
+            self.assertEqual(
+                manifest.GetModule("sqlite:foo"), ("1234", {file_path: "abcd"})
+            )
+
+            # Writing again replaces the manifest.
+            manifest.SetModule("sqlite:foo", "5678", {})
+            manifest.Write(file_handler.FileHandler())
+            manifest.Read()
+            self.assertEqual(manifest.GetModule("sqlite:foo"), ("5678", {}))
+
+    def testReadInvalid(self):
+        """Tests reading an invalid manifest."""
+        with tempfile.TemporaryDirectory() as root_path:
+            manifest = generation_manifest.GenerationManifest(root_path)
+            with open(manifest.path, "w", encoding="utf-8") as file_object:
+                file_object.write("{")
+
+            manifest.Read()
+            self.assertEqual(manifest.GetModule("sqlite:foo"), ("", {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
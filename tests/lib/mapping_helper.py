@@ -4,6 +4,7 @@
 import unittest
 
 from l2tscaffolder.lib import mapping_helper
+from l2tscaffolder.lib import post_processor
 from tests.test_helper import path_helper
 
 
@@ -27,6 +28,140 @@ class MappingHelperTest(unittest.TestCase):
         expected = '# -*- coding: utf-8 -*-\n"""{0}"""\n'.format(self.plugin_name)
         self.assertEqual(expected, actual)
 
+    def testRenderTemplates(self):
+        """Tests rendering multiple templates."""
+        context = {"plugin_name": self.plugin_name}
+        actual = self.helper.RenderTemplates([self.file, self.file], context)
+        expected = '# -*- coding: utf-8 -*-\n"""{0}"""\n'.format(self.plugin_name)
+        self.assertEqual([expected, expected], actual)
+
+    def testRenderWithPassthroughFormatter(self):
+        """Tests rendering with the passthrough formatter backend."""
+        helper = mapping_helper.MappingHelper(
+            template_path=self.template_path, formatter_name="passthrough"
+        )
+        context = {"plugin_name": self.plugin_name}
+        actual = helper.RenderTemplate(self.file, context)
+        expected = '# -*- coding: utf-8 -*-\n"""{0}"""'.format(self.plugin_name)
+        self.assertEqual(expected, actual)
+
+    def testStreamTemplates(self):
+        """Tests streaming templates."""
+        context = {"plugin_name": self.plugin_name}
+        expected = '# -*- coding: utf-8 -*-\n"""{0}"""\n'.format(self.plugin_name)
+        self.assertEqual(self.helper.StreamTemplates([self.file], context), [expected])
+
+        helper = mapping_helper.MappingHelper(
+            template_path=self.template_path, formatter_name="passthrough"
+        )
+        streams = helper.StreamTemplates([self.file], context)
+        self.assertEqual(len(streams), 1)
+        self.assertNotIsInstance(streams[0], str)
+
+        expected = helper.RenderTemplate(self.file, context)
+        self.assertEqual("".join(streams[0]), expected)
+
+    def testPostProcessChunks(self):
+        """Tests post-processing chunks of a rendered template."""
+        text = (
+            "first  \n"
+            "u'the first line\\'\n"
+            "        u'\\the second line\n"
+            "# yapf: disable\n"
+            "last   \n"
+        )
+        expected = self.helper._PostProcess(self.helper._RemoveEscapeError(text))
+
+        for chunk_size in range(1, len(text) + 1):
+            chunks = [
+                text[offset : offset + chunk_size]
+                for offset in range(0, len(text), chunk_size)
+            ]
+            actual = "".join(self.helper._PostProcessChunks(chunks))
+            self.assertEqual(expected, actual)
+
+    def testPostProcessChunksWithShortBuffer(self):
+        """Tests post-processing chunks that are shorter than an escape error."""
+        text = "b = '\\'\n        u'\\x'\nc = 1\n"
+        expected = self.helper._PostProcess(self.helper._RemoveEscapeError(text))
+        self.assertNotIn(self.helper._ESCAPE_ERROR, expected)
+
+        for chunk_size in (1, 2, 3, 5, 7, 1000):
+            chunks = [
+                text[offset : offset + chunk_size]
+                for offset in range(0, len(text), chunk_size)
+            ]
+            actual = "".join(self.helper._PostProcessChunks(chunks))
+            self.assertEqual(expected, actual)
+
+    def testRegisterPostProcessor(self):
+        """Tests registering an additional post-processing stage."""
+
+        class _CommentRemover(post_processor.BasePostProcessor):
+            """Removes comment lines."""
+
+            def ProcessLine(self, line):
+                """Removes a comment line."""
+                return "" if line.startswith("#") else line
+
+        self.helper.RegisterPostProcessor(_CommentRemover())
+        context = {"plugin_name": self.plugin_name}
+        actual = self.helper.RenderTemplate(self.file, context)
+        self.assertEqual('"""{0}"""\n'.format(self.plugin_name), actual)
+
+    def testPostProcessMatchesSeparatePasses(self):
+        """Tests that post-processing matches separate passes over the text."""
+        helper = mapping_helper.MappingHelper(
+            formatter_path=path_helper.YapfStyleFilePath()
+        )
+        context = {
+            "plugin_name": "the_one_and_only",
+            "class_name": "TheOneAndOnly",
+            "queries": ["users", "bookmarks"],
+            "data_types": {
+                "users": "the:one:and:only:users",
+                "bookmarks": "the:one:and:only:bookmarks",
+            },
+            "query_columns": {
+                "users": ["id", "name", "created"],
+                "bookmarks": ["id", "url", "title", "visited"],
+            },
+        }
+        template = helper._Render("sqlite_plugin_formatter.jinja2", context)
+        formatted = helper.formatter.Format(template)[0]
+
+        expected = formatted.replace("# yapf: disable\n", "").replace(
+            "# yapf: enable\n", ""
+        )
+        while expected.find("  \n") != -1:
+            expected = expected.replace("  \n", "\n")
+
+        actual = helper._PostProcess(formatted)
+        self.assertEqual(expected, actual)
+        self.assertNotRegex(actual, r"(?m)^ +$")
+
+    def testCalculateInputDigest(self):
+        """Tests calculating the digest of the inputs of templates."""
+        context = {"plugin_name": self.plugin_name}
+        digest = self.helper.CalculateInputDigest([self.file], context)
+        self.assertEqual(len(digest), 64)
+        self.assertEqual(self.helper.CalculateInputDigest([self.file], context), digest)
+
+        other_context = {"plugin_name": "other"}
+        self.assertNotEqual(
+            self.helper.CalculateInputDigest([self.file], other_context), digest
+        )
+
+        helper = mapping_helper.MappingHelper(
+            template_path=self.template_path, formatter_name="passthrough"
+        )
+        self.assertNotEqual(helper.CalculateInputDigest([self.file], context), digest)
+
+        self.helper.RegisterPostProcessor(post_processor.TrailingWhitespaceRemover())
+        self.assertNotEqual(
+            self.helper.CalculateInputDigest([self.file], context), digest
+        )
+
     def testGenerateClassName(self):
         """Tests the generation of the class name."""
         name = "this_is_a_test"
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Tests for the post-processors."""
+
+import unittest
+
+from unittest import mock
+
+from l2tscaffolder.lib import post_processor
+
+
+class UpperCasePostProcessor(post_processor.BasePostProcessor):
+    """Post-processor that converts lines to upper case, for testing."""
+
+    def ProcessLine(self, line: str) -> str:
+        """Converts a line to upper case.
+
+        Args:
+          line (str): line to process.
+
+        Returns:
+          str: the line in upper case.
+        """
+        return line.upper()
+
+
+class PostProcessingPipelineTest(unittest.TestCase):
+    """Tests for the post-processing pipeline."""
+
+    def _CreatePipeline(self):
+        """Creates a pipeline with the default stages.
+
+        Returns:
+          post_processor.PostProcessingPipeline: the pipeline.
+        """
+        return post_processor.PostProcessingPipeline(
+            [
+                post_processor.YapfCommentRemover(),
+                post_processor.TrailingWhitespaceRemover(),
+            ]
+        )
+
+    def testProcessText(self):
+        """Tests processing text with multiple stages."""
+        pipeline = self._CreatePipeline()
+        text = (
+            "something  \n"
+            "# yapf: disable\n"
+            "otherline   \n"
+            "# yapf: enable\n"
+            "lastline  "
+        )
+        expected_text = "something\notherline \nlastline  "
+        self.assertEqual(pipeline.ProcessText(text), expected_text)
+
+    def testAddStage(self):
+        """Tests adding a stage to the pipeline."""
+        pipeline = self._CreatePipeline()
+        pipeline.AddStage(UpperCasePostProcessor())
+
+        text = "something  \n# yapf: disable\notherline\n"
+        self.assertEqual(pipeline.ProcessText(text), "SOMETHING\nOTHERLINE\n")
+
+    def testProcessTextProcessesEachLineOnce(self):
+        """Tests that every stage processes each line of the text once."""
+        stages = [
+            post_processor.YapfCommentRemover(),
+            post_processor.TrailingWhitespaceRemover(),
+        ]
+        pipeline = post_processor.PostProcessingPipeline(stages)
+        line = "value = 1{0:s}\n".format(" " * 1000)
+
+        for number_of_lines in (1000, 4000):
+            text = line * number_of_lines
+            with (
+                mock.patch.object(
+                    stages[0], "ProcessLine", wraps=stages[0].ProcessLine
+                ) as first_stage,
+                mock.patch.object(
+                    stages[1], "ProcessLine", wraps=stages[1].ProcessLine
+                ) as second_stage,
+            ):
+                processed_text = pipeline.ProcessText(text)
+
+            self.assertEqual(processed_text, "value = 1\n" * number_of_lines)
+            self.assertEqual(first_stage.call_count, number_of_lines)
+            self.assertEqual(second_stage.call_count, number_of_lines)
+
+
+class TrailingWhitespaceRemoverTest(unittest.TestCase):
+    """Tests for the trailing whitespace remover."""
+
+    def testProcessLine(self):
+        """Tests removing pairs of blanks at the end of a line."""
+        remover = post_processor.TrailingWhitespaceRemover()
+        self.assertEqual(remover.ProcessLine("somestuff  \n"), "somestuff\n")
+        self.assertEqual(remover.ProcessLine("somestuff   \n"), "somestuff \n")
+        self.assertEqual(remover.ProcessLine("    \n"), "\n")
+        self.assertEqual(remover.ProcessLine("somestuff  "), "somestuff  ")
+
+
+class YapfCommentRemoverTest(unittest.TestCase):
+    """Tests for the yapf comment remover."""
+
+    def testProcessLine(self):
+        """Tests removing yapf comments."""
+        remover = post_processor.YapfCommentRemover()
+        self.assertEqual(remover.ProcessLine("# yapf: disable\n"), "")
+        self.assertEqual(remover.ProcessLine("# yapf: enable\n"), "")
+        self.assertEqual(remover.ProcessLine("a = 1  # yapf: enable\n"), "a = 1  ")
+        self.assertEqual(remover.ProcessLine("# yapf: enable"), "# yapf: enable")
+
+
+if __name__ == "__main__":
+    unittest.main()
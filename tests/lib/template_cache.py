@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Tests for the template cache."""
+
+import os
+import tempfile
+import unittest
+
+from l2tscaffolder.lib import mapping_helper
+from l2tscaffolder.lib import template_cache
+from tests.test_helper import path_helper
+
+
+class TemplateCacheTest(unittest.TestCase):
+    """Tests for the template cache."""
+
+    def setUp(self):
+        """Makes sure each test starts with an empty cache."""
+        template_cache.TemplateCache.Clear()
+
+    def tearDown(self):
+        """Cleans up the cache."""
+        template_cache.TemplateCache.Clear()
+
+    def testBytecodeCache(self):
+        """Tests that compiled templates are persisted in the bytecode cache."""
+        template_path = path_helper.TestTemplatePath()
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            cache_path = os.path.join(temporary_directory, "templates")
+            template_cache.TemplateCache.SetBytecodeCachePath(cache_path)
+            try:
+                template_cache.TemplateCache.GetTemplate(
+                    template_path, "test_template.jinja2"
+                )
+                cache_files = os.listdir(cache_path)
+            finally:
+                template_cache.TemplateCache.SetBytecodeCachePath("")
+
+        self.assertEqual(len(cache_files), 1)
+        self.assertTrue(cache_files[0].startswith("__l2tscaffolder_"))
+        self.assertEqual(template_cache.TemplateCache.GetBytecodeCachePath(), "")
+
+    def testGetEnvironment(self):
+        """Tests that environments are shared per template directory."""
+        template_path = path_helper.TestTemplatePath()
+
+        environment = template_cache.TemplateCache.GetEnvironment(template_path)
+        self.assertIs(
+            environment, template_cache.TemplateCache.GetEnvironment(template_path)
+        )
+
+    def testGetTemplate(self):
+        """Tests that templates are only compiled once."""
+        template_path = path_helper.TestTemplatePath()
+
+        template = template_cache.TemplateCache.GetTemplate(
+            template_path, "test_template.jinja2"
+        )
+        self.assertEqual(template_cache.TemplateCache.GetStatistics(), (0, 1))
+
+        cached_template = template_cache.TemplateCache.GetTemplate(
+            template_path, "test_template.jinja2"
+        )
+        self.assertIs(template, cached_template)
+        self.assertEqual(template_cache.TemplateCache.GetStatistics(), (1, 1))
+
+    def testGetTemplateEviction(self):
+        """Tests that the least recently used template is evicted."""
+        template_path = path_helper.TestTemplatePath()
+        maximum_number_of_templates = (
+            template_cache.TemplateCache.MAXIMUM_NUMBER_OF_TEMPLATES
+        )
+        template_cache.TemplateCache.MAXIMUM_NUMBER_OF_TEMPLATES = 0
+        try:
+            template_cache.TemplateCache.GetTemplate(
+                template_path, "test_template.jinja2"
+            )
+            template_cache.TemplateCache.GetTemplate(
+                template_path, "test_template.jinja2"
+            )
+        finally:
+            template_cache.TemplateCache.MAXIMUM_NUMBER_OF_TEMPLATES = (
+                maximum_number_of_templates
+            )
+
+        self.assertEqual(template_cache.TemplateCache.GetStatistics(), (0, 2))
+
+    def testSharedBetweenMappingHelpers(self):
+        """Tests that mapping helpers share compiled templates."""
+        template_path = path_helper.TestTemplatePath()
+        yapf_path = path_helper.YapfStyleFilePath()
+        context = {"plugin_name": "shared"}
+
+        for _ in range(3):
+            helper = mapping_helper.MappingHelper(
+                formatter_path=yapf_path, template_path=template_path
+            )
+            helper.RenderTemplate("test_template.jinja2", context)
+
+        self.assertEqual(template_cache.TemplateCache.GetStatistics(), (2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Tests for the file transaction."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from l2tscaffolder.lib import errors
+from l2tscaffolder.lib import transaction
+
+
+class FileTransactionTest(unittest.TestCase):
+    """Tests for the file transaction."""
+
+    def _ReadFile(self, path):
+        """Reads the content of a file.
+
+        Args:
+          path (str): path of the file.
+
+        Returns:
+          str: content of the file.
+        """
+        with open(path, encoding="utf-8") as file_object:
+            return file_object.read()
+
+    def _WriteFile(self, path, content, mode="w"):
+        """Writes content to a file.
+
+        Args:
+          path (str): path of the file.
+          content (str): content to write.
+          mode (Optional[str]): mode to open the file with.
+        """
+        with open(path, mode, encoding="utf-8") as file_object:
+            file_object.write(content)
+
+    def testCommit(self):
+        """Tests committing staged files."""
+        with tempfile.TemporaryDirectory() as root_path:
+            existing_path = os.path.join(root_path, "existing.py")
+            self._WriteFile(existing_path, "old\n")
+            new_path = os.path.join(root_path, "new", "directory", "new.py")
+
+            file_transaction = transaction.FileTransaction(root_path)
+            staged_path = file_transaction.StageFile(existing_path)
+            self.assertEqual(file_transaction.GetStagedPath(existing_path), staged_path)
+            self._WriteFile(staged_path, "new\n", mode="a")
+            self._WriteFile(file_transaction.StageFile(new_path), "content")
+
+            # Nothing is changed before the transaction is committed.
+            self.assertEqual(self._ReadFile(existing_path), "old\n")
+            self.assertFalse(os.path.exists(new_path))
+
+            changed_paths = file_transaction.Commit()
+
+            self.assertEqual(changed_paths, [existing_path, new_path])
+            self.assertEqual(self._ReadFile(existing_path), "old\nnew\n")
+            self.assertEqual(self._ReadFile(new_path), "content")
+            self.assertEqual(sorted(os.listdir(root_path)), ["existing.py", "new"])
+            self.assertEqual(file_transaction.GetStagedPath(existing_path), "")
+
+    def testCommitDirectoryChecks(self):
+        """Tests that every directory is only checked once per commit."""
+        with tempfile.TemporaryDirectory() as root_path:
+            directory_path = os.path.join(root_path, "new", "directory")
+
+            file_transaction = transaction.FileTransaction(root_path)
+            for file_name in ("first.py", "second.py", "third.py"):
+                staged_path = file_transaction.StageFile(
+                    os.path.join(directory_path, file_name)
+                )
+                self._WriteFile(staged_path, "content")
+
+            with mock.patch("os.path.isdir", side_effect=os.path.isdir) as isdir:
+                file_transaction.Commit()
+
+            checked_paths = [call[0][0] for call in isdir.call_args_list]
+            self.assertEqual(
+                checked_paths,
+                [directory_path, os.path.dirname(directory_path), root_path],
+            )
+            self.assertEqual(
+                sorted(os.listdir(directory_path)),
+                ["first.py", "second.py", "third.py"],
+            )
+            self.assertEqual(file_transaction.GetDirectoryCheckStatistics(), (1, 2))
+
+    def testCommitFailure(self):
+        """Tests that a failed commit rolls back all changes."""
+        with tempfile.TemporaryDirectory() as root_path:
+            existing_path = os.path.join(root_path, "existing.py")
+            self._WriteFile(existing_path, "old\n")
+            new_path = os.path.join(root_path, "new", "new.py")
+
+            file_transaction = transaction.FileTransaction(root_path)
+            self._WriteFile(
+                file_transaction.StageFile(existing_path, keep_content=False), "new\n"
+            )
+            self._WriteFile(file_transaction.StageFile(new_path), "content")
+
+            original_replace = os.replace
+
+            def _FailingReplace(source, destination):
+                """Fails to replace the new file."""
+                if destination == new_path:
+                    raise OSError("failure")
+                original_replace(source, destination)
+
+            with mock.patch("os.replace", side_effect=_FailingReplace):
+                with self.assertRaises(errors.FileHandlingError):
+                    file_transaction.Commit()
+
+            self.assertEqual(self._ReadFile(existing_path), "old\n")
+            self.assertEqual(os.listdir(root_path), ["existing.py"])
+
+    def testRollback(self):
+        """Tests discarding staged files."""
+        with tempfile.TemporaryDirectory() as root_path:
+            existing_path = os.path.join(root_path, "existing.py")
+            self._WriteFile(existing_path, "old\n")
+
+            file_transaction = transaction.FileTransaction(root_path)
+            self._WriteFile(file_transaction.StageFile(existing_path), "new\n")
+            file_transaction.Rollback()
+
+            self.assertEqual(self._ReadFile(existing_path), "old\n")
+            self.assertEqual(os.listdir(root_path), ["existing.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
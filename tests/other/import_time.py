@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Tests that the tool starts without importing heavy dependencies."""
+
+import os
+import subprocess
+import sys
+import unittest
+
+
+class ImportTimeTest(unittest.TestCase):
+    """Tests the modules imported at start-up with python -X importtime."""
+
+    # Modules that take a significant part of the start-up time and are only
+    # needed to generate files.
+    _HEAVY_MODULES = frozenset(["jinja2", "sqlite3", "yapf", "yaml"])
+
+    # Python code that lists the definitions and scaffolders, like the listing
+    # screens of the interactive frontend.
+    _LISTING_CODE = "\n".join(
+        [
+            "from l2tscaffolder.frontend import frontend",
+            "from l2tscaffolder.definitions import manager as definition_manager",
+            "from l2tscaffolder.scaffolders import manager as scaffolder_manager",
+            "for name in definition_manager.DefinitionManager.GetDefinitionNames():",
+            "    list(scaffolder_manager.ScaffolderManager"
+            ".GetScaffolderNamesByProject(name))",
+            "list(scaffolder_manager.ScaffolderManager.GetScaffolderInformation())",
+        ]
+    )
+
+    # Python code that retrieves the questions of all scaffolders.
+    _QUESTIONS_CODE = "\n".join(
+        [
+            "from l2tscaffolder.scaffolders import manager",
+            "manager.ScaffolderManager.GetScaffolderQuestions()",
+        ]
+    )
+
+    def _GetImportTimes(self, arguments, input_data=None):
+        """Runs Python with -X importtime and parses the import times.
+
+        Args:
+          arguments (list[str]): arguments to run Python with.
+          input_data (Optional[str]): data to pass on standard input, where
+              None represents that Python must exit successfully without input.
+
+        Returns:
+          dict[str, int]: cumulative import time in microseconds per module.
+        """
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.getcwd()
+
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", *arguments],
+            capture_output=True,
+            check=input_data is None,
+            encoding="utf-8",
+            env=environment,
+            input=input_data or "",
+        )
+
+        import_times = {}
+        for line in process.stderr.split("\n"):
+            if not line.startswith("import time:"):
+                continue
+
+            _, _, values = line.partition(":")
+            _, cumulative_time, module_name = values.split("|")
+            if cumulative_time.strip().isdigit():
+                import_times[module_name.strip()] = int(cumulative_time)
+
+        return import_times
+
+    def testHelp(self):
+        """Tests the modules imported to show the help of the tool."""
+        import_times = self._GetImportTimes(
+            [os.path.join("tools", "l2t_scaffolder.py"), "--help"]
+        )
+        self.assertIn("l2tscaffolder.frontend.batch", import_times)
+        self.assertEqual(self._HEAVY_MODULES.intersection(import_times), set())
+        self.assertNotIn("l2tscaffolder.scaffolders.plaso", import_times)
+
+    def testListing(self):
+        """Tests the modules imported to list definitions and scaffolders."""
+        import_times = self._GetImportTimes(["-c", self._LISTING_CODE])
+        self.assertIn("l2tscaffolder.scaffolders.manager", import_times)
+        self.assertEqual(self._HEAVY_MODULES.intersection(import_times), set())
+        self.assertNotIn("l2tscaffolder.lib.mapping_helper", import_times)
+
+    def testToolStart(self):
+        """Tests that the tool starts without reading entry points."""
+        # The definition is answered, after which the tool aborts at the end of
+        # the input before any scaffolder is listed or looked up.
+        import_times = self._GetImportTimes(
+            [os.path.join("tools", "l2t_scaffolder.py"), "--dry-run"],
+            input_data="0\n",
+        )
+        self.assertIn("l2tscaffolder.scaffolders.catalog", import_times)
+        self.assertNotIn("importlib.metadata", import_times)
+
+    def testToolListing(self):
+        """Tests the modules imported by the tool to list the scaffolders."""
+        project_path = os.path.join(os.getcwd(), "test_data", "PlasoPath")
+        # The definition, project path and module name are answered, after
+        # which the tool lists the scaffolders of the definition and aborts at
+        # the end of the input.
+        input_data = "0\n{0:s}\nfoobar\n".format(project_path)
+
+        import_times = self._GetImportTimes(
+            [os.path.join("tools", "l2t_scaffolder.py"), "--dry-run"],
+            input_data=input_data,
+        )
+        self.assertIn("l2tscaffolder.scaffolders.catalog", import_times)
+        self.assertIn("l2tscaffolder.scaffolders.manager", import_times)
+        self.assertEqual(self._HEAVY_MODULES.intersection(import_times), set())
+        # The module itself of a scaffolder imported with importlib is not
+        # always listed by -X importtime, hence the base module it imports is
+        # checked as well.
+        self.assertNotIn("l2tscaffolder.scaffolders.plaso_sqlite", import_times)
+        self.assertNotIn("l2tscaffolder.scaffolders.plaso", import_times)
+
+    def testQuestions(self):
+        """Tests the modules imported to retrieve the scaffolder questions."""
+        import_times = self._GetImportTimes(["-c", self._QUESTIONS_CODE])
+        self.assertIn("l2tscaffolder.scaffolders.plaso", import_times)
+        self.assertNotIn("jinja2", import_times)
+        self.assertNotIn("yapf", import_times)
+
+
+if __name__ == "__main__":
+    unittest.main()
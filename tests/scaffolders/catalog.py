@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Tests for the scaffolder catalog."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from l2tscaffolder.scaffolders import catalog
+from l2tscaffolder.scaffolders import manager
+
+
+class ScaffolderCatalogTest(unittest.TestCase):
+    """Tests for the scaffolder catalog."""
+
+    _PLUGIN_MODULE = "\n".join(
+        [
+            "from l2tscaffolder.scaffolders import interface",
+            "",
+            "",
+            "class {0:s}(interface.Scaffolder):",
+            "    NAME = '{1:s}'",
+            "    DESCRIPTION = 'Scaffolder provided by {2:s}.'",
+            "    PROJECT = 'test_project'",
+            "",
+        ]
+    )
+
+    def setUp(self):
+        """Makes preparations before running an individual test."""
+        # pylint: disable=consider-using-with
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self._path = self._temporary_directory.name
+        self._cache_path = os.path.join(self._path, "cache")
+        self._module_names = []
+
+        catalog.ScaffolderCatalog.SetCachePath(self._cache_path)
+        catalog.ScaffolderCatalog.ResetStatistics()
+        sys.path.insert(0, self._path)
+
+    def tearDown(self):
+        """Cleans up after running an individual test."""
+        sys.path.remove(self._path)
+        catalog.ScaffolderCatalog.SetCachePath("")
+        self._DeregisterScaffolders()
+        for module_name in self._module_names:
+            sys.modules.pop(module_name, None)
+
+        self._temporary_directory.cleanup()
+
+    def _CreateDistribution(self, distribution_name, version, scaffolder_name):
+        """Creates an installed distribution that provides a scaffolder.
+
+        Args:
+          distribution_name (str): name of the distribution, which is also the
+              name of the module that implements the scaffolder.
+          version (str): version of the distribution.
+          scaffolder_name (str): name of the scaffolder.
+        """
+        module_path = os.path.join(self._path, "{0:s}.py".format(distribution_name))
+        with open(module_path, "w", encoding="utf-8") as file_object:
+            file_object.write(
+                self._PLUGIN_MODULE.format(
+                    "TestScaffolder", scaffolder_name, distribution_name
+                )
+            )
+        self._module_names.append(distribution_name)
+
+        distribution_path = os.path.join(
+            self._path, "{0:s}-{1:s}.dist-info".format(distribution_name, version)
+        )
+        os.makedirs(distribution_path)
+
+        metadata_path = os.path.join(distribution_path, "METADATA")
+        with open(metadata_path, "w", encoding="utf-8") as file_object:
+            file_object.write(
+                "Metadata-Version: 2.1\nName: {0:s}\nVersion: {1:s}\n".format(
+                    distribution_name, version
+                )
+            )
+
+        entry_points_path = os.path.join(distribution_path, "entry_points.txt")
+        with open(entry_points_path, "w", encoding="utf-8") as file_object:
+            file_object.write(
+                "[{0:s}]\n{1:s} = {2:s}:TestScaffolder\n".format(
+                    catalog.ScaffolderCatalog.ENTRY_POINT_GROUP,
+                    scaffolder_name,
+                    distribution_name,
+                )
+            )
+
+    def _DeregisterScaffolders(self):
+        """Deregisters the scaffolders of the test distributions."""
+        for scaffolder_name in ("test_plugin_one", "test_plugin_two"):
+            if scaffolder_name in manager.ScaffolderManager.GetScaffolderNames():
+                scaffolder_class = type("TestScaffolder", (), {"NAME": scaffolder_name})
+                manager.ScaffolderManager.DeregisterScaffolder(scaffolder_class)
+
+    def testRegisterScaffolders(self):
+        """Tests discovering and registering scaffolders."""
+        self._CreateDistribution("l2t_test_plugin_one", "1.0", "test_plugin_one")
+
+        catalog.ScaffolderCatalog.RegisterScaffolders(paths=[self._path])
+        self.assertEqual(catalog.ScaffolderCatalog.GetNumberOfReadDistributions(), 1)
+
+        scaffolder_information = dict(
+            manager.ScaffolderManager.GetScaffolderInformation()
+        )
+        self.assertEqual(
+            scaffolder_information.get("test_plugin_one", None),
+            "Scaffolder provided by l2t_test_plugin_one.",
+        )
+
+        catalog_path = os.path.join(
+            self._cache_path, catalog.ScaffolderCatalog.CATALOG_FILENAME
+        )
+        with open(catalog_path, encoding="utf-8") as file_object:
+            catalog_json = json.load(file_object)
+        self.assertEqual(len(catalog_json["distributions"]), 1)
+
+        # A cached catalog does not read the distribution or import the module
+        # that implements the scaffolder.
+        self._DeregisterScaffolders()
+        sys.modules.pop("l2t_test_plugin_one", None)
+        catalog.ScaffolderCatalog.ResetStatistics()
+
+        catalog.ScaffolderCatalog.RegisterScaffolders(paths=[self._path])
+        self.assertEqual(catalog.ScaffolderCatalog.GetNumberOfReadDistributions(), 0)
+        self.assertNotIn("l2t_test_plugin_one", sys.modules)
+        self.assertIn(
+            "test_plugin_one", list(manager.ScaffolderManager.GetScaffolderNames())
+        )
+
+        scaffolder = manager.ScaffolderManager.GetScaffolderObjectByName(
+            "test_plugin_one"
+        )
+        self.assertEqual(scaffolder.PROJECT, "test_project")
+
+        # Registering again skips scaffolders that are already registered.
+        catalog.ScaffolderCatalog.RegisterScaffolders(paths=[self._path])
+
+    def testRegisterScaffoldersWithStaleCatalog(self):
+        """Tests that only new distributions are read on a stale catalog."""
+        self._CreateDistribution("l2t_test_plugin_one", "1.0", "test_plugin_one")
+        catalog.ScaffolderCatalog.RegisterScaffolders(paths=[self._path])
+        self._DeregisterScaffolders()
+        catalog.ScaffolderCatalog.ResetStatistics()
+
+        self._CreateDistribution("l2t_test_plugin_two", "2.0", "test_plugin_two")
+        catalog.ScaffolderCatalog.RegisterScaffolders(paths=[self._path])
+        self.assertEqual(catalog.ScaffolderCatalog.GetNumberOfReadDistributions(), 1)
+
+        scaffolder_names = list(manager.ScaffolderManager.GetScaffolderNames())
+        self.assertIn("test_plugin_one", scaffolder_names)
+        self.assertIn("test_plugin_two", scaffolder_names)
+
+    def testRegisterScaffoldersWithInvalidEntryPoint(self):
+        """Tests that a distribution that cannot be loaded is not cached."""
+        self._CreateDistribution("l2t_test_plugin_one", "1.0", "test_plugin_one")
+        os.remove(os.path.join(self._path, "l2t_test_plugin_one.py"))
+
+        with self.assertLogs(level="WARNING"):
+            catalog.ScaffolderCatalog.RegisterScaffolders(paths=[self._path])
+
+        self.assertNotIn(
+            "test_plugin_one", list(manager.ScaffolderManager.GetScaffolderNames())
+        )
+
+        catalog_path = os.path.join(
+            self._cache_path, catalog.ScaffolderCatalog.CATALOG_FILENAME
+        )
+        self.assertFalse(os.path.exists(catalog_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
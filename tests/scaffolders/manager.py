@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 """Tests for the scaffolder manager."""
 
+import json
+import os
+import subprocess
+import sys
 import unittest
+from unittest import mock
 
 from l2tscaffolder.scaffolders import interface
 from l2tscaffolder.scaffolders import manager
@@ -74,6 +79,15 @@ class NotAwesomeTestScaffolder(AwesomeTestScaffolder):
     NAME = "Clearly not awesome"
 
 
+class LazyTestScaffolder(BaseScaffolderTest):
+    """Test scaffolder for the RegisterLazyScaffolder function."""
+
+    # pylint: disable=abstract-method
+
+    NAME = "Lazy"
+    DESCRIPTION = "This scaffolder is registered lazily."
+
+
 class ScaffolderManagerTest(unittest.TestCase):
     """Test class for the scaffolder manager."""
 
@@ -166,6 +180,17 @@ class ScaffolderManagerTest(unittest.TestCase):
         self.assertIn("lala", question_attributes)
         self.assertIn("27001", question_attributes)
 
+    def testGetScaffolderQuestionsWithoutObjects(self):
+        """Test that questions are retrieved without creating scaffolders."""
+        with mock.patch.object(
+            interface.Scaffolder, "__init__", side_effect=AssertionError("created")
+        ):
+            questions = manager.ScaffolderManager.GetScaffolderQuestions()
+            self.assertEqual(len(questions), 11)
+
+            questions = manager.ScaffolderManager.GetScaffolderQuestionByName("awesome")
+            self.assertEqual(len(questions), 3)
+
     def testGetScaffolderQuestionByName(self):
         """Test fetching questions of a scaffolder scaffolder by NAME attribute."""
         questions = manager.ScaffolderManager.GetScaffolderQuestionByName(
@@ -197,6 +222,102 @@ class ScaffolderManagerTest(unittest.TestCase):
         self.assertIn("clearly not awesome", scaffolder_names)
         manager.ScaffolderManager.DeregisterScaffolder(NotAwesomeTestScaffolder)
 
+    def testRegisterDiscoveryFunction(self):
+        """Test discovering scaffolders on first use."""
+        # pylint: disable=protected-access
+        discovery_function = mock.MagicMock(
+            side_effect=lambda: manager.ScaffolderManager.RegisterScaffolder(
+                LazyTestScaffolder
+            )
+        )
+        manager.ScaffolderManager.RegisterDiscoveryFunction(discovery_function)
+        try:
+            # Registered scaffolders are looked up without discovery.
+            scaffolder = manager.ScaffolderManager.GetScaffolderObjectByName("Awesome")
+            self.assertIsInstance(scaffolder, AwesomeTestScaffolder)
+            self.assertFalse(discovery_function.called)
+
+            scaffolder = manager.ScaffolderManager.GetScaffolderObjectByName("Lazy")
+            self.assertIsInstance(scaffolder, LazyTestScaffolder)
+
+            self.assertIsNone(
+                manager.ScaffolderManager.GetScaffolderObjectByName("bogus")
+            )
+            self.assertIn("lazy", list(manager.ScaffolderManager.GetScaffolderNames()))
+            discovery_function.assert_called_once()
+
+        finally:
+            manager.ScaffolderManager._discovery_functions = []
+            manager.ScaffolderManager.DeregisterScaffolder(LazyTestScaffolder)
+
+    def testRegisterLazyScaffolder(self):
+        """Test registering a scaffolder without importing its module."""
+        manager.ScaffolderManager.RegisterLazyScaffolder(
+            LazyTestScaffolder.NAME,
+            LazyTestScaffolder.DESCRIPTION,
+            "lazy_project",
+            LazyTestScaffolder.__module__,
+            LazyTestScaffolder.__name__,
+        )
+
+        with self.assertRaises(KeyError):
+            manager.ScaffolderManager.RegisterLazyScaffolder(
+                "average", "", "", LazyTestScaffolder.__module__, "bogus"
+            )
+
+        scaffolder_information = dict(
+            manager.ScaffolderManager.GetScaffolderInformation()
+        )
+        self.assertEqual(
+            scaffolder_information.get("lazy", None), LazyTestScaffolder.DESCRIPTION
+        )
+        scaffolder_names = list(
+            manager.ScaffolderManager.GetScaffolderNamesByProject("lazy_project")
+        )
+        self.assertEqual(scaffolder_names, ["lazy"])
+
+        scaffolder = manager.ScaffolderManager.GetScaffolderObjectByName("Lazy")
+        self.assertIsInstance(scaffolder, LazyTestScaffolder)
+
+        with self.assertRaises(KeyError):
+            manager.ScaffolderManager.RegisterScaffolder(LazyTestScaffolder)
+
+        manager.ScaffolderManager.DeregisterScaffolder(LazyTestScaffolder)
+
+    def testRegisterLazyScaffolders(self):
+        """Test that lazily registered scaffolders match their classes."""
+        # The scaffolders are registered when the package is first imported,
+        # hence this is tested in a separate process.
+        code = "\n".join(
+            [
+                "import json",
+                "from l2tscaffolder.scaffolders import manager",
+                "catalog = {",
+                "    name: [information.description, information.project]",
+                "    for name, information in",
+                "    manager.ScaffolderManager._scaffolders.items()}",
+                "classes = {",
+                "    name: [scaffolder_class.DESCRIPTION, scaffolder_class.PROJECT]",
+                "    for name, scaffolder_class in",
+                "    manager.ScaffolderManager.GetScaffolders()}",
+                "print(json.dumps([catalog, classes]))",
+            ]
+        )
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.getcwd()
+
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            check=True,
+            encoding="utf-8",
+            env=environment,
+        ).stdout
+        catalog, classes = json.loads(output)
+
+        self.assertIn("sqlite", catalog)
+        self.assertEqual(catalog, classes)
+
     def testRegisterScaffolders(self):
         """Test registering multiple scaffolders."""
         scaffolders = [
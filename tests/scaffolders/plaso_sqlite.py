@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 """Tests for the plaso sqlite scaffolder."""
 
+import os
+import sqlite3
+import tempfile
 import unittest
+from unittest import mock
 
 from l2tscaffolder.lib import errors
 from l2tscaffolder.scaffolders import plaso_sqlite
@@ -45,6 +49,14 @@ class PlasoSQLiteScaffolderTest(unittest.TestCase):
         test_string = "this should not produce anything..."
         self._RunQueryTests(scaffolder, test_string, set())
 
+    def testGetQuestions(self):
+        """Tests retrieving the questions without creating a scaffolder."""
+        questions = plaso_sqlite.PlasoSQLiteScaffolder.GetQuestions()
+        question_attributes = [question.attribute for question in questions]
+        self.assertEqual(
+            question_attributes, ["queries", "required_tables", "test_file"]
+        )
+
     def testPlasoSQLiteScaffolder(self):
         """Test the plaso SQLite scaffolder."""
         scaffolder = plaso_sqlite.PlasoSQLiteScaffolder()
@@ -105,6 +117,170 @@ class PlasoSQLiteScaffolderTest(unittest.TestCase):
             files_generated["plaso/parsers/sqlite_plugins/testing.py"],
         )
 
+    def testGetSchema(self):
+        """Tests retrieving the schema of a database."""
+        scaffolder = plaso_sqlite.PlasoSQLiteScaffolder()
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            test_file = os.path.join(temporary_directory, "schema.db")
+            database = sqlite3.connect(test_file)
+            database.execute("CREATE TABLE events (id INT, name TEXT)")
+            database.commit()
+            database.close()
+
+            # pylint: disable=protected-access
+            schema = scaffolder._GetSchema(test_file)
+            self.assertEqual(
+                schema, {"events": "CREATE TABLE events (id INT, name TEXT)"}
+            )
+
+            # The database is opened without creating journal files, also when the
+            # directory is read-only.
+            os.chmod(temporary_directory, 0o555)
+            try:
+                plaso_sqlite.PlasoSQLiteScaffolder._schema_cache.clear()
+                self.assertEqual(scaffolder._GetSchema(test_file), schema)
+                self.assertEqual(os.listdir(temporary_directory), ["schema.db"])
+            finally:
+                os.chmod(temporary_directory, 0o755)
+
+            # The schema is cached while the database does not change.
+            with mock.patch("sqlite3.connect") as mock_connect:
+                self.assertEqual(scaffolder._GetSchema(test_file), schema)
+                self.assertFalse(mock_connect.called)
+
+            database = sqlite3.connect(test_file)
+            database.execute("CREATE TABLE users (id INT)")
+            database.commit()
+            database.close()
+
+            stat_object = os.stat(test_file)
+            os.utime(
+                test_file,
+                ns=(stat_object.st_atime_ns, stat_object.st_mtime_ns + 1000000000),
+            )
+
+            schema = scaffolder._GetSchema(test_file)
+            self.assertEqual(sorted(schema.keys()), ["events", "users"])
+
+            with self.assertRaises(sqlite3.DatabaseError):
+                scaffolder._GetSchema(os.path.join(temporary_directory, "bogus.db"))
+
+    def testMinimizeTestFile(self):
+        """Tests copying a minimized copy of the test database."""
+        # pylint: disable=protected-access
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            test_file = os.path.join(temporary_directory, "events.db")
+            database = sqlite3.connect(test_file)
+            database.execute("CREATE TABLE events (id INT, timestamp INT, name TEXT)")
+            database.execute("CREATE INDEX events_index ON events (timestamp)")
+            database.execute("CREATE TABLE unused (id INT, data BLOB)")
+            for index in range(500):
+                database.execute(
+                    "INSERT INTO events VALUES (?, ?, ?)",
+                    (index, 1000 + index, "event {0:d}".format(index)),
+                )
+                database.execute("INSERT INTO unused VALUES (?, ?)", (index, b"x" * 64))
+            database.commit()
+            database.close()
+
+            scaffolder = plaso_sqlite.PlasoSQLiteScaffolder()
+            scaffolder.SetOutputName("testing")
+            scaffolder.SetAttribute(
+                "queries", {"Event": "SELECT timestamp, name FROM events"}, dict
+            )
+            scaffolder.SetAttribute("required_tables", ["events"], list)
+            scaffolder.SetAttribute("test_file", test_file, str)
+            scaffolder.SetAttribute("minimize_test_file", True, bool)
+
+            cache_path = os.path.join(temporary_directory, "cache")
+            plaso_sqlite.PlasoSQLiteScaffolder.SetCachePath(cache_path)
+            try:
+                files_to_copy = list(scaffolder.GetFilesToCopy())
+                self.assertEqual(len(files_to_copy), 1)
+
+                minimized_path, destination = files_to_copy[0]
+                self.assertEqual(
+                    os.path.dirname(minimized_path), os.path.join(cache_path, "sqlite")
+                )
+                self.assertEqual(
+                    destination, os.path.join("test_data", "events_minimized.db")
+                )
+                self.assertEqual(scaffolder.test_file_path, destination)
+                self.assertEqual(
+                    scaffolder.GetJinjaContext()["test_file_path"], destination
+                )
+
+                # The generated test opens the minimized copy.
+                scaffolder._PrepareJinjaContext()
+                self.assertEqual(scaffolder.database_name, "events_minimized.db")
+                self.assertLess(
+                    os.path.getsize(minimized_path), os.path.getsize(test_file)
+                )
+
+                database = sqlite3.connect(minimized_path)
+                table_names = [
+                    name
+                    for (name,) in database.execute(
+                        "SELECT name FROM sqlite_master ORDER BY name"
+                    )
+                ]
+                self.assertEqual(table_names, ["events", "events_index"])
+                self.assertEqual(
+                    database.execute("SELECT MIN(id), COUNT(*) FROM events").fetchone(),
+                    (0, scaffolder.MAXIMUM_NUMBER_OF_SAMPLED_ROWS),
+                )
+                database.close()
+
+                # The minimized copy is only created once.
+                modification_time = os.stat(minimized_path).st_mtime_ns
+                self.assertEqual(
+                    list(scaffolder.GetFilesToCopy()), [(minimized_path, destination)]
+                )
+                self.assertEqual(os.stat(minimized_path).st_mtime_ns, modification_time)
+
+                # A minimized copy that was changed is created again.
+                with open(minimized_path, "wb") as file_object:
+                    file_object.write(b"changed")
+                self.assertEqual(
+                    list(scaffolder.GetFilesToCopy()), [(minimized_path, destination)]
+                )
+                database = sqlite3.connect(minimized_path)
+                self.assertEqual(
+                    database.execute("SELECT COUNT(*) FROM events").fetchone(),
+                    (scaffolder.MAXIMUM_NUMBER_OF_SAMPLED_ROWS,),
+                )
+                database.close()
+
+                # A query that returns no sampled rows prevents minimizing.
+                scaffolder.queries = {
+                    "Event": "SELECT timestamp, name FROM events WHERE id > 400"
+                }
+                self.assertEqual(
+                    list(scaffolder.GetFilesToCopy()),
+                    [(test_file, os.path.join("test_data", "events.db"))],
+                )
+
+            finally:
+                plaso_sqlite.PlasoSQLiteScaffolder.SetCachePath("")
+
+    def testGetMinimizedTestFileDirectory(self):
+        """Tests the directory minimized test databases are stored in."""
+        # pylint: disable=protected-access
+        directory_path = (
+            plaso_sqlite.PlasoSQLiteScaffolder._GetMinimizedTestFileDirectory()
+        )
+        self.assertTrue(os.path.isdir(directory_path))
+        self.assertNotEqual(
+            directory_path,
+            os.path.join(tempfile.gettempdir(), "l2tscaffolder-minimized"),
+        )
+        self.assertEqual(os.stat(directory_path).st_mode & 0o777, 0o700)
+        self.assertEqual(
+            plaso_sqlite.PlasoSQLiteScaffolder._GetMinimizedTestFileDirectory(),
+            directory_path,
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
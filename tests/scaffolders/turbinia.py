@@ -40,6 +40,18 @@ class TurbiniaJobTaskScaffolderTest(unittest.TestCase):
             files_generated["turbinia/jobs/secret_processing.py"],
         )
 
+    def testGetInputDigest(self):
+        """Tests calculating the digest of the inputs of the generated files."""
+        scaffolder = turbinia.TurbiniaJobTaskScaffolder()
+        scaffolder.SetOutputName("secret_processing")
+
+        digest = scaffolder.GetInputDigest()
+        self.assertEqual(len(digest), 64)
+        self.assertEqual(scaffolder.class_name, "SecretProcessing")
+
+        scaffolder.SetOutputName("other_processing")
+        self.assertNotEqual(scaffolder.GetInputDigest(), digest)
+
 
 if __name__ == "__main__":
     unittest.main()
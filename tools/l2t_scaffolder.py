@@ -1,22 +1,146 @@
 #!/usr/bin/env python3
 """The l2t scaffolder tool."""
 
+import os
+
 import click
 
+from l2tscaffolder.frontend import batch
 from l2tscaffolder.frontend import cli_output_handler
 from l2tscaffolder.frontend import frontend
+from l2tscaffolder.lib import code_formatter
+from l2tscaffolder.lib import file_copier
+from l2tscaffolder.lib import format_cache
+from l2tscaffolder.lib import template_cache
+from l2tscaffolder.scaffolders import catalog
+from l2tscaffolder.scaffolders import interface as scaffolder_interface
+from l2tscaffolder.scaffolders import manager as scaffolder_manager
 
 
 @click.command()
 @click.argument("definition", envvar="SCAFFOLDER_DEFINITION", type=str, default="")
-def StartCLI(definition):
+@click.option(
+    "--cache-directory",
+    envvar="SCAFFOLDER_CACHE_DIRECTORY",
+    type=click.Path(file_okay=False),
+    default="",
+    help=(
+        "Directory to persist compiled templates, formatted code and minimized "
+        "test files in."
+    ),
+)
+@click.option(
+    "--workers",
+    envvar="SCAFFOLDER_WORKERS",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of workers used to render and format generated code.",
+)
+@click.option(
+    "--formatter",
+    envvar="SCAFFOLDER_FORMATTER",
+    type=click.Choice(list(code_formatter.FormatterManager.GetFormatterNames())),
+    default=code_formatter.FormatterManager.GetDefaultFormatterName(),
+    help="Formatter backend used to format generated code.",
+)
+@click.option(
+    "--formatter-command",
+    envvar="SCAFFOLDER_FORMATTER_COMMAND",
+    type=str,
+    default="",
+    help="Command run by the external formatter backend.",
+)
+@click.option(
+    "--manifest",
+    envvar="SCAFFOLDER_MANIFEST",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="JSON or YAML manifest of modules to generate without prompting.",
+)
+@click.option(
+    "--dry-run",
+    envvar="SCAFFOLDER_DRY_RUN",
+    is_flag=True,
+    default=False,
+    help="Show the changes as a diff instead of writing them to disk.",
+)
+@click.option(
+    "--incremental",
+    envvar="SCAFFOLDER_INCREMENTAL",
+    is_flag=True,
+    default=False,
+    help="Only generate modules of which the inputs changed since the last run.",
+)
+@click.option(
+    "--hard-links",
+    envvar="SCAFFOLDER_HARD_LINKS",
+    is_flag=True,
+    default=False,
+    # A hard linked test file shares its inode with the original file, hence
+    # editing the test file in the project in place, for example to add rows
+    # to a test database, also changes the original file, which can be
+    # evidence. Hard links are therefore tried before any copy method, but
+    # only when explicitly requested.
+    help=(
+        "Hard link test files into the project instead of copying them. The "
+        "test file in the project and the original file are then the same "
+        "file, hence editing one in place also changes the other. Do not use "
+        "this with evidence files that must not change."
+    ),
+)
+def StartCLI(
+    definition,
+    cache_directory,
+    workers,
+    formatter,
+    formatter_command,
+    manifest,
+    dry_run,
+    incremental,
+    hard_links,
+):
     """Generates templates for parser and plugins for l2t developers.
 
     This is a l2t scaffolder, used to generate templates for all plugin
     and parser creation for l2t tools.
     """
+    if cache_directory:
+        template_cache.TemplateCache.SetBytecodeCachePath(
+            os.path.join(cache_directory, "templates")
+        )
+        format_cache.FormatCache.SetCachePath(os.path.join(cache_directory, "yapf"))
+        catalog.ScaffolderCatalog.SetCachePath(cache_directory)
+        scaffolder_interface.Scaffolder.SetCachePath(
+            os.path.join(cache_directory, "scaffolders")
+        )
+
+    # Scaffolders provided by other packages are discovered through their
+    # entry points, which are only read when the scaffolders are listed or
+    # a scaffolder is looked up that is not built in.
+    scaffolder_manager.ScaffolderManager.RegisterDiscoveryFunction(
+        catalog.ScaffolderCatalog.RegisterScaffolders
+    )
+
+    code_formatter.CodeFormatter.SetNumberOfWorkers(workers)
+    file_copier.FileCopier.SetAllowHardLinks(hard_links)
+    code_formatter.FormatterManager.SetDefaultFormatter(formatter)
+    if formatter_command:
+        code_formatter.ExternalCommandFormatter.SetCommand(formatter_command)
+
     output_handler = cli_output_handler.OutputHandlerClick()
-    cli = frontend.ScaffolderFrontend(output_handler)
+    if manifest:
+        batch_frontend = batch.BatchFrontend(
+            output_handler,
+            number_of_workers=workers,
+            dry_run=dry_run,
+            incremental=incremental,
+        )
+        batch_frontend.Start(manifest)
+        return
+
+    cli = frontend.ScaffolderFrontend(
+        output_handler, dry_run=dry_run, incremental=incremental
+    )
 
     cli.Start(definition)
 